@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""Leaderboard query latency under the fixed and adaptive Athena waiters.
+
+Athena is simulated on a virtual clock, so thousands of queries run in a
+second and the numbers do not depend on the network. Each query spends a
+lognormal time queued and executing, every get_query_execution call costs a
+round trip, and the waiter's sleeps advance the clock. Observed latency is
+the time from submission until wait_for_query returns; the difference to
+Athena's own total is what the waiter adds by noticing completion late.
+
+Usage:
+    python benchmarks/bench_athena_polling.py --queries 5000
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+# The leaderboard API imports its modules by bare name
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src" / "leaderboard_api"))
+
+import clients
+from athena import FIXED_POLL_POLICY, PollPolicy, QueryTrace, wait_for_query
+
+REGION = "us-east-1"
+
+
+class SimulatedAthena:
+    """get_query_execution against one query at a time on a virtual clock."""
+    
+    def __init__(self, round_trip_ms: float = 25.0):
+        self.now = 0.0
+        self.round_trip = round_trip_ms / 1000
+        self.statistics: Dict[str, int] = {}
+        self.done_at = 0.0
+    
+    def submit(self, queue_ms: float, engine_ms: float, planning_ms: float = 40.0) -> None:
+        total_ms = queue_ms + planning_ms + engine_ms
+        self.done_at = self.now + total_ms / 1000
+        self.statistics = {
+            "QueryQueueTimeInMillis": int(queue_ms),
+            "EngineExecutionTimeInMillis": int(engine_ms),
+            "TotalExecutionTimeInMillis": int(total_ms),
+        }
+    
+    def clock(self) -> float:
+        return self.now
+    
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+    
+    def get_query_execution(self, QueryExecutionId):
+        # The state is read halfway through the round trip
+        self.now += self.round_trip / 2
+        done = self.now >= self.done_at
+        self.now += self.round_trip / 2
+        execution = {"Status": {"State": "SUCCEEDED" if done else "RUNNING"}}
+        if done:
+            execution["Statistics"] = self.statistics
+        return {"QueryExecution": execution}
+
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def simulate(policy: PollPolicy, queries: int = 2000, seed: int = 7, round_trip_ms: float = 25.0) -> dict:
+    """
+    Run simulated queries through wait_for_query with one polling policy.
+    
+    Args:
+        policy: Poll policy under test
+        queries: Number of queries
+        seed: Seeds query durations, identical across policies
+        round_trip_ms: Cost of one get_query_execution call
+    
+    Returns:
+        Dict with p50/p99 latency and overhead in ms and mean polls per query
+    """
+    durations = random.Random(seed)
+    random.seed(seed)
+    athena = SimulatedAthena(round_trip_ms)
+    clients._clients[("athena", REGION)] = athena
+    
+    latencies, overheads, polls = [], [], []
+    try:
+        for i in range(queries):
+            # Leaderboard queries: short queue, sub-second to few-second engine time
+            athena.submit(
+                queue_ms=durations.lognormvariate(4.5, 0.8),
+                engine_ms=durations.lognormvariate(6.5, 0.6),
+            )
+            start = athena.now
+            trace = QueryTrace()
+            wait_for_query(f"q{i}", REGION, policy=policy, trace=trace, sleep=athena.sleep, clock=athena.clock)
+            latencies.append((athena.now - start) * 1000)
+            overheads.append(trace.polling_overhead_ms)
+            polls.append(trace.polls)
+    finally:
+        clients._clients.pop(("athena", REGION), None)
+    
+    return {
+        "p50_ms": round(percentile(latencies, 0.50), 1),
+        "p99_ms": round(percentile(latencies, 0.99), 1),
+        "overhead_p50_ms": round(percentile(overheads, 0.50), 1),
+        "overhead_p99_ms": round(percentile(overheads, 0.99), 1),
+        "mean_polls": round(statistics.mean(polls), 2),
+    }
+
+
+def main():
+    """Main CLI entrypoint."""
+    parser = argparse.ArgumentParser(description="Compare Athena polling policies on simulated queries")
+    parser.add_argument("--queries", type=int, default=5000, help="Simulated queries per policy (default: 5000)")
+    parser.add_argument("--round-trip-ms", type=float, default=25.0, help="get_query_execution cost (default: 25)")
+    parser.add_argument("--seed", type=int, default=7, help="Random seed (default: 7)")
+    args = parser.parse_args()
+    
+    for name, policy in (("fixed_1s", FIXED_POLL_POLICY), ("adaptive", PollPolicy())):
+        result = simulate(policy, args.queries, args.seed, args.round_trip_ms)
+        print(json.dumps({"policy": name, "queries": args.queries, **result}))
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""Cold-start budget check for the ingest and leaderboard Lambdas.
+
+Every run starts a fresh interpreter and records two numbers per handler:
+how long importing the handler module takes (the Lambda init phase) and how
+long the first invocation takes (lazy imports, client creation and the work
+itself). The median over --runs is compared with a budget and the script
+exits 1 when any budget is exceeded, so it can gate CI.
+
+The ingest invocation is a local process_ingestion of a small CSV plus the
+S3 client creation the S3 path would add. The leaderboard invocation serves
+an artifact through a botocore Stubber, so neither run touches the network.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Milliseconds; generous enough for a shared CI runner, tight enough to catch
+# a heavy import creeping back into module scope
+BUDGETS = {
+    "ingest": {"import_ms": 400, "first_invocation_ms": 5000},
+    "api": {"import_ms": 250, "first_invocation_ms": 1500},
+}
+
+
+def write_csv(path: Path, rows: int) -> None:
+    """Write a small player export without importing pandas in the parent."""
+    lines = ["id,name,alliance,power,killpoints,t4 kills,t5 kills"]
+    lines += [f"{10_000_000 + i},player_{i},A{i % 50},{i * 1000},{i * 37},{i * 5},{i * 2}" for i in range(rows)]
+    path.write_text("\n".join(lines) + "\n")
+
+
+def run_ingest_worker(input_path: str, out_dir: str) -> dict:
+    """Time the ingest handler import and first invocation in this process."""
+    start = time.perf_counter()
+    from ingest_players import handler
+    from ingest_players.aws_s3 import get_s3_client
+    imported = time.perf_counter()
+    
+    get_s3_client()
+    handler.process_ingestion(input_path, "51", "2026-01-26", out_dir)
+    invoked = time.perf_counter()
+    
+    return {
+        "import_ms": round((imported - start) * 1000, 1),
+        "first_invocation_ms": round((invoked - imported) * 1000, 1),
+    }
+
+
+def run_api_worker() -> dict:
+    """Time the leaderboard handler import and first invocation in this process."""
+    sys.path.insert(0, str(ROOT / "src" / "leaderboard_api"))
+    
+    start = time.perf_counter()
+    import handler
+    imported = time.perf_counter()
+    
+    from io import BytesIO
+    
+    from botocore.response import StreamingBody
+    from botocore.stub import Stubber
+    from clients import get_client
+    
+    rows = [{"id": str(i), "name": None, "alliance": None, "value": 100 - i} for i in range(100)]
+    body = json.dumps({"rows": rows, "top_n": 500}).encode()
+    
+    stubber = Stubber(get_client("s3"))
+    stubber.add_response("get_object", {"Body": StreamingBody(BytesIO(body), len(body))})
+    stubber.activate()
+    
+    event = {
+        "requestContext": {"http": {"method": "GET", "path": "/leaderboard"}},
+        "queryStringParameters": {"kingdom": "51", "metric": "power", "dt": "2026-01-26", "limit": "100"},
+    }
+    response = handler.lambda_handler(event, None)
+    invoked = time.perf_counter()
+    
+    assert response["statusCode"] == 200, response
+    return {
+        "import_ms": round((imported - start) * 1000, 1),
+        "first_invocation_ms": round((invoked - imported) * 1000, 1),
+    }
+
+
+def run_once(target: str, tmpdir: str, run: int) -> dict:
+    """Measure one cold start of a handler in a fresh interpreter."""
+    env = {
+        **os.environ,
+        "PYTHONPATH": str(ROOT / "src"),
+        "AWS_DEFAULT_REGION": os.environ.get("AWS_DEFAULT_REGION", "us-east-1"),
+        "DATA_BUCKET": "bench-bucket",
+        "LEADERBOARD_SERVING": "artifacts",
+    }
+    args = [sys.executable, __file__, "--worker", target, tmpdir, str(run)]
+    output = subprocess.run(args, check=True, capture_output=True, text=True, env=env).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    """Main CLI entrypoint."""
+    parser = argparse.ArgumentParser(description="Measure handler cold starts against a budget")
+    parser.add_argument(
+        "--targets",
+        default="ingest,api",
+        help="Comma-separated handlers to measure (default: ingest,api)"
+    )
+    parser.add_argument(
+        "--runs",
+        type=int,
+        default=5,
+        help="Fresh interpreters per handler, the median is compared (default: 5)"
+    )
+    parser.add_argument(
+        "--rows",
+        type=int,
+        default=1000,
+        help="Rows in the ingest input (default: 1000)"
+    )
+    parser.add_argument(
+        "--budget",
+        action="append",
+        default=[],
+        metavar="TARGET.METRIC=MS",
+        help="Override a budget, e.g. api.import_ms=300 (repeatable)"
+    )
+    parser.add_argument("--worker", nargs=3, metavar=("TARGET", "TMPDIR", "RUN"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.worker:
+        target, tmpdir, run = args.worker
+        if target == "ingest":
+            result = run_ingest_worker(str(Path(tmpdir) / "players.csv"), str(Path(tmpdir) / f"out_{run}"))
+        else:
+            result = run_api_worker()
+        print(json.dumps(result))
+        return 0
+    
+    budgets = {target: dict(limits) for target, limits in BUDGETS.items()}
+    for override in args.budget:
+        name, value = override.split("=")
+        target, metric = name.split(".")
+        budgets[target][metric] = float(value)
+    
+    over_budget = False
+    with tempfile.TemporaryDirectory() as tmpdir:
+        write_csv(Path(tmpdir) / "players.csv", args.rows)
+        
+        for target in args.targets.split(","):
+            runs = [run_once(target, tmpdir, i) for i in range(args.runs)]
+            result = {"target": target, "runs": args.runs}
+            for metric, budget in budgets[target].items():
+                median = statistics.median(r[metric] for r in runs)
+                result[metric] = median
+                result[f"{metric}_budget"] = budget
+                if median > budget:
+                    over_budget = True
+                    result.setdefault("over_budget", []).append(metric)
+            print(json.dumps(result))
+    
+    return 1 if over_budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Side-by-side throughput and peak RSS of the pandas and Arrow ingestion engines.
+
+Each (engine, size) pair runs in a fresh interpreter so peak RSS is not
+polluted by earlier runs. The raw copy, leaderboard artifacts, deltas, player
+history and serving store are disabled: they take the same time with either
+engine, so only reading, validating, hashing and writing the curated file
+are timed.
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+METRIC_COLUMNS = [
+    "power", "killpoints", "deads", "t1 kills", "t2 kills", "t3 kills", "t4 kills",
+    "t5 kills", "total kills", "t45 kills", "ranged", "rss gathered", "rss assistance", "helps",
+]
+
+
+def write_csv(path: Path, rows: int, seed: int = 42) -> None:
+    """Write a player export with the Athena table's columns."""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "id": np.arange(10_000_000, 10_000_000 + rows).astype(str),
+        "name": np.char.add("player_", rng.integers(0, 1_000_000, rows).astype(str)),
+        "alliance": np.char.add("A", rng.integers(0, 200, rows).astype(str)),
+    })
+    for col in METRIC_COLUMNS:
+        df[col] = rng.integers(0, 500_000_000, rows)
+    df.to_csv(path, index=False)
+
+
+def run_worker(engine: str, input_path: str, out_dir: str) -> dict:
+    """Ingest one file in this process and report timing and peak RSS."""
+    from ingest_players.handler import process_ingestion
+    
+    start = time.perf_counter()
+    result = process_ingestion(
+        input_path, "51", "2026-01-26", out_dir, engine=engine,
+        artifacts=False, delta=False, history=False, copy_raw=False,
+    )
+    elapsed = time.perf_counter() - start
+    
+    return {
+        "engine": engine,
+        "rows": result["rows"],
+        "seconds": round(elapsed, 3),
+        "rows_per_s": round(result["rows"] / elapsed),
+        "peak_rss_mb": result["peak_rss_mb"],
+    }
+
+
+def main():
+    """Main CLI entrypoint."""
+    parser = argparse.ArgumentParser(description="Compare pandas and Arrow ingestion engines")
+    parser.add_argument(
+        "--sizes",
+        default="10000,100000,300000",
+        help="Comma-separated row counts (default: 10000,100000,300000)"
+    )
+    parser.add_argument(
+        "--engines",
+        default="pandas,arrow",
+        help="Comma-separated engines (default: pandas,arrow)"
+    )
+    parser.add_argument("--worker", nargs=3, metavar=("ENGINE", "INPUT", "OUT_DIR"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.worker:
+        print(json.dumps(run_worker(*args.worker)))
+        return 0
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for rows in [int(s) for s in args.sizes.split(",")]:
+            input_path = Path(tmpdir) / f"players_{rows}.csv"
+            write_csv(input_path, rows)
+            
+            for engine in args.engines.split(","):
+                out = subprocess.run(
+                    [sys.executable, __file__, "--worker", engine, str(input_path), f"{tmpdir}/out_{engine}"],
+                    capture_output=True, text=True, check=True,
+                )
+                print(out.stdout.strip())
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""Micro-benchmark: per-row apply hashing vs the batched record_hash engine."""
+
+import argparse
+import hashlib
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from ingest_players.hashing import compute_record_hashes, get_hash_columns
+
+
+def legacy_record_hash(df: pd.DataFrame) -> pd.Series:
+    """Original implementation: build a string and hash it once per row via apply."""
+    hash_cols = get_hash_columns(df.columns)
+    
+    def hash_row(row):
+        values = [str(row[col]) for col in hash_cols]
+        return hashlib.sha256("|".join(values).encode("utf-8")).hexdigest()
+    
+    return df.apply(hash_row, axis=1)
+
+
+def make_frame(rows: int, seed: int = 42) -> pd.DataFrame:
+    """Build a player-shaped DataFrame with string, int and float columns."""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "id": np.arange(10_000_000, 10_000_000 + rows).astype(str),
+        "name": np.char.add("player_", rng.integers(0, 1_000_000, rows).astype(str)),
+        "alliance": np.char.add("A", rng.integers(0, 200, rows).astype(str)),
+    })
+    for col in ("power", "killpoints", "deads", "t4 kills", "t5 kills", "rss gathered"):
+        df[col] = rng.integers(0, 500_000_000, rows)
+    df["ranged"] = rng.random(rows) * 1_000_000
+    df["kingdom"] = "51"
+    df["snapshot_date"] = "2026-01-26"
+    return df
+
+
+def time_call(fn, repeat: int) -> float:
+    """Return the best wall time in seconds over repeat runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    """Main CLI entrypoint."""
+    parser = argparse.ArgumentParser(description="Benchmark record_hash engines")
+    parser.add_argument(
+        "--sizes",
+        default="10000,100000,1000000",
+        help="Comma-separated row counts (default: 10000,100000,1000000)"
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="Runs per measurement, best is reported (default: 3)"
+    )
+    parser.add_argument(
+        "--legacy-max-rows",
+        type=int,
+        default=1_000_000,
+        help="Skip the slow legacy path above this row count (default: 1000000)"
+    )
+    args = parser.parse_args()
+    
+    results = []
+    for rows in [int(s) for s in args.sizes.split(",")]:
+        df = make_frame(rows)
+        result = {"rows": rows}
+        
+        if rows <= args.legacy_max_rows:
+            legacy = legacy_record_hash(df)
+            # Sanity check: compat mode must reproduce the legacy digests exactly
+            assert list(compute_record_hashes(df, "sha256")) == legacy.tolist()
+            result["legacy_s"] = time_call(lambda: legacy_record_hash(df), 1)
+        
+        result["sha256_s"] = time_call(lambda: compute_record_hashes(df, "sha256"), args.repeat)
+        result["fast_s"] = time_call(lambda: compute_record_hashes(df, "fast"), args.repeat)
+        
+        if "legacy_s" in result:
+            result["sha256_speedup"] = round(result["legacy_s"] / result["sha256_s"], 1)
+            result["fast_speedup"] = round(result["legacy_s"] / result["fast_s"], 1)
+        
+        print(json.dumps(result))
+        results.append(result)
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
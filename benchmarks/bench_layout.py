@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""Compare curated Parquet layouts for leaderboard (top-N) queries.
+
+For each layout this reports file size, write time and bytes scanned by a
+representative "ORDER BY metric DESC LIMIT n" query. Two scan figures are
+given:
+
+- full_scan_bytes: every row group of the id, name and metric columns,
+  which is what a reader without statistics has to touch.
+- pruned_scan_bytes: row groups read by a statistics-aware top-N reader. It
+  visits groups in descending max(metric) order and stops once the next
+  group's max cannot beat the current n-th value.
+"""
+
+import argparse
+import heapq
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from ingest_players.layout import CuratedLayout, write_curated_table
+
+LAYOUTS = {
+    "default": CuratedLayout(dictionary_columns=(), page_index=False),
+    "snappy_dict": CuratedLayout(),
+    "zstd_dict": CuratedLayout(compression="zstd"),
+    "sorted_power_64k": CuratedLayout(sort_key="power", row_group_size=64 * 1024),
+    "sorted_power_16k_zstd": CuratedLayout(sort_key="power", row_group_size=16 * 1024, compression="zstd"),
+}
+
+QUERIES = [("power", 100), ("power", 500), ("killpoints", 100), ("t45 kills", 100)]
+
+
+def make_table(rows: int, seed: int = 42) -> pa.Table:
+    """Build a curated-shaped table with skewed (long-tailed) metric values."""
+    rng = np.random.default_rng(seed)
+    columns = {
+        "id": np.arange(10_000_000, 10_000_000 + rows).astype(str),
+        "name": np.char.add("player_", rng.integers(0, 1_000_000, rows).astype(str)),
+        "alliance": np.char.add("A", rng.integers(0, 200, rows).astype(str)),
+    }
+    for col in ("power", "killpoints", "deads", "t4 kills", "t5 kills", "t45 kills", "rss gathered"):
+        columns[col] = (rng.pareto(1.5, rows) * 1_000_000).astype("int64")
+    table = pa.table(columns)
+    for name, value in (("kingdom", "51"), ("snapshot_date", "2026-01-26"), ("run_id", "run")):
+        table = table.append_column(name, pa.repeat(pa.scalar(value, pa.string()), rows))
+    return table
+
+
+def column_bytes(metadata, row_group: int, names) -> int:
+    """Compressed bytes of the named column chunks in one row group."""
+    all_names = metadata.schema.names
+    group = metadata.row_group(row_group)
+    return sum(group.column(all_names.index(n)).total_compressed_size for n in names)
+
+
+def scanned_bytes(path: Path, metric: str, limit: int) -> dict:
+    """Bytes a full scan and a statistics-pruned top-N scan read."""
+    parquet_file = pq.ParquetFile(path)
+    metadata = parquet_file.metadata
+    needed = ["id", "name", metric]
+    metric_index = metadata.schema.names.index(metric)
+    
+    full = sum(column_bytes(metadata, i, needed) for i in range(metadata.num_row_groups))
+    
+    order = sorted(
+        range(metadata.num_row_groups),
+        key=lambda i: metadata.row_group(i).column(metric_index).statistics.max,
+        reverse=True,
+    )
+    top = []
+    pruned = 0
+    for i in order:
+        group_max = metadata.row_group(i).column(metric_index).statistics.max
+        if len(top) >= limit and group_max <= top[0]:
+            break
+        pruned += column_bytes(metadata, i, needed)
+        for value in parquet_file.read_row_group(i, columns=[metric]).column(0).to_pylist():
+            if value is None:
+                continue
+            if len(top) < limit:
+                heapq.heappush(top, value)
+            elif value > top[0]:
+                heapq.heapreplace(top, value)
+    
+    return {"full_scan_bytes": full, "pruned_scan_bytes": pruned}
+
+
+def main():
+    """Main CLI entrypoint."""
+    parser = argparse.ArgumentParser(description="Benchmark curated Parquet layouts")
+    parser.add_argument("--rows", type=int, default=300_000, help="Rows per file (default: 300000)")
+    args = parser.parse_args()
+    
+    table = make_table(args.rows)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for name, layout in LAYOUTS.items():
+            path = Path(tmpdir) / f"{name}.parquet"
+            start = time.perf_counter()
+            write_curated_table(table, path, layout)
+            write_s = time.perf_counter() - start
+            
+            result = {
+                "layout": name,
+                "rows": args.rows,
+                "file_bytes": path.stat().st_size,
+                "write_s": round(write_s, 3),
+                "row_groups": pq.ParquetFile(path).metadata.num_row_groups,
+                "queries": {
+                    f"{metric} top {limit}": scanned_bytes(path, metric, limit)
+                    for metric, limit in QUERIES
+                },
+            }
+            print(json.dumps(result))
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Leaderboard latency of the parquet query engine on one curated partition.
+
+A synthetic kingdom is ingested with the local pipeline, so the curated file
+has the production schema and layout. Each leaderboard is then answered two
+ways from that file:
+
+- select: parquet_engine.read_top_rows, which reads the id, name and metric
+  columns and selects the top N.
+- full_sort: read every column and sort the whole table, the naive reader.
+
+Timings include opening the file and reading its footer. The file is read
+from local disk; on S3 add a few ranged GETs of tens of ms each.
+
+Usage:
+    python benchmarks/bench_parquet_engine.py --rows 50000
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pyarrow.parquet as pq
+
+# Add src to path for imports; the leaderboard API imports its modules by bare name
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "src" / "leaderboard_api"))
+
+from parquet_engine import read_top_rows
+
+QUERIES = [("power", 10), ("power", 100), ("t4 kills", 100), ("killpoints", 500)]
+
+
+def full_sort(path: str, metric_column: str, limit: int) -> list:
+    """Read the whole partition and sort it, returning the top rows."""
+    table = pq.read_table(path)
+    table = table.sort_by([(metric_column, "descending"), ("id", "ascending")]).slice(0, limit)
+    return [
+        {"id": r["id"], "name": r["name"] or None, "value": r[metric_column]}
+        for r in table.to_pylist()
+    ]
+
+
+def select(path: str, metric_column: str, limit: int) -> list:
+    """Answer the leaderboard as the parquet engine does."""
+    return read_top_rows(pq.ParquetFile(path), metric_column, limit)["rows"]
+
+
+def time_ms(func, repeats: int) -> dict:
+    """p50 and max wall time of repeated calls, after one warm-up call."""
+    func()
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {"p50_ms": round(statistics.median(samples), 2), "max_ms": round(max(samples), 2)}
+
+
+def build_partition(rows: int, work_dir: Path) -> str:
+    """Ingest a synthetic kingdom and return its curated file path."""
+    from ingest_players.handler import process_ingestion
+    from synthetic import generate_snapshot, write_snapshot
+    
+    input_path = work_dir / "players.csv"
+    write_snapshot(generate_snapshot(rows), input_path)
+    result = process_ingestion(str(input_path), "51", "2026-01-26", str(work_dir / "out"), history=False)
+    return result["curated_path"]
+
+
+def main():
+    """Main CLI entrypoint."""
+    parser = argparse.ArgumentParser(description="Benchmark leaderboards read from curated Parquet")
+    parser.add_argument("--rows", type=int, default=50_000, help="Players in the kingdom (default: 50000)")
+    parser.add_argument("--repeats", type=int, default=20, help="Timed runs per query (default: 20)")
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = build_partition(args.rows, Path(tmp))
+        
+        for metric_column, limit in QUERIES:
+            assert select(path, metric_column, limit) == full_sort(path, metric_column, limit)
+            result = {"rows": args.rows, "metric": metric_column, "limit": limit}
+            for name, reader in (("select", select), ("full_sort", full_sort)):
+                result[name] = time_ms(lambda: reader(path, metric_column, limit), args.repeats)
+            print(json.dumps(result))
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
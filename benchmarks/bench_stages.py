@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""Per-stage timing and peak memory of local ingestion at several scales.
+
+For each scale a synthetic export (see synthetic.py) is written once, then
+ingested in fresh interpreters so peak RSS is not polluted by earlier runs:
+
+- a stage run times read, validate, normalize, metadata, hash and write
+  separately, recording the process's peak RSS after each stage;
+- an end-to-end run times process_ingestion with its default options
+  (leaderboard artifacts, deltas, history, catalog).
+
+Results are printed as JSON lines and, with --output, saved with the commit
+and library versions so two commits can be compared with --compare.
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Add src to path for imports
+sys.path.insert(0, str(ROOT / "src"))
+
+STAGES = ("read", "validate", "normalize", "metadata", "hash", "write")
+
+
+def run_stage_worker(input_path: str, out_dir: str) -> dict:
+    """Run the pandas ingestion stages one by one in this process."""
+    from ingest_players.hashing import add_ingestion_metadata, add_record_hash
+    from ingest_players.io_local import read_input_file, write_parquet
+    from ingest_players.memory import peak_rss_mb
+    from ingest_players.normalize import normalize_df
+    from ingest_players.validation import validate_required_columns, validate_unique_id
+    
+    def validate(df):
+        df.columns = df.columns.str.lower()
+        validate_required_columns(df)
+        validate_unique_id(df)
+        return df
+    
+    steps = {
+        "read": lambda _: read_input_file(input_path),
+        "validate": validate,
+        "normalize": lambda df: normalize_df(df, "51", "2026-01-26"),
+        "metadata": lambda df: add_ingestion_metadata(df, run_id="bench"),
+        "hash": add_record_hash,
+        "write": lambda df: write_parquet(df, f"{out_dir}/players.parquet") or df,
+    }
+    
+    stages = {}
+    df = None
+    for stage in STAGES:
+        start = time.perf_counter()
+        df = steps[stage](df)
+        stages[stage] = {
+            "seconds": round(time.perf_counter() - start, 4),
+            "peak_rss_mb": peak_rss_mb(),
+        }
+    
+    return {"rows": len(df), "stages": stages}
+
+
+def run_e2e_worker(input_path: str, out_dir: str) -> dict:
+    """Run process_ingestion with its default options in this process."""
+    from ingest_players.handler import process_ingestion
+    
+    start = time.perf_counter()
+    result = process_ingestion(input_path, "51", "2026-01-26", out_dir)
+    return {
+        "rows": result["rows"],
+        "seconds": round(time.perf_counter() - start, 4),
+        "peak_rss_mb": result["peak_rss_mb"],
+    }
+
+
+def run_worker(mode: str, input_path: str, out_dir: str) -> dict:
+    """Run one worker in a fresh interpreter and parse its JSON result."""
+    args = [sys.executable, __file__, "--worker", mode, input_path, out_dir]
+    output = subprocess.run(args, check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def environment() -> dict:
+    """Commit and library versions, so saved results can be told apart."""
+    import numpy
+    import pandas
+    import pyarrow
+    
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    
+    return {
+        "commit": commit,
+        "timestamp": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "python": platform.python_version(),
+        "pandas": pandas.__version__,
+        "pyarrow": pyarrow.__version__,
+        "numpy": numpy.__version__,
+        "machine": platform.machine(),
+    }
+
+
+def compare(results: list, baseline_path: str) -> None:
+    """Print current/baseline time ratios per scale and stage (<1 is faster)."""
+    baseline = {
+        (r["rows"], r["format"]): r
+        for r in json.loads(Path(baseline_path).read_text())["results"]
+    }
+    for result in results:
+        base = baseline.get((result["rows"], result["format"]))
+        if base is None:
+            continue
+        ratios = {
+            stage: round(result["stages"][stage]["seconds"] / base["stages"][stage]["seconds"], 2)
+            for stage in STAGES
+            if base["stages"].get(stage, {}).get("seconds")
+        }
+        if base.get("e2e_seconds"):
+            ratios["e2e"] = round(result["e2e_seconds"] / base["e2e_seconds"], 2)
+        print(json.dumps({"compare": baseline_path, "rows": result["rows"], "format": result["format"], **ratios}))
+
+
+def main():
+    """Main CLI entrypoint."""
+    parser = argparse.ArgumentParser(description="Time each ingestion stage on synthetic exports")
+    parser.add_argument(
+        "--sizes",
+        default="10000,100000,300000",
+        help="Comma-separated rows per export (default: 10000,100000,300000)"
+    )
+    parser.add_argument(
+        "--formats",
+        default="csv",
+        help="Comma-separated input formats, csv and/or json (default: csv)"
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=42,
+        help="Synthetic data seed (default: 42)"
+    )
+    parser.add_argument(
+        "--output",
+        help="Write all results with environment details to this JSON file"
+    )
+    parser.add_argument(
+        "--compare",
+        help="Results file from an earlier run to print time ratios against"
+    )
+    parser.add_argument("--worker", nargs=3, metavar=("MODE", "INPUT", "OUT_DIR"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.worker:
+        mode, input_path, out_dir = args.worker
+        worker = run_stage_worker if mode == "stages" else run_e2e_worker
+        print(json.dumps(worker(input_path, out_dir)))
+        return 0
+    
+    from synthetic import generate_snapshot, write_snapshot
+    
+    results = []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for rows in [int(s) for s in args.sizes.split(",")]:
+            df = generate_snapshot(rows, seed=args.seed)
+            for fmt in args.formats.split(","):
+                input_path = Path(tmpdir) / f"players_{rows}.{fmt}"
+                input_bytes = write_snapshot(df, input_path, fmt)
+                
+                staged = run_worker("stages", str(input_path), f"{tmpdir}/stages_{rows}_{fmt}")
+                e2e = run_worker("e2e", str(input_path), f"{tmpdir}/e2e_{rows}_{fmt}")
+                
+                total = sum(s["seconds"] for s in staged["stages"].values())
+                result = {
+                    "rows": rows,
+                    "format": fmt,
+                    "input_bytes": input_bytes,
+                    "stages": staged["stages"],
+                    "total_seconds": round(total, 4),
+                    "rows_per_s": round(rows / total) if total else None,
+                    "peak_rss_mb": staged["stages"][STAGES[-1]]["peak_rss_mb"],
+                    "e2e_seconds": e2e["seconds"],
+                    "e2e_peak_rss_mb": e2e["peak_rss_mb"],
+                }
+                print(json.dumps(result))
+                results.append(result)
+    
+    if args.output:
+        Path(args.output).write_text(json.dumps({"environment": environment(), "results": results}, indent=2))
+    
+    if args.compare:
+        compare(results, args.compare)
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
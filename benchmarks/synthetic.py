@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""Deterministic synthetic player exports shaped like real scanner uploads.
+
+Every declared column of the Athena table is present, with title-cased
+headers and a few undeclared extras as the scanner tools emit them. Names
+mix Latin, CJK, Cyrillic, Arabic, Hangul, emoji and combining marks, and
+some carry stray whitespace, quotes or commas. Metrics are long-tailed and
+internally consistent (total kills is the tier sum, t45 is t4 + t5), and a
+small share of metric cells is blank.
+
+The same (seed, kingdom, rows) always produces the same frame, regardless of
+which other kingdoms are generated.
+
+Usage:
+    python benchmarks/synthetic.py --rows 300000 --kingdoms 20 --out-dir synthetic
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Dict, Iterator, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from ingest_players.schema import BUSINESS_COLUMNS
+
+NAME_PARTS = [
+    "Ash", "Blade", "Kai", "Luna", "Rex", "Nova", "Storm", "Vex", "Iron", "Shadow",
+    "王者", "龍騎士", "無敵", "Дракон", "Волк", "Царь", "ملك", "سيف", "강철", "전사",
+    "ドラゴン", "侍", "Ñoño", "Zoë", "Şahin", "Łukasz", "Ægir", "Z̷a̷l̷g̷o̷", "ℜ𝔢𝔵", "🔥", "⚔️", "👑",
+]
+
+ALLIANCE_TAGS = ["", "GoT", "ACE", "中华", "RUS", "عرب", "KOR", "夜", "🐉W", "Ωmega"]
+
+# Share of metric cells left blank
+BLANK_RATE = 0.005
+
+
+def header(column: str) -> str:
+    """Scanner-style header for a declared column, e.g. "t4 kills" -> "T4 Kills"."""
+    return column if column == "id" else column.title()
+
+
+def _names(rng: np.random.Generator, rows: int) -> np.ndarray:
+    parts = np.array(NAME_PARTS, dtype=object)
+    names = parts[rng.integers(0, len(parts), rows)] + parts[rng.integers(0, len(parts), rows)]
+    names = names + rng.integers(0, 10_000, rows).astype(str).astype(object)
+    
+    # Decorations that exercise CSV quoting and whitespace handling
+    messy = rng.random(rows)
+    names = np.where(messy < 0.02, "  " + names + " ", names)
+    names = np.where((messy >= 0.02) & (messy < 0.03), names + ', "the" ' + names, names)
+    names = np.where((messy >= 0.03) & (messy < 0.035), "", names)
+    return names
+
+
+def generate_snapshot(rows: int, kingdom: str = "51", seed: int = 42) -> pd.DataFrame:
+    """
+    Generate one kingdom's export.
+    
+    Args:
+        rows: Number of governors
+        kingdom: Kingdom identifier, mixed into the seed
+        seed: Base random seed
+    
+    Returns:
+        DataFrame with scanner-style headers for every declared column plus
+        undeclared extras; metric columns are nullable Int64
+    """
+    rng = np.random.default_rng([seed, int(kingdom)])
+    
+    # Unique, shuffled ids; a few carry whitespace that normalization strips
+    ids = (10_000_000 + rng.permutation(rows) * 37 + rng.integers(0, 37, rows)).astype(str).astype(object)
+    ids = np.where(rng.random(rows) < 0.01, " " + ids + " ", ids)
+    
+    power = (rng.pareto(1.2, rows) * 2_000_000 + 50_000).astype(np.int64)
+    scale = power / 1_000_000
+    kills = {
+        f"t{tier}": (rng.pareto(1.5, rows) * scale * weight).astype(np.int64)
+        for tier, weight in ((1, 400_000), (2, 150_000), (3, 80_000), (4, 60_000), (5, 25_000))
+    }
+    metrics = {
+        "power": power,
+        "killpoints": (
+            kills["t1"] // 5 + kills["t2"] * 2 + kills["t3"] * 4 + kills["t4"] * 10 + kills["t5"] * 20
+        ),
+        "deads": (rng.pareto(2.0, rows) * scale * 20_000).astype(np.int64),
+        **{f"{tier} kills": values for tier, values in kills.items()},
+        "total kills": sum(kills.values()),
+        "t45 kills": kills["t4"] + kills["t5"],
+        "ranged": (rng.pareto(1.5, rows) * scale * 100_000).astype(np.int64),
+        "rss gathered": (rng.pareto(1.3, rows) * 50_000_000).astype(np.int64),
+        "rss assistance": (rng.pareto(1.3, rows) * 10_000_000).astype(np.int64),
+        "helps": rng.integers(0, 50_000, rows),
+    }
+    
+    tags = np.array(ALLIANCE_TAGS, dtype=object)
+    alliances = tags[rng.integers(0, len(tags), rows)]
+    
+    columns: Dict[str, object] = {}
+    for column in BUSINESS_COLUMNS:
+        if column == "id":
+            values = ids
+        elif column == "name":
+            values = _names(rng, rows)
+        elif column == "alliance":
+            values = np.where(alliances == "", alliances, "[" + alliances + "]")
+        else:
+            values = pd.array(metrics[column], dtype="Int64")
+            values[rng.random(rows) < BLANK_RATE] = pd.NA
+        columns[header(column)] = values
+    
+    # Undeclared columns present in scanner exports; the parser skips them
+    columns["Civilization"] = rng.choice(["Rome", "China", "Korea", "Byzantium"], rows)
+    columns["Location"] = rng.integers(0, 1200, rows).astype(str)
+    columns["Scan Time"] = "2026-01-26T00:00:00Z"
+    
+    return pd.DataFrame(columns)
+
+
+def generate_kingdoms(total_rows: int, kingdoms: int, seed: int = 42) -> Iterator[Tuple[str, pd.DataFrame]]:
+    """
+    Generate exports for many kingdoms with uneven populations.
+    
+    Args:
+        total_rows: Governors across all kingdoms
+        kingdoms: Number of kingdoms
+        seed: Base random seed
+    
+    Yields:
+        (kingdom, DataFrame) pairs, kingdoms numbered from 1001
+    """
+    weights = np.random.default_rng(seed).dirichlet(np.full(kingdoms, 5.0))
+    sizes = np.floor(weights * total_rows).astype(int)
+    sizes[0] += total_rows - sizes.sum()
+    
+    for i, rows in enumerate(sizes):
+        kingdom = str(1001 + i)
+        yield kingdom, generate_snapshot(int(rows), kingdom, seed)
+
+
+def write_snapshot(df: pd.DataFrame, path: Path, fmt: str = "csv") -> int:
+    """
+    Write an export as the scanner tools do.
+    
+    Args:
+        df: Generated export
+        path: Output file path
+        fmt: "csv" or "json" (an array of records)
+    
+    Returns:
+        File size in bytes
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if fmt == "csv":
+        df.to_csv(path, index=False)
+    else:
+        records = df.astype(object).where(df.notna(), None).to_dict(orient="records")
+        path.write_text(json.dumps(records, ensure_ascii=False), encoding="utf-8")
+    return path.stat().st_size
+
+
+def main():
+    """Main CLI entrypoint."""
+    parser = argparse.ArgumentParser(description="Write synthetic player exports in the inbox layout")
+    parser.add_argument("--rows", type=int, default=300_000, help="Governors across all kingdoms (default: 300000)")
+    parser.add_argument("--kingdoms", type=int, default=20, help="Number of kingdoms (default: 20)")
+    parser.add_argument("--dt", default="2026-01-26", help="Snapshot date (default: 2026-01-26)")
+    parser.add_argument("--format", choices=["csv", "json"], default="csv", help="Output format (default: csv)")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed (default: 42)")
+    parser.add_argument("--out-dir", required=True, help="Root directory; files go under inbox/")
+    args = parser.parse_args()
+    
+    for kingdom, df in generate_kingdoms(args.rows, args.kingdoms, args.seed):
+        path = (
+            Path(args.out_dir) / "inbox" / "source=rok_players"
+            / f"kingdom={kingdom}" / f"dt={args.dt}" / f"players.{args.format}"
+        )
+        size = write_snapshot(df, path, args.format)
+        print(json.dumps({"kingdom": kingdom, "rows": len(df), "bytes": size, "path": str(path)}))
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -50,6 +50,30 @@ export async function fetchLeaderboard({ kingdom, metric, dt = 'latest', limit =
   return await response.json()
 }
 
+/**
+ * Fetch the snapshot dates available for a kingdom
+ * 
+ * @param {string} kingdom - Kingdom ID
+ * @returns {Promise<Object>} Snapshot catalog ({ kingdom, latest, snapshots: [{ dt, rows, run_id }] })
+ */
+export async function fetchSnapshots(kingdom) {
+  const params = new URLSearchParams({ kingdom })
+  const url = `${API_BASE_URL}/snapshots?${params}`
+  
+  const response = await fetch(url, {
+    method: 'GET',
+    headers: {
+      'Content-Type': 'application/json',
+    },
+  })
+  
+  if (!response.ok) {
+    throw new Error(`Snapshot listing failed (${response.status})`)
+  }
+  
+  return await response.json()
+}
+
 /**
  * Check API health status
  * 
@@ -1,33 +1,88 @@
 /**
  * Date selector component with "Use Latest" option
+ * 
+ * When the API lists the kingdom's snapshots, only those dates are offered.
+ * Otherwise any date can be typed in.
  */
 
 import { appState } from '../state.js'
+import { fetchSnapshots } from '../api/leaderboard.js'
 
 export class DateSelector {
   constructor(containerId) {
     this.container = document.getElementById(containerId)
+    this.kingdom = null
     this.render()
     this.attachListeners()
+    
+    appState.subscribe((state) => {
+      if (state.kingdom !== this.kingdom) {
+        this.loadSnapshots(state.kingdom)
+      }
+    })
+    this.loadSnapshots(appState.get().kingdom)
+  }
+  
+  loadSnapshots(kingdom) {
+    this.kingdom = kingdom
+    clearTimeout(this.debounce)
+    
+    // Wait for the user to stop typing before asking the API
+    this.debounce = setTimeout(async () => {
+      let snapshotDates = null
+      if (/^[0-9]{1,6}$/.test(kingdom)) {
+        try {
+          const catalog = await fetchSnapshots(kingdom)
+          snapshotDates = catalog.snapshots.map(s => s.dt).reverse()
+        } catch (error) {
+          console.warn('Snapshot listing unavailable:', error)
+        }
+      }
+      
+      // Ignore responses for a kingdom that is no longer selected
+      if (kingdom !== this.kingdom) {
+        return
+      }
+      
+      const state = appState.get()
+      const updates = { snapshotDates }
+      if (snapshotDates && !state.useLatest && !snapshotDates.includes(state.dt)) {
+        updates.dt = snapshotDates[0] || ''
+      }
+      appState.set(updates)
+      this.render()
+      this.attachListeners()
+    }, 300)
   }
   
   render() {
     const state = appState.get()
+    const dates = state.snapshotDates
     
-    this.container.innerHTML = `
-      <div class="control-group">
-        <label for="dt-input">Date:</label>
+    const picker = dates
+      ? `
+        <select id="dt-input" ${state.useLatest ? 'disabled' : ''}>
+          ${dates.map(dt => `<option value="${dt}" ${dt === state.dt ? 'selected' : ''}>${dt}</option>`).join('')}
+        </select>
+      `
+      : `
         <input 
           type="date" 
           id="dt-input" 
           ${state.useLatest ? 'disabled' : ''}
           value="${state.useLatest ? '' : state.dt}"
         >
+      `
+    
+    this.container.innerHTML = `
+      <div class="control-group">
+        <label for="dt-input">Date:</label>
+        ${picker}
         <label class="checkbox-label">
           <input type="checkbox" id="use-latest-checkbox" ${state.useLatest ? 'checked' : ''}> 
           Use Latest
         </label>
-        <span class="help-text">Or select a specific snapshot date</span>
+        <span class="help-text">${dates ? `${dates.length} snapshots available` : 'Or select a specific snapshot date'}</span>
       </div>
     `
   }
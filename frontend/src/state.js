@@ -13,6 +13,9 @@ class AppState {
       useLatest: true,
       limit: 100,
       
+      // Snapshot dates available for the kingdom (null = unknown, allow any date)
+      snapshotDates: null,
+      
       // Data and UI state
       leaderboardData: null,
       loading: false,
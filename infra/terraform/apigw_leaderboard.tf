@@ -34,6 +34,20 @@ resource "aws_apigatewayv2_route" "get_leaderboard" {
   target    = "integrations/${aws_apigatewayv2_integration.leaderboard_lambda.id}"
 }
 
+# GET /snapshots route
+resource "aws_apigatewayv2_route" "get_snapshots" {
+  api_id    = aws_apigatewayv2_api.leaderboard_http.id
+  route_key = "GET /snapshots"
+  target    = "integrations/${aws_apigatewayv2_integration.leaderboard_lambda.id}"
+}
+
+# GET /player route
+resource "aws_apigatewayv2_route" "get_player" {
+  api_id    = aws_apigatewayv2_api.leaderboard_http.id
+  route_key = "GET /player"
+  target    = "integrations/${aws_apigatewayv2_integration.leaderboard_lambda.id}"
+}
+
 # GET /health route
 resource "aws_apigatewayv2_route" "health_check" {
   api_id    = aws_apigatewayv2_api.leaderboard_http.id
@@ -12,7 +12,7 @@ data "archive_file" "leaderboard_zip" {
   type        = "zip"
   source_dir  = "${path.module}/../../src/leaderboard_api"
   output_path = "${path.module}/dist/leaderboard_api.zip"
-  
+
   depends_on = [null_resource.dist_dir]
 }
 
@@ -151,7 +151,23 @@ resource "aws_iam_policy" "leaderboard_lambda_s3" {
           "s3:GetObject"
         ]
         Resource = [
-          "${aws_s3_bucket.data_lake.arn}/curated/*"
+          "${aws_s3_bucket.data_lake.arn}/curated/*",
+          "${aws_s3_bucket.data_lake.arn}/leaderboards/*",
+          "${aws_s3_bucket.data_lake.arn}/catalog/*",
+          "${aws_s3_bucket.data_lake.arn}/history/*",
+          "${aws_s3_bucket.data_lake.arn}/serving/*"
+        ]
+      },
+      {
+        # Query results shared between containers, and their stampede leases
+        Effect = "Allow"
+        Action = [
+          "s3:GetObject",
+          "s3:PutObject",
+          "s3:DeleteObject"
+        ]
+        Resource = [
+          "${aws_s3_bucket.data_lake.arn}/query-cache/*"
         ]
       }
     ]
@@ -189,14 +205,30 @@ resource "aws_lambda_function" "leaderboard_api" {
   timeout          = 30
   memory_size      = 512
 
+  # pyarrow for /player and the parquet query engine comes from a layer;
+  # without one /player returns 501 and leaderboards fall back to Athena
+  layers = var.leaderboard_layers
+
   environment {
     variables = {
-      ATHENA_DATABASE    = "rok_ingestion_data"
-      ATHENA_TABLE       = "rok_players_curated"
-      ATHENA_RESULTS_S3  = "s3://${aws_s3_bucket.data_lake.bucket}/athena-results/"
+      ATHENA_DATABASE        = "rok_ingestion_data"
+      ATHENA_TABLE           = "rok_players_curated"
+      ATHENA_RESULTS_S3      = "s3://${aws_s3_bucket.data_lake.bucket}/athena-results/"
+      DATA_BUCKET            = aws_s3_bucket.data_lake.bucket
+      LEADERBOARD_SERVING    = "store"
+      CATALOG_TTL_SECONDS    = "60"
+      RESULT_CACHE_ENTRIES   = "1024"
+      SHARED_QUERY_CACHE     = "1"
+      QUERY_ENGINE           = "parquet"
+      SERVING_STORE_KINGDOMS = "8"
     }
   }
 
+  # Serving stores are downloaded to /tmp, one per recently used kingdom
+  ephemeral_storage {
+    size = 2048
+  }
+
   depends_on = [
     aws_cloudwatch_log_group.leaderboard_api,
     aws_iam_role_policy_attachment.leaderboard_lambda_logs,
@@ -24,6 +24,36 @@ resource "aws_s3_bucket" "data_lake" {
   }
 }
 
+# Shared leaderboard query results are rebuilt on demand, so old ones can go
+resource "aws_s3_bucket_lifecycle_configuration" "data_lake" {
+  bucket = aws_s3_bucket.data_lake.id
+
+  rule {
+    id     = "expire-query-cache"
+    status = "Enabled"
+
+    filter {
+      prefix = "query-cache/"
+    }
+
+    expiration {
+      days = 7
+    }
+  }
+
+  # Safety net for streamed curated uploads whose abort did not run
+  rule {
+    id     = "abort-incomplete-multipart-uploads"
+    status = "Enabled"
+
+    filter {}
+
+    abort_incomplete_multipart_upload {
+      days_after_initiation = 1
+    }
+  }
+}
+
 # ECR repository for ingestion Lambda container image
 resource "aws_ecr_repository" "ingest" {
   name                 = "${var.project_name}-ingest"
@@ -74,7 +104,11 @@ resource "aws_iam_policy" "ingest_lambda_s3" {
           "s3:GetObject"
         ]
         Resource = [
-          "${aws_s3_bucket.data_lake.arn}/inbox/*"
+          "${aws_s3_bucket.data_lake.arn}/inbox/*",
+          "${aws_s3_bucket.data_lake.arn}/catalog/*",
+          "${aws_s3_bucket.data_lake.arn}/curated/*",
+          "${aws_s3_bucket.data_lake.arn}/registry/*",
+          "${aws_s3_bucket.data_lake.arn}/history/*"
         ]
       },
       {
@@ -84,6 +118,34 @@ resource "aws_iam_policy" "ingest_lambda_s3" {
         ]
         Resource = [
           "${aws_s3_bucket.data_lake.arn}/raw/*",
+          "${aws_s3_bucket.data_lake.arn}/curated/*",
+          "${aws_s3_bucket.data_lake.arn}/leaderboards/*",
+          "${aws_s3_bucket.data_lake.arn}/catalog/*",
+          "${aws_s3_bucket.data_lake.arn}/deltas/*",
+          "${aws_s3_bucket.data_lake.arn}/registry/*",
+          "${aws_s3_bucket.data_lake.arn}/history/*",
+          "${aws_s3_bucket.data_lake.arn}/serving/*"
+        ]
+      },
+      {
+        # Removes the raw copy of an input whose ingestion failed, and
+        # serving store versions the catalog no longer points at
+        Effect = "Allow"
+        Action = [
+          "s3:DeleteObject"
+        ]
+        Resource = [
+          "${aws_s3_bucket.data_lake.arn}/raw/*",
+          "${aws_s3_bucket.data_lake.arn}/serving/*"
+        ]
+      },
+      {
+        # Abandons a streamed curated upload that failed, so no parts stay billed
+        Effect = "Allow"
+        Action = [
+          "s3:AbortMultipartUpload"
+        ]
+        Resource = [
           "${aws_s3_bucket.data_lake.arn}/curated/*"
         ]
       },
@@ -168,6 +230,7 @@ resource "aws_lambda_function" "ingest" {
       SOURCE_NAME    = "rok_players"
       RAW_PREFIX     = "raw/"
       CURATED_PREFIX = "curated/"
+      EMIT_METRICS   = "1"
     }
   }
 
@@ -39,3 +39,9 @@ variable "source_repo_branch" {
   type        = string
   default     = "master"
 }
+
+variable "leaderboard_layers" {
+  description = "Lambda layer ARNs for the leaderboard API, e.g. the AWS SDK for pandas layer that provides pyarrow for /player and QUERY_ENGINE=parquet"
+  type        = list(string)
+  default     = []
+}
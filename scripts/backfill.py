@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""Rebuild curated snapshots from the raw tier in S3 or a local out_dir."""
+
+import argparse
+import json
+import sys
+from dataclasses import asdict
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from ingest_players.backfill import discover_local, discover_s3, latest_per_snapshot, run_backfill
+
+
+def main():
+    """Main CLI entrypoint."""
+    parser = argparse.ArgumentParser(
+        description="Replay the newest raw object of every kingdom/dt into the curated tier"
+    )
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument(
+        "--bucket",
+        help="S3 bucket whose raw/ tier is replayed"
+    )
+    target.add_argument(
+        "--out-dir",
+        help="Local output directory whose raw/ tier is replayed"
+    )
+    parser.add_argument(
+        "--kingdom",
+        action="append",
+        help="Only replay this kingdom (repeatable)"
+    )
+    parser.add_argument(
+        "--since",
+        help="Only replay dates on or after YYYY-MM-DD"
+    )
+    parser.add_argument(
+        "--until",
+        help="Only replay dates on or before YYYY-MM-DD"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Worker processes (default: 4; 1 runs in-process)"
+    )
+    parser.add_argument(
+        "--progress",
+        default="backfill_progress.jsonl",
+        help="Progress file of this run, started over unless --resume (default: backfill_progress.jsonl)"
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip the tasks the progress file records as done, to continue an interrupted run"
+    )
+    parser.add_argument(
+        "--chunk-rows",
+        type=int,
+        default=0,
+        help="Process each input in chunks of this many rows (default: 0, whole file)"
+    )
+    parser.add_argument(
+        "--engine",
+        choices=["pandas", "arrow"],
+        default="pandas",
+        help="Ingestion engine (default: pandas)"
+    )
+    parser.add_argument(
+        "--no-deltas",
+        action="store_true",
+        help="Skip rebuilding snapshot deltas"
+    )
+    parser.add_argument(
+        "--no-history",
+        action="store_true",
+        help="Skip compacting player histories"
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="List the raw objects that would be replayed and exit"
+    )
+    
+    args = parser.parse_args()
+    
+    inputs = discover_s3(args.bucket) if args.bucket else discover_local(args.out_dir)
+    items = [
+        item for item in latest_per_snapshot(inputs)
+        if (not args.kingdom or item.kingdom in args.kingdom)
+        and (not args.since or item.dt >= args.since)
+        and (not args.until or item.dt <= args.until)
+    ]
+    
+    if args.dry_run:
+        for item in items:
+            print(json.dumps(asdict(item)))
+        return 0
+    
+    def report(result):
+        # One JSON line per finished task
+        print(json.dumps(result), flush=True)
+    
+    summary = run_backfill(
+        items,
+        bucket=args.bucket,
+        out_dir=args.out_dir,
+        max_workers=args.workers,
+        progress_path=args.progress,
+        chunk_rows=args.chunk_rows,
+        engine=args.engine,
+        deltas=not args.no_deltas,
+        history=not args.no_history,
+        on_result=report,
+        resume=args.resume,
+    )
+    print(json.dumps({"summary": summary}))
+    
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""Rebuild kingdom player histories from every snapshot in their catalogs."""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from ingest_players.history import compact_local_history, compact_s3_history
+
+
+def main():
+    """Main CLI entrypoint."""
+    parser = argparse.ArgumentParser(
+        description="Compact curated snapshots into per-kingdom player history files"
+    )
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument(
+        "--bucket",
+        help="S3 bucket holding the catalog and curated tiers"
+    )
+    target.add_argument(
+        "--out-dir",
+        help="Local output directory holding the catalog and curated tiers"
+    )
+    parser.add_argument(
+        "--source",
+        default="rok_players",
+        help="Source name (default: rok_players; S3 only)"
+    )
+    parser.add_argument(
+        "--kingdom",
+        action="append",
+        required=True,
+        help="Kingdom to compact (repeatable)"
+    )
+    
+    args = parser.parse_args()
+    
+    failed = 0
+    for kingdom in args.kingdom:
+        try:
+            if args.bucket:
+                summary = compact_s3_history(args.bucket, args.source, kingdom)
+            else:
+                summary = compact_local_history(args.out_dir, kingdom)
+            print(json.dumps({"kingdom": kingdom, **summary}))
+        except Exception as e:
+            failed += 1
+            print(json.dumps({"kingdom": kingdom, "error": str(e)}))
+    
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
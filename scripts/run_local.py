@@ -37,6 +37,18 @@ def main():
         default="local_out",
         help="Output directory (default: local_out)"
     )
+    parser.add_argument(
+        "--chunk-rows",
+        type=int,
+        default=0,
+        help="Process the input in chunks of this many rows (default: 0, whole file)"
+    )
+    parser.add_argument(
+        "--engine",
+        choices=["pandas", "arrow"],
+        default="pandas",
+        help="Ingestion engine (default: pandas)"
+    )
     
     args = parser.parse_args()
     
@@ -47,11 +59,21 @@ def main():
     print(f"Kingdom: {args.kingdom}")
     print(f"Date: {args.dt}")
     print(f"Output: {args.out_dir}")
+    print(f"Engine: {args.engine}")
+    if args.chunk_rows:
+        print(f"Chunk rows: {args.chunk_rows}")
     print("=" * 60)
     print()
     
     try:
-        result = process_ingestion(args.input, args.kingdom, args.dt, args.out_dir)
+        result = process_ingestion(
+            args.input,
+            args.kingdom,
+            args.dt,
+            args.out_dir,
+            chunk_rows=args.chunk_rows,
+            engine=args.engine,
+        )
         print()
         print("✓ Ingestion completed successfully!")
         print()
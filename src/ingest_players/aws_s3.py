@@ -1,8 +1,45 @@
 """AWS S3 helper functions for file operations."""
 
-import boto3
+import io
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterator, Optional, Tuple
 
-s3_client = boto3.client("s3")
+from botocore.exceptions import ClientError
+
+from .config import (
+    MIN_MULTIPART_PART_SIZE,
+    MULTIPART_CONCURRENCY,
+    MULTIPART_PART_SIZE,
+    S3_MAX_POOL_CONNECTIONS,
+)
+
+# Created on first use and then shared by every thread for the container's
+# lifetime; building a client costs ~200 ms, which cold starts only pay once
+s3_client = None
+_s3_client_lock = threading.Lock()
+
+
+def get_s3_client():
+    """
+    Return the shared S3 client, creating it on first use.
+    
+    boto3 is imported here rather than at module load so code paths that never
+    touch S3 (local runs, skipped events) do not pay for it.
+    
+    Returns:
+        boto3 S3 client
+    """
+    global s3_client
+    if s3_client is None:
+        with _s3_client_lock:
+            if s3_client is None:
+                import boto3
+                from botocore.config import Config
+                
+                s3_client = boto3.client("s3", config=Config(max_pool_connections=S3_MAX_POOL_CONNECTIONS))
+    return s3_client
 
 
 def download_s3_object(bucket: str, key: str, local_path: str) -> None:
@@ -14,7 +51,7 @@ def download_s3_object(bucket: str, key: str, local_path: str) -> None:
         key: S3 object key
         local_path: Local file path to save to
     """
-    s3_client.download_file(bucket, key, local_path)
+    get_s3_client().download_file(bucket, key, local_path)
 
 
 def upload_file_to_s3(local_path: str, bucket: str, key: str) -> None:
@@ -26,7 +63,7 @@ def upload_file_to_s3(local_path: str, bucket: str, key: str) -> None:
         bucket: S3 bucket name
         key: S3 object key
     """
-    s3_client.upload_file(local_path, bucket, key)
+    get_s3_client().upload_file(local_path, bucket, key)
 
 
 def upload_bytes_to_s3(data_bytes: bytes, bucket: str, key: str) -> None:
@@ -38,4 +75,321 @@ def upload_bytes_to_s3(data_bytes: bytes, bucket: str, key: str) -> None:
         bucket: S3 bucket name
         key: S3 object key
     """
-    s3_client.put_object(Bucket=bucket, Key=key, Body=data_bytes)
+    get_s3_client().put_object(Bucket=bucket, Key=key, Body=data_bytes)
+
+
+def upload_objects_to_s3(objects: Dict[str, bytes], bucket: str, max_workers: int = 8) -> None:
+    """
+    Upload many small objects concurrently.
+    
+    Args:
+        objects: Dict of S3 object key -> bytes
+        bucket: S3 bucket name
+        max_workers: Upper bound on concurrent put_object calls
+    """
+    if not objects:
+        return
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(objects))) as pool:
+        # list() surfaces the first upload error
+        list(pool.map(lambda item: upload_bytes_to_s3(item[1], bucket, item[0]), objects.items()))
+
+
+def get_s3_object_stream(bucket: str, key: str):
+    """
+    Open an S3 object for a single forward-only read.
+    
+    Args:
+        bucket: S3 bucket name
+        key: S3 object key
+        
+    Returns:
+        File-like streaming body
+    """
+    response = get_s3_client().get_object(Bucket=bucket, Key=key)
+    return response["Body"]
+
+
+def list_s3_keys(bucket: str, prefix: str) -> Iterator[Tuple[str, int]]:
+    """
+    List every object under a prefix.
+    
+    Args:
+        bucket: S3 bucket name
+        prefix: Key prefix
+        
+    Yields:
+        Tuples of (key, size in bytes)
+    """
+    kwargs = {"Bucket": bucket, "Prefix": prefix}
+    while True:
+        response = get_s3_client().list_objects_v2(**kwargs)
+        for obj in response.get("Contents", []):
+            yield obj["Key"], obj["Size"]
+        if not response.get("IsTruncated"):
+            return
+        kwargs["ContinuationToken"] = response["NextContinuationToken"]
+
+
+def head_s3_object(bucket: str, key: str) -> dict:
+    """
+    Get an S3 object's metadata, including any stored checksum.
+    
+    Args:
+        bucket: S3 bucket name
+        key: S3 object key
+        
+    Returns:
+        head_object response
+    """
+    return get_s3_client().head_object(Bucket=bucket, Key=key, ChecksumMode="ENABLED")
+
+
+def get_s3_object_with_etag(bucket: str, key: str) -> Tuple[Optional[bytes], Optional[str]]:
+    """
+    Read a small S3 object together with its ETag.
+    
+    Args:
+        bucket: S3 bucket name
+        key: S3 object key
+        
+    Returns:
+        Tuple of (bytes, ETag), or (None, None) if the object does not exist
+    """
+    try:
+        response = get_s3_client().get_object(Bucket=bucket, Key=key)
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") in ("NoSuchKey", "404"):
+            return None, None
+        raise
+    return response["Body"].read(), response["ETag"]
+
+
+def put_s3_object_if_unchanged(data_bytes: bytes, bucket: str, key: str, etag: Optional[str]) -> bool:
+    """
+    Write an object only if nobody else has written it since it was read.
+    
+    Uses S3 conditional writes: If-Match on the ETag that was read, or
+    If-None-Match when the object did not exist yet.
+    
+    Args:
+        data_bytes: Bytes to upload
+        bucket: S3 bucket name
+        key: S3 object key
+        etag: ETag returned by the read, None if the object was absent
+        
+    Returns:
+        True if written, False if the object changed in the meantime
+    """
+    condition = {"IfMatch": etag} if etag else {"IfNoneMatch": "*"}
+    try:
+        get_s3_client().put_object(Bucket=bucket, Key=key, Body=data_bytes, **condition)
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") in ("PreconditionFailed", "ConditionalRequestConflict"):
+            return False
+        raise
+    return True
+
+
+def copy_s3_object(src_bucket: str, src_key: str, dest_bucket: str, dest_key: str) -> None:
+    """
+    Copy an S3 object server-side (no bytes pass through the Lambda).
+    
+    Args:
+        src_bucket: Source bucket name
+        src_key: Source object key
+        dest_bucket: Destination bucket name
+        dest_key: Destination object key
+    """
+    get_s3_client().copy_object(
+        Bucket=dest_bucket,
+        Key=dest_key,
+        CopySource={"Bucket": src_bucket, "Key": src_key},
+    )
+
+
+def start_s3_copy(src_bucket: str, src_key: str, dest_bucket: str, dest_key: str) -> Future:
+    """
+    Start a server-side copy on a background thread.
+    
+    Args:
+        src_bucket: Source bucket name
+        src_key: Source object key
+        dest_bucket: Destination bucket name
+        dest_key: Destination object key
+    
+    Returns:
+        Future resolving to the copy's duration in seconds; it re-raises the
+        copy's error
+    """
+    def timed_copy():
+        start = time.perf_counter()
+        copy_s3_object(src_bucket, src_key, dest_bucket, dest_key)
+        return time.perf_counter() - start
+    
+    pool = ThreadPoolExecutor(max_workers=1)
+    future = pool.submit(timed_copy)
+    # The worker thread exits once the copy is done
+    pool.shutdown(wait=False)
+    return future
+
+
+def delete_s3_object(bucket: str, key: str) -> None:
+    """
+    Delete an S3 object; deleting a missing key is not an error.
+    
+    Args:
+        bucket: S3 bucket name
+        key: S3 object key
+    """
+    get_s3_client().delete_object(Bucket=bucket, Key=key)
+
+
+class S3MultipartWriter(io.RawIOBase):
+    """
+    Write-only file object that streams its bytes to S3 as a multipart upload.
+    
+    Bytes are buffered until a full part is available. Up to max_concurrency
+    parts upload on background threads while the caller keeps encoding, so
+    memory stays at roughly max_concurrency + 1 parts. Outputs smaller than
+    one part are sent with a single put_object instead. Use as a context
+    manager: the upload completes on a clean exit and is aborted if an
+    exception escapes.
+    
+    upload_seconds sums the time spent in S3 calls and wait_seconds the part
+    of it the caller was blocked on, so their difference is upload time that
+    overlapped with the caller's own work.
+    """
+    
+    def __init__(
+        self,
+        bucket: str,
+        key: str,
+        part_size: int = MULTIPART_PART_SIZE,
+        max_concurrency: int = MULTIPART_CONCURRENCY,
+    ):
+        super().__init__()
+        if part_size < MIN_MULTIPART_PART_SIZE:
+            raise ValueError(f"part_size must be at least {MIN_MULTIPART_PART_SIZE} bytes")
+        self.bucket = bucket
+        self.key = key
+        self.part_size = part_size
+        self.max_concurrency = max(1, max_concurrency)
+        self.bytes_written = 0
+        self.upload_seconds = 0.0
+        self.wait_seconds = 0.0
+        self._buffer = bytearray()
+        self._upload_id = None
+        self._parts = []
+        self._next_part = 1
+        self._pending = []
+        self._pool = None
+        self._lock = threading.Lock()
+    
+    def writable(self) -> bool:
+        return True
+    
+    def tell(self) -> int:
+        return self.bytes_written
+    
+    def write(self, data) -> int:
+        if self.closed:
+            raise ValueError("write to closed S3MultipartWriter")
+        self._buffer += data
+        self.bytes_written += len(data)
+        while len(self._buffer) >= self.part_size:
+            self._upload_part(bytes(self._buffer[:self.part_size]))
+            del self._buffer[:self.part_size]
+        return len(data)
+    
+    def _send_part(self, part_number: int, body: bytes) -> dict:
+        start = time.perf_counter()
+        response = get_s3_client().upload_part(
+            Bucket=self.bucket,
+            Key=self.key,
+            UploadId=self._upload_id,
+            PartNumber=part_number,
+            Body=body,
+        )
+        with self._lock:
+            self.upload_seconds += time.perf_counter() - start
+        return {"ETag": response["ETag"], "PartNumber": part_number}
+    
+    def _wait(self, future) -> None:
+        start = time.perf_counter()
+        part = future.result()
+        self.wait_seconds += time.perf_counter() - start
+        self._parts.append(part)
+    
+    def _upload_part(self, body: bytes) -> None:
+        if self._upload_id is None:
+            response = get_s3_client().create_multipart_upload(Bucket=self.bucket, Key=self.key)
+            self._upload_id = response["UploadId"]
+            self._pool = ThreadPoolExecutor(max_workers=self.max_concurrency)
+        
+        # Wait for the oldest part first so buffered parts stay bounded
+        while len(self._pending) >= self.max_concurrency:
+            self._wait(self._pending.pop(0))
+        self._pending.append(self._pool.submit(self._send_part, self._next_part, body))
+        self._next_part += 1
+    
+    def close(self) -> None:
+        """
+        Flush the remaining buffer, wait for every part and complete the upload.
+        
+        If a part or the completion fails, the upload is aborted before the
+        error propagates, so no orphaned parts stay billed.
+        """
+        if self.closed:
+            return
+        try:
+            start = time.perf_counter()
+            if self._upload_id is None:
+                get_s3_client().put_object(Bucket=self.bucket, Key=self.key, Body=bytes(self._buffer))
+                elapsed = time.perf_counter() - start
+                self.upload_seconds += elapsed
+                self.wait_seconds += elapsed
+            else:
+                try:
+                    if self._buffer:
+                        self._upload_part(bytes(self._buffer))
+                    while self._pending:
+                        self._wait(self._pending.pop(0))
+                    self._pool.shutdown()
+                    
+                    start = time.perf_counter()
+                    get_s3_client().complete_multipart_upload(
+                        Bucket=self.bucket,
+                        Key=self.key,
+                        UploadId=self._upload_id,
+                        MultipartUpload={"Parts": sorted(self._parts, key=lambda part: part["PartNumber"])},
+                    )
+                    elapsed = time.perf_counter() - start
+                    self.upload_seconds += elapsed
+                    self.wait_seconds += elapsed
+                except BaseException:
+                    self.abort()
+                    raise
+        finally:
+            self._buffer = bytearray()
+            super().close()
+    
+    def abort(self) -> None:
+        """Abandon the upload so no partial object or orphaned parts remain."""
+        if self.closed:
+            return
+        if self._upload_id is not None:
+            # Parts still uploading would outlive the abort otherwise
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pending = []
+            get_s3_client().abort_multipart_upload(
+                Bucket=self.bucket, Key=self.key, UploadId=self._upload_id
+            )
+        self._buffer = bytearray()
+        super().close()
+    
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.abort()
+        else:
+            self.close()
+        return False
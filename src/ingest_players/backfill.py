@@ -0,0 +1,405 @@
+"""Rebuild curated snapshots by replaying the raw tier.
+
+Used after a normalization or schema change: every (kingdom, dt) is
+re-ingested from its newest raw object, in parallel on a process pool.
+Deltas are rebuilt in a second pass once every curated snapshot is new, so
+each delta compares two rebuilt snapshots, and each kingdom's player history
+is compacted once at the end instead of being rewritten per snapshot. A
+multi-kingdom raw object is replayed once and then stands for every kingdom
+it held in the delta and history passes.
+"""
+
+import io
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+from .aws_s3 import get_s3_object_stream, list_s3_keys
+from .config import CHUNK_ROWS, INGEST_ENGINE, MULTI_KINGDOMS, RAW_PREFIX, SERVING_STORE
+from .deltas import read_snapshot
+from .history import compact_local_history, compact_s3_history
+from .s3_paths import build_curated_key, parse_raw_key
+from .serving_store import rebuild_local_serving_store, rebuild_s3_serving_store
+
+
+@dataclass(frozen=True)
+class RawInput:
+    """One stored raw-tier object."""
+    
+    source: str
+    kingdom: str
+    dt: str
+    run_ts: str
+    location: str
+    size: int = 0
+
+
+def discover_s3(bucket: str, prefix: str = RAW_PREFIX) -> List[RawInput]:
+    """
+    List the raw tier of a bucket.
+    
+    Args:
+        bucket: S3 bucket name
+        prefix: Raw-tier prefix, optionally narrowed (e.g. to one source)
+    
+    Returns:
+        Every parseable raw object; other keys are skipped
+    """
+    inputs = []
+    for key, size in list_s3_keys(bucket, prefix):
+        try:
+            info = parse_raw_key(key)
+        except ValueError:
+            continue
+        inputs.append(RawInput(info["source"], info["kingdom"], info["dt"], info["run_ts"], key, size))
+    return inputs
+
+
+def discover_local(out_dir: str) -> List[RawInput]:
+    """
+    List the raw tier of a local output directory.
+    
+    Args:
+        out_dir: Local output root used by process_ingestion
+    
+    Returns:
+        Every parseable raw file
+    """
+    root = Path(out_dir)
+    inputs = []
+    for path in sorted((root / RAW_PREFIX).rglob("*")):
+        if not path.is_file():
+            continue
+        try:
+            info = parse_raw_key(path.relative_to(root).as_posix())
+        except ValueError:
+            continue
+        inputs.append(RawInput(
+            info["source"], info["kingdom"], info["dt"], info["run_ts"], str(path), path.stat().st_size
+        ))
+    return inputs
+
+
+def latest_per_snapshot(inputs: Iterable[RawInput]) -> List[RawInput]:
+    """
+    Keep the newest run_ts of every (source, kingdom, dt).
+    
+    run_ts is a fixed-width UTC timestamp, so string order is time order.
+    
+    Args:
+        inputs: Raw objects
+    
+    Returns:
+        One raw object per snapshot, sorted by kingdom then dt
+    """
+    latest: Dict[tuple, RawInput] = {}
+    for item in inputs:
+        snapshot = (item.source, item.kingdom, item.dt)
+        if snapshot not in latest or item.run_ts > latest[snapshot].run_ts:
+            latest[snapshot] = item
+    return sorted(latest.values(), key=lambda i: (i.source, i.kingdom, i.dt))
+
+
+class BackfillProgress:
+    """Append-only JSON-lines log of finished tasks, for resuming a backfill.
+    
+    A task is identified by its phase and raw location, so a newer raw
+    object for the same snapshot is not mistaken for finished work. The
+    kingdoms found in each replayed multi-kingdom object are kept too, so a
+    resumed backfill can still rebuild their deltas and histories.
+    
+    The log only says a task finished, not with which code, so it is read
+    back only when resuming; a fresh run starts a new log.
+    """
+    
+    def __init__(self, path: Optional[str], resume: bool = False):
+        self.path = path
+        self.done = set()
+        self.kingdoms: Dict[str, List[str]] = {}
+        if not path or not os.path.exists(path):
+            return
+        if not resume:
+            os.remove(path)
+            return
+        with open(path) as f:
+            for line in f:
+                entry = json.loads(line)
+                if entry["status"] == "ok":
+                    self._add(entry)
+    
+    def is_done(self, phase: str, item: RawInput) -> bool:
+        return (phase, item.location) in self.done
+    
+    def _add(self, result: dict) -> None:
+        self.done.add((result["phase"], result["location"]))
+        if "kingdoms" in result:
+            self.kingdoms[result["location"]] = result["kingdoms"]
+    
+    def expand(self, items: Iterable[RawInput]) -> List[RawInput]:
+        """
+        Replace each replayed multi-kingdom object with one item per kingdom.
+        
+        Args:
+            items: Replayed raw objects
+        
+        Returns:
+            Per-kingdom items, each with a location unique to its kingdom
+        """
+        expanded = []
+        for item in items:
+            if item.kingdom not in MULTI_KINGDOMS:
+                expanded.append(item)
+                continue
+            for kingdom in self.kingdoms.get(item.location, []):
+                expanded.append(RawInput(
+                    item.source, kingdom, item.dt, item.run_ts, f"{item.location}#kingdom={kingdom}"
+                ))
+        return expanded
+    
+    def record(self, result: dict) -> None:
+        """Persist one task result as soon as it finishes."""
+        if result["status"] == "ok":
+            self._add(result)
+        if self.path:
+            with open(self.path, "a") as f:
+                f.write(json.dumps(result) + "\n")
+
+
+def replay_input(
+    item: RawInput,
+    bucket: Optional[str] = None,
+    out_dir: Optional[str] = None,
+    chunk_rows: int = CHUNK_ROWS,
+    engine: str = INGEST_ENGINE,
+) -> dict:
+    """
+    Rebuild one curated snapshot from its raw object.
+    
+    Runs in a pool worker, so it imports the handler lazily and never raises.
+    
+    Args:
+        item: Raw object to replay
+        bucket: S3 bucket name, for S3 backfills
+        out_dir: Local output root, for local backfills
+        chunk_rows: Rows per chunk, 0 to load whole
+        engine: "pandas" or "arrow"
+    
+    Returns:
+        Task result with phase, location, status, rows and seconds
+    """
+    from .handler import process_ingestion, process_s3_ingestion
+    
+    start = time.perf_counter()
+    try:
+        if bucket:
+            summary = process_s3_ingestion(
+                bucket, item.location, chunk_rows=chunk_rows, engine=engine, delta=False, history=False
+            )
+        else:
+            summary = process_ingestion(
+                item.location, item.kingdom, item.dt, out_dir,
+                chunk_rows=chunk_rows, engine=engine, delta=False, history=False, copy_raw=False,
+            )
+        result = {"status": "ok", "rows": summary["rows"]}
+        if "kingdoms" in summary:
+            result["kingdoms"] = [k["kingdom"] for k in summary["kingdoms"]]
+    except Exception as e:
+        result = {"status": "error", "error": str(e), "rows": 0}
+    
+    return {"phase": "ingest", "location": item.location, **result, "seconds": time.perf_counter() - start}
+
+
+def rebuild_delta(item: RawInput, bucket: Optional[str] = None, out_dir: Optional[str] = None) -> dict:
+    """
+    Rebuild one snapshot's delta from the stored curated snapshots.
+    
+    Args:
+        item: Raw object whose snapshot gets a delta
+        bucket: S3 bucket name, for S3 backfills
+        out_dir: Local output root, for local backfills
+    
+    Returns:
+        Task result with phase, location, status, rows and seconds
+    """
+    from .handler import publish_local_delta, publish_s3_delta
+    
+    start = time.perf_counter()
+    try:
+        if bucket:
+            curated_key = build_curated_key(item.source, item.kingdom, item.dt)
+            current = read_snapshot(io.BytesIO(get_s3_object_stream(bucket, curated_key).read()))
+            publish_s3_delta(bucket, item.source, item.kingdom, item.dt, current)
+        else:
+            curated_path = Path(out_dir) / build_curated_key(item.source, item.kingdom, item.dt)
+            current = read_snapshot(str(curated_path))
+            publish_local_delta(out_dir, item.kingdom, item.dt, current)
+        result = {"status": "ok", "rows": len(current)}
+    except Exception as e:
+        result = {"status": "error", "error": str(e), "rows": 0}
+    
+    return {"phase": "delta", "location": item.location, **result, "seconds": time.perf_counter() - start}
+
+
+def rebuild_history(item: RawInput, bucket: Optional[str] = None, out_dir: Optional[str] = None) -> dict:
+    """
+    Compact the player history of an item's kingdom from its catalog.
+    
+    The kingdom's serving store is rebuilt from the new history (with
+    SERVING_STORE), since replays skip both.
+    
+    Args:
+        item: Any raw object of the kingdom
+        bucket: S3 bucket name, for S3 backfills
+        out_dir: Local output root, for local backfills
+    
+    Returns:
+        Task result with phase, location, status, rows and seconds
+    """
+    start = time.perf_counter()
+    try:
+        if bucket:
+            summary = compact_s3_history(bucket, item.source, item.kingdom)
+            if SERVING_STORE:
+                rebuild_s3_serving_store(bucket, item.source, item.kingdom)
+        else:
+            summary = compact_local_history(out_dir, item.kingdom)
+            if SERVING_STORE:
+                rebuild_local_serving_store(out_dir, item.kingdom)
+        result = {"status": "ok", "rows": summary["rows"]}
+    except Exception as e:
+        result = {"status": "error", "error": str(e), "rows": 0}
+    
+    return {"phase": "history", "location": item.location, **result, "seconds": time.perf_counter() - start}
+
+
+def _run_phase(
+    phase: str,
+    func: Callable,
+    items: List[RawInput],
+    kwargs: dict,
+    pool: Optional[ProcessPoolExecutor],
+    progress: BackfillProgress,
+    on_result: Optional[Callable[[dict], None]],
+) -> List[dict]:
+    pending = [item for item in items if not progress.is_done(phase, item)]
+    results = []
+    
+    def finish(result):
+        progress.record(result)
+        results.append(result)
+        if on_result:
+            on_result(result)
+    
+    if pool is None:
+        for item in pending:
+            finish(func(item, **kwargs))
+        return results
+    
+    futures = [pool.submit(func, item, **kwargs) for item in pending]
+    for future in as_completed(futures):
+        finish(future.result())
+    return results
+
+
+def run_backfill(
+    items: List[RawInput],
+    bucket: Optional[str] = None,
+    out_dir: Optional[str] = None,
+    max_workers: int = 4,
+    progress_path: Optional[str] = None,
+    chunk_rows: int = CHUNK_ROWS,
+    engine: str = INGEST_ENGINE,
+    deltas: bool = True,
+    history: bool = True,
+    on_result: Optional[Callable[[dict], None]] = None,
+    resume: bool = False,
+) -> dict:
+    """
+    Replay raw objects into the curated tier and report throughput.
+    
+    With resume, tasks already recorded as done in the progress file are
+    skipped, so an interrupted backfill continues where it stopped. Without
+    it the progress file is started over and every item is replayed.
+    
+    Args:
+        items: Raw objects to replay, typically from latest_per_snapshot
+        bucket: S3 bucket name, for S3 backfills
+        out_dir: Local output root, for local backfills
+        max_workers: Worker processes; 1 runs in this process
+        progress_path: JSON-lines progress file, None to keep no progress
+        chunk_rows: Rows per chunk, 0 to load whole
+        engine: "pandas" or "arrow"
+        deltas: Rebuild deltas after all snapshots are replayed
+        history: Compact each replayed kingdom's player history at the end
+        on_result: Called with every task result as it finishes
+        resume: Skip the tasks progress_path records as done
+    
+    Returns:
+        Report with files, skipped, failed, rows, seconds, files_per_s,
+        rows_per_s and bytes_per_s for the replay phase
+    
+    Raises:
+        ValueError: If neither or both of bucket and out_dir are given
+    """
+    if bool(bucket) == bool(out_dir):
+        raise ValueError("Exactly one of bucket and out_dir is required")
+    
+    progress = BackfillProgress(progress_path, resume=resume)
+    skipped = sum(1 for item in items if progress.is_done("ingest", item))
+    
+    # spawn: boto3 clients and pyarrow thread pools are not fork-safe
+    pool = None
+    if max_workers > 1:
+        context = multiprocessing.get_context("spawn")
+        pool = ProcessPoolExecutor(max_workers=max_workers, mp_context=context)
+    
+    try:
+        start = time.perf_counter()
+        ingest_kwargs = {"bucket": bucket, "out_dir": out_dir, "chunk_rows": chunk_rows, "engine": engine}
+        results = _run_phase("ingest", replay_input, items, ingest_kwargs, pool, progress, on_result)
+        elapsed = time.perf_counter() - start
+        
+        delta_results = []
+        if deltas:
+            replayed = progress.expand(item for item in items if progress.is_done("ingest", item))
+            delta_kwargs = {"bucket": bucket, "out_dir": out_dir}
+            delta_results = _run_phase("delta", rebuild_delta, replayed, delta_kwargs, pool, progress, on_result)
+        
+        history_results = []
+        if history:
+            # One task per kingdom, keyed by its newest replayed input
+            kingdoms = {}
+            for item in progress.expand(item for item in items if progress.is_done("ingest", item)):
+                kingdoms[(item.source, item.kingdom)] = item
+            history_kwargs = {"bucket": bucket, "out_dir": out_dir}
+            history_results = _run_phase(
+                "history", rebuild_history, list(kingdoms.values()), history_kwargs, pool, progress, on_result
+            )
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    
+    ok = [r for r in results if r["status"] == "ok"]
+    rows = sum(r["rows"] for r in ok)
+    sizes = {item.location: item.size for item in items}
+    size = sum(sizes[r["location"]] for r in ok)
+    
+    return {
+        "files": len(ok),
+        "skipped": skipped,
+        "failed": len(results) - len(ok) + sum(1 for r in delta_results + history_results if r["status"] != "ok"),
+        "deltas": sum(1 for r in delta_results if r["status"] == "ok"),
+        "histories": sum(1 for r in history_results if r["status"] == "ok"),
+        "rows": rows,
+        "seconds": round(elapsed, 3),
+        "files_per_s": round(len(ok) / elapsed, 2) if elapsed else 0.0,
+        "rows_per_s": round(rows / elapsed, 1) if elapsed else 0.0,
+        "bytes_per_s": round(size / elapsed, 1) if elapsed else 0.0,
+        "workers": max_workers,
+    }
+
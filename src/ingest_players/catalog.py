@@ -0,0 +1,200 @@
+"""Per-kingdom snapshot catalog manifest.
+
+Each kingdom has one small JSON document listing its curated snapshots (date,
+row count, run id). Readers such as the leaderboard API use it to resolve
+"latest" and to list valid dates without querying Athena.
+"""
+
+import json
+import os
+import random
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+from .aws_s3 import get_s3_object_with_etag, put_s3_object_if_unchanged
+from .config import CATALOG_MAX_ATTEMPTS
+from .s3_paths import build_catalog_key
+
+
+def snapshot_entry(dt: str, rows: int, run_id: str, run_ts: str, curated_key: str) -> dict:
+    """
+    Build the catalog entry for one ingested snapshot.
+    
+    Args:
+        dt: Snapshot date (YYYY-MM-DD)
+        rows: Number of curated rows
+        run_id: Run identifier stamped on the rows
+        run_ts: Run timestamp of the ingestion
+        curated_key: Key or path of the curated Parquet
+        
+    Returns:
+        Entry dict
+    """
+    return {
+        "dt": dt,
+        "rows": rows,
+        "run_id": run_id,
+        "run_ts": run_ts,
+        "curated_key": curated_key,
+    }
+
+
+def merge_snapshot(
+    document: Optional[dict],
+    source: str,
+    kingdom: str,
+    entry: Optional[dict],
+    serving: Optional[dict] = None,
+) -> dict:
+    """
+    Add or replace a snapshot in a catalog document.
+    
+    Re-ingesting a date overwrites its curated Parquet, so its entry is
+    replaced rather than duplicated.
+    
+    Args:
+        document: Current catalog document, None if there is none yet
+        source: Source name
+        kingdom: Kingdom identifier
+        entry: Entry from snapshot_entry, None to only update the pointer
+        serving: Pointer to a new serving store version; ignored if the
+            document already points at a version built later
+        
+    Returns:
+        New catalog document with snapshots sorted by date
+    """
+    snapshots = {s["dt"]: s for s in (document or {}).get("snapshots", [])}
+    if entry is not None:
+        snapshots[entry["dt"]] = entry
+    ordered = [snapshots[dt] for dt in sorted(snapshots)]
+    
+    merged = {
+        "source": source,
+        "kingdom": kingdom,
+        "updated_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "latest": ordered[-1]["dt"] if ordered else None,
+        "snapshots": ordered,
+    }
+    
+    current = (document or {}).get("serving")
+    if serving is not None and (current is None or current["run_ts"] <= serving["run_ts"]):
+        # The previous version stays readable for containers with an older catalog
+        current = {**serving, "previous_key": current["key"] if current else None}
+    if current is not None:
+        merged["serving"] = current
+    
+    return merged
+
+
+def read_s3_catalog(bucket: str, source: str, kingdom: str) -> Optional[dict]:
+    """
+    Read a kingdom's S3 catalog.
+    
+    Args:
+        bucket: S3 bucket name
+        source: Source name
+        kingdom: Kingdom identifier
+        
+    Returns:
+        Catalog document, or None if the kingdom has none yet
+    """
+    body, _ = get_s3_object_with_etag(bucket, build_catalog_key(source, kingdom))
+    return json.loads(body) if body else None
+
+
+def read_local_catalog(out_dir: str, source: str, kingdom: str) -> Optional[dict]:
+    """
+    Read a kingdom's local catalog mirror.
+    
+    Args:
+        out_dir: Local output root
+        source: Source name
+        kingdom: Kingdom identifier
+        
+    Returns:
+        Catalog document, or None if the kingdom has none yet
+    """
+    path = Path(out_dir) / build_catalog_key(source, kingdom)
+    return json.loads(path.read_bytes()) if path.exists() else None
+
+
+def _dumps(document: dict) -> bytes:
+    return json.dumps(document, separators=(",", ":")).encode("utf-8")
+
+
+def update_s3_catalog(
+    bucket: str,
+    source: str,
+    kingdom: str,
+    entry: Optional[dict],
+    max_attempts: int = CATALOG_MAX_ATTEMPTS,
+    serving: Optional[dict] = None,
+) -> dict:
+    """
+    Record a snapshot in the kingdom's S3 catalog.
+    
+    Read-modify-write with a conditional put: if another ingestion updated the
+    manifest in between, the write is rejected and retried on the fresh copy,
+    so concurrent uploads never drop each other's entries.
+    
+    Args:
+        bucket: S3 bucket name
+        source: Source name
+        kingdom: Kingdom identifier
+        entry: Entry from snapshot_entry, None to only update the pointer
+        max_attempts: Attempts before giving up
+        serving: Pointer to a new serving store version
+        
+    Returns:
+        The catalog document as written
+        
+    Raises:
+        RuntimeError: If every attempt lost the race
+    """
+    key = build_catalog_key(source, kingdom)
+    
+    for attempt in range(max_attempts):
+        body, etag = get_s3_object_with_etag(bucket, key)
+        document = merge_snapshot(json.loads(body) if body else None, source, kingdom, entry, serving)
+        if put_s3_object_if_unchanged(_dumps(document), bucket, key, etag):
+            return document
+        
+        # Jittered backoff so racing writers spread out
+        time.sleep(random.uniform(0, 0.05 * 2 ** attempt))
+    
+    raise RuntimeError(f"Could not update catalog s3://{bucket}/{key} after {max_attempts} attempts")
+
+
+def update_local_catalog(
+    out_dir: str,
+    source: str,
+    kingdom: str,
+    entry: Optional[dict],
+    serving: Optional[dict] = None,
+) -> dict:
+    """
+    Record a snapshot in the local catalog mirror used by run_local.py.
+    
+    Args:
+        out_dir: Local output root
+        source: Source name
+        kingdom: Kingdom identifier
+        entry: Entry from snapshot_entry, None to only update the pointer
+        serving: Pointer to a new serving store version
+        
+    Returns:
+        The catalog document as written
+    """
+    path = Path(out_dir) / build_catalog_key(source, kingdom)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    
+    document = merge_snapshot(read_local_catalog(out_dir, source, kingdom), source, kingdom, entry, serving)
+    
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_dumps(document))
+    os.replace(tmp_path, path)
+    
+    return document
@@ -0,0 +1,168 @@
+"""Bounded-memory chunked ingestion.
+
+Input is read in record batches, and each batch is validated, normalized and
+hashed on its own. The result is appended to the curated Parquet as a row group,
+so peak memory tracks the chunk size rather than the file size.
+"""
+
+from datetime import datetime, timezone
+from typing import Iterator, Optional, Sequence
+from uuid import uuid4
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .hashing import add_ingestion_metadata, add_record_hash
+from .instrumentation import StageMetrics
+from .layout import CuratedLayout
+from .json_input import iter_json_frames
+from .normalize import normalize_df
+from .schema import read_csv_typed
+from .validation import validate_required_columns, validate_unique_id, validate_unique_id_across_chunks
+
+
+def iter_input_chunks(source, ext: str, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    """
+    Read CSV or JSON input as a sequence of DataFrames of at most chunk_rows.
+    
+    Both CSV and JSON (array or newline-delimited) are parsed incrementally.
+    
+    Args:
+        source: Local file path or file-like object
+        ext: File extension without dot ("csv" or "json")
+        chunk_rows: Maximum rows per chunk
+        
+    Yields:
+        DataFrame chunks
+        
+    Raises:
+        ValueError: If ext is not supported or chunk_rows is not positive
+    """
+    if chunk_rows < 1:
+        raise ValueError(f"chunk_rows must be positive, got: {chunk_rows}")
+    
+    if ext == "csv":
+        # Declared dtypes keep every chunk's columns the same type
+        yield from read_csv_typed(source, chunksize=chunk_rows)
+    elif ext == "json":
+        yield from iter_json_frames(source, chunk_rows)
+    else:
+        raise ValueError(f"Unsupported file type: {ext}")
+
+
+def _conform_table(table: pa.Table, schema: pa.Schema) -> pa.Table:
+    """
+    Cast a chunk to the schema fixed by the first chunk.
+    
+    Type inference runs per chunk, so an int column can arrive as double when
+    one chunk has a blank value. Arrow casts those back as long as no value
+    is lost.
+    
+    Raises:
+        ValueError: If the chunk has unexpected columns or a lossy type change
+    """
+    extra = set(table.column_names) - set(schema.names)
+    if extra:
+        raise ValueError(f"Columns not present in the first chunk: {sorted(extra)}")
+    
+    for field in schema:
+        if field.name not in table.column_names:
+            table = table.append_column(field.name, pa.nulls(len(table), field.type))
+    
+    try:
+        return table.select(schema.names).cast(schema)
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError) as e:
+        raise ValueError(f"Column types changed between chunks: {e}") from e
+
+
+def ingest_chunks(
+    chunks,
+    kingdom: str,
+    dt: str,
+    sink,
+    collectors: Sequence = (),
+    run_id: Optional[str] = None,
+    metrics: Optional[StageMetrics] = None,
+) -> int:
+    """
+    Validate, normalize and hash each chunk and append it to a Parquet sink.
+    
+    Duplicate ids are detected across the whole input, not just per chunk.
+    All chunks share one run_id and ingested_at. A layout sort key orders rows
+    within each chunk's row groups, not across the whole file.
+    
+    Args:
+        chunks: Iterable of parsed DataFrame chunks
+        kingdom: Kingdom identifier
+        dt: Date string (YYYY-MM-DD)
+        sink: Output path or writable file object
+        collectors: Objects whose add(table) receives every written chunk,
+            such as LeaderboardBuilder
+        run_id: Run identifier stamped on every row (default: new UUID)
+        metrics: Receives parse, validate, hash, write and collect stage
+            timings summed over all chunks (default: disabled)
+        
+    Returns:
+        Total number of rows written
+        
+    Raises:
+        ValueError: If validation fails for any chunk
+    """
+    metrics = metrics or StageMetrics(enabled=False)
+    layout = CuratedLayout.from_env()
+    run_id = run_id or str(uuid4())
+    ingested_at = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    seen_ids = set()
+    writer = None
+    schema = None
+    rows = 0
+    
+    chunks = iter(chunks)
+    try:
+        while True:
+            # Chunks are parsed lazily, so the parse stage is the wait for the next one
+            with metrics.stage("parse"):
+                df = next(chunks, None)
+            if df is None:
+                break
+            
+            with metrics.stage("validate"):
+                df.columns = df.columns.str.lower()
+                
+                validate_required_columns(df)
+                validate_unique_id(df)
+                
+                df = normalize_df(df, kingdom, dt)
+                validate_unique_id_across_chunks(df, seen_ids)
+            
+            with metrics.stage("hash"):
+                df = add_ingestion_metadata(df, run_id=run_id, ingested_at=ingested_at)
+                df = add_record_hash(df)
+            
+            with metrics.stage("write"):
+                table = pa.Table.from_pandas(df, preserve_index=False)
+                if writer is None:
+                    # All-null columns in the first chunk have no type yet, keep them as strings
+                    schema = pa.schema([
+                        pa.field(f.name, pa.string()) if pa.types.is_null(f.type) else f
+                        for f in table.schema
+                    ])
+                    writer = pq.ParquetWriter(sink, schema, **layout.writer_options(schema))
+                
+                table = layout.sort(_conform_table(table, schema))
+                writer.write_table(table, row_group_size=layout.row_group_size)
+            
+            with metrics.stage("collect"):
+                for collector in collectors:
+                    collector.add(table)
+            rows += len(df)
+    finally:
+        if writer is not None:
+            with metrics.stage("write"):
+                writer.close()
+    
+    if writer is None:
+        raise ValueError("Input file contains no rows")
+    
+    return rows
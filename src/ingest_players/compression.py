@@ -0,0 +1,76 @@
+"""Decompression of compressed inbox uploads.
+
+gzip and zstd inputs are decompressed as they are read, so a compressed S3
+body streams straight into the parser. A zip archive must hold exactly one
+input file; zipfile needs random access, so callers pass a local path.
+"""
+
+import gzip
+import zipfile
+from contextlib import contextmanager
+from pathlib import PurePosixPath
+from typing import Iterator, Optional, Tuple
+
+from .config import ALLOWED_EXTENSIONS
+
+
+def _zip_member(archive: zipfile.ZipFile, ext: Optional[str]) -> Tuple[zipfile.ZipInfo, str]:
+    """Pick the single input file of an archive, skipping folders and OS metadata."""
+    members = [
+        info for info in archive.infolist()
+        if not info.is_dir()
+        and not info.filename.startswith("__MACOSX/")
+        and not PurePosixPath(info.filename).name.startswith(".")
+    ]
+    if len(members) != 1:
+        names = [info.filename for info in members]
+        raise ValueError(f"Zip archive must contain exactly one input file, found: {names}")
+    
+    member = members[0]
+    member_ext = PurePosixPath(member.filename).suffix.lstrip(".").lower()
+    if member_ext not in ALLOWED_EXTENSIONS or (ext is not None and member_ext != ext):
+        raise ValueError(f"Unsupported file in zip archive: {member.filename}")
+    return member, member_ext
+
+
+@contextmanager
+def open_input(source, ext: Optional[str], compression: Optional[str]) -> Iterator[tuple]:
+    """
+    Open an input with its compression removed.
+    
+    Args:
+        source: Local file path or binary file-like object; zip archives
+            need a path or a seekable file
+        ext: Input format from the filename, None for a bare zip archive
+        compression: "gzip", "zstd", "zip" or None
+    
+    Yields:
+        Tuple of (source to pass to the parser, ext). Uncompressed inputs
+        are passed through unchanged.
+    
+    Raises:
+        ValueError: If the compression is unsupported or a zip archive does
+            not hold exactly one input file
+    """
+    if compression is None:
+        yield source, ext
+    elif compression == "gzip":
+        if hasattr(source, "read"):
+            stream = gzip.GzipFile(fileobj=source, mode="rb")
+        else:
+            stream = gzip.open(source, "rb")
+        with stream:
+            yield stream, ext
+    elif compression == "zstd":
+        # pyarrow's codec, so zstd support needs no extra dependency
+        import pyarrow as pa
+        
+        with pa.CompressedInputStream(source, "zstd") as stream:
+            yield stream, ext
+    elif compression == "zip":
+        with zipfile.ZipFile(source) as archive:
+            member, member_ext = _zip_member(archive, ext)
+            with archive.open(member) as stream:
+                yield stream, member_ext
+    else:
+        raise ValueError(f"Unsupported compression: {compression}")
@@ -1,7 +1,104 @@
 """Configuration constants for the ingestion service."""
 
+import os
+
 INBOX_PREFIX = "inbox/"
 RAW_PREFIX = "raw/"
 CURATED_PREFIX = "curated/"
-ALLOWED_EXTENSIONS = {"csv", "json"}
 REQUIRED_COLUMNS = {"id"}
+
+# Columns excluded from record_hash (metadata, not business fields)
+HASH_EXCLUDE_COLUMNS = {"record_hash", "ingested_at", "run_id", "kingdom", "snapshot_date"}
+
+# record_hash engine: "sha256" is bit-identical to historical curated data,
+# "fast" is a vectorized 64-bit fingerprint (not comparable with sha256 hashes)
+HASH_MODE = os.getenv("HASH_MODE", "sha256")
+HASH_MODES = {"sha256", "fast"}
+
+# Input formats accepted in the inbox, e.g. "csv,json"
+ALLOWED_EXTENSIONS = {
+    e.strip().lower() for e in os.getenv("ALLOWED_EXTENSIONS", "csv,json").split(",") if e.strip()
+}
+
+# Compressed inputs by file suffix (players.csv.gz, players.csv.zst,
+# players.zip); the raw tier keeps the compressed bytes
+COMPRESSION_SUFFIXES = {"gz": "gzip", "zst": "zstd", "zip": "zip"}
+ALLOWED_COMPRESSIONS = {
+    c.strip().lower() for c in os.getenv("ALLOWED_COMPRESSIONS", "gz,zst,zip").split(",") if c.strip()
+}
+
+# Codecs that decompress from a forward-only stream; zip needs random access
+# to its central directory, so zip inputs are staged in /tmp
+STREAMABLE_COMPRESSIONS = {"gzip", "zstd"}
+
+# Stream inbox objects into the parser and curated Parquet into a multipart
+# upload instead of staging both in /tmp
+STREAMING_INGEST = os.getenv("STREAMING_INGEST", "1") == "1"
+
+# Formats that can be parsed from a forward-only stream; anything else is
+# staged in /tmp first
+STREAMABLE_EXTENSIONS = {"csv", "json"}
+
+# S3 multipart upload part size (S3 minimum is 5 MiB except for the last part)
+MIN_MULTIPART_PART_SIZE = 5 * 1024 * 1024
+MULTIPART_PART_SIZE = int(os.getenv("MULTIPART_PART_SIZE", str(8 * 1024 * 1024)))
+
+# Multipart parts uploaded concurrently while the next part is encoded; memory
+# holds up to this many parts plus the one being filled
+MULTIPART_CONCURRENCY = int(os.getenv("MULTIPART_CONCURRENCY", "4"))
+
+# Inbox kingdom values marking a file that holds many kingdoms in a "kingdom"
+# column (inbox/source=rok_players/kingdom=multi/dt=.../players.csv); it is
+# split into one curated snapshot per kingdom
+MULTI_KINGDOMS = {
+    k.strip() for k in os.getenv("MULTI_KINGDOMS", "multi,_all").split(",") if k.strip()
+}
+# Kingdoms of one multi-kingdom file validated and written concurrently
+MULTI_KINGDOM_WORKERS = int(os.getenv("MULTI_KINGDOM_WORKERS", "4"))
+
+# Rows per chunk for bounded-memory ingestion (0 loads the whole file)
+CHUNK_ROWS = int(os.getenv("CHUNK_ROWS", "0"))
+
+# Records parsed per batch when JSON input is read whole; chunked mode batches
+# JSON by CHUNK_ROWS instead
+JSON_BATCH_ROWS = int(os.getenv("JSON_BATCH_ROWS", "50000"))
+
+# Upper bound on S3 event records ingested concurrently by one invocation
+MAX_RECORD_WORKERS = int(os.getenv("MAX_RECORD_WORKERS", "4"))
+
+# HTTP connections kept open by the shared S3 client; concurrent records each
+# fan out artifact uploads, so the botocore default of 10 would be exhausted
+S3_MAX_POOL_CONNECTIONS = int(os.getenv("S3_MAX_POOL_CONNECTIONS", "32"))
+
+# Ingestion engine: "pandas" (default) or "arrow" (pyarrow tables and compute
+# kernels). Chunked mode (CHUNK_ROWS) always uses the pandas engine.
+INGEST_ENGINE = os.getenv("INGEST_ENGINE", "pandas")
+INGEST_ENGINES = {"pandas", "arrow"}
+
+# Precompute top-N leaderboard artifacts for every metric during ingestion
+LEADERBOARD_ARTIFACTS = os.getenv("LEADERBOARD_ARTIFACTS", "1") == "1"
+LEADERBOARD_TOP_N = int(os.getenv("LEADERBOARD_TOP_N", "500"))
+LEADERBOARDS_PREFIX = "leaderboards/"
+
+# Optimistic-concurrency retries when updating a kingdom's snapshot catalog
+CATALOG_MAX_ATTEMPTS = int(os.getenv("CATALOG_MAX_ATTEMPTS", "8"))
+
+# Diff each snapshot against the kingdom's previous one during ingestion
+DELTA_SNAPSHOTS = os.getenv("DELTA_SNAPSHOTS", "1") == "1"
+DELTA_RANK_COLUMNS = tuple(
+    c.strip() for c in os.getenv("DELTA_RANK_COLUMNS", "power,killpoints").split(",") if c.strip()
+)
+
+# Skip inputs whose fingerprint was already ingested for the same kingdom and dt
+IDEMPOTENT_INGEST = os.getenv("IDEMPOTENT_INGEST", "1") == "1"
+
+# Maintain a per-kingdom player history (sorted by id, snapshot_date) on ingestion
+PLAYER_HISTORY = os.getenv("PLAYER_HISTORY", "1") == "1"
+# Small row groups keep a single player's lookup to a few KiB of reads
+HISTORY_ROW_GROUP_SIZE = int(os.getenv("HISTORY_ROW_GROUP_SIZE", "2000"))
+# Rebuild the kingdom's SQLite serving store whenever its player history changes
+SERVING_STORE = os.getenv("SERVING_STORE", "1") == "1"
+
+# Emit per-stage timings as one CloudWatch Embedded Metric Format log line per run
+EMIT_METRICS = os.getenv("EMIT_METRICS", "0") == "1"
+METRICS_NAMESPACE = os.getenv("METRICS_NAMESPACE", "RokIngestion")
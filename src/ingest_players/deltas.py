@@ -0,0 +1,206 @@
+"""Snapshot-to-snapshot deltas.
+
+Each ingestion is joined on id against the kingdom's previous snapshot, and
+the result is written as a small delta Parquet with per-metric gains, new and
+departed players, and rank movement. Consumers no longer need an Athena
+self-join across two dt partitions.
+"""
+
+import io
+from typing import Iterable, List, Optional
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from .config import DELTA_RANK_COLUMNS
+from .leaderboards import LEADERBOARD_COLUMNS, artifact_name
+
+# Columns read from either snapshot
+DELTA_INPUT_COLUMNS = ("id", "name", "alliance", "record_hash") + LEADERBOARD_COLUMNS
+
+PREV_SUFFIX = "__prev"
+
+
+def _project(table: pa.Table) -> pa.Table:
+    return table.select([c for c in DELTA_INPUT_COLUMNS if c in table.column_names])
+
+
+def _with_ranks(table: pa.Table, columns: Iterable[str]) -> pa.Table:
+    """Append a 1-based descending rank per column; null values get no rank."""
+    for column in columns:
+        values = table[column]
+        rank = pc.rank(values, "descending", tiebreaker="min")
+        rank = pc.if_else(pc.is_null(values), pa.scalar(None, pa.uint64()), rank)
+        table = table.append_column(f"{artifact_name(column)}_rank", pc.cast(rank, pa.int64()))
+    return table
+
+
+class SnapshotCollector:
+    """Collect the columns deltas and player history need as a snapshot is written.
+    
+    Receives every curated table or chunk like LeaderboardBuilder, keeping
+    only ids, names, metrics and record hashes.
+    """
+    
+    def __init__(self):
+        self._tables: List[pa.Table] = []
+    
+    def add(self, table: pa.Table) -> None:
+        """
+        Collect a curated table (or chunk).
+        
+        Args:
+            table: Curated table
+        """
+        self._tables.append(_project(table))
+    
+    def table(self) -> pa.Table:
+        """
+        Get every collected row as one table.
+        
+        Returns:
+            Projected table of the current snapshot
+        """
+        return pa.concat_tables(self._tables, promote_options="permissive")
+
+
+def read_snapshot(source) -> pa.Table:
+    """
+    Read the delta-relevant columns of a curated Parquet snapshot.
+    
+    Args:
+        source: Local path or file-like object
+        
+    Returns:
+        Projected table
+    """
+    schema = pq.read_schema(source)
+    columns = [c for c in DELTA_INPUT_COLUMNS if c in schema.names]
+    if hasattr(source, "seek"):
+        source.seek(0)
+    return pq.read_table(source, columns=columns)
+
+
+def compute_delta(current: pa.Table, previous: pa.Table, rank_columns: Iterable[str] = DELTA_RANK_COLUMNS) -> pa.Table:
+    """
+    Join two snapshots on id and compute what changed between them.
+    
+    Rows whose record_hash is identical in both snapshots are not diffed:
+    their metric deltas are zero by construction. Such rows are only kept if
+    their rank moved because of other players.
+    
+    Args:
+        current: Current snapshot (projected curated rows)
+        previous: Previous snapshot (projected curated rows)
+        rank_columns: Metric columns to report rank movement for
+        
+    Returns:
+        Table with id, name, alliance, status ("new", "departed", "changed"
+        or "unchanged"), one "<metric>_delta" column per metric present in
+        both snapshots and "<metric>_rank", "_rank_prev" and "_rank_change"
+        columns per rank column (positive change means moving up)
+    """
+    current = _project(current)
+    previous = _project(previous)
+    metrics = [c for c in LEADERBOARD_COLUMNS if c in current.column_names and c in previous.column_names]
+    ranked = [c for c in rank_columns if c in metrics]
+    
+    current = _with_ranks(current, ranked)
+    previous = _with_ranks(previous, ranked)
+    previous = previous.rename_columns([
+        name if name == "id" else f"{name}{PREV_SUFFIX}" for name in previous.column_names
+    ])
+    
+    joined = current.join(previous, keys="id", join_type="full outer")
+    
+    hash_now = joined["record_hash"]
+    hash_prev = joined[f"record_hash{PREV_SUFFIX}"]
+    is_new = pc.is_null(hash_prev)
+    is_departed = pc.is_null(hash_now)
+    is_unchanged = pc.fill_null(pc.equal(hash_now, hash_prev), False)
+    status = pc.if_else(
+        is_new, "new",
+        pc.if_else(is_departed, "departed", pc.if_else(is_unchanged, "unchanged", "changed")),
+    )
+    
+    joined = joined.append_column("status", status)
+    
+    # Unchanged rows are identical in every hashed column, so only the
+    # changed ones go through the subtraction
+    is_changed = pc.equal(status, "changed")
+    parts = [
+        _delta_columns(joined.filter(is_changed), metrics, ranked, diff=True),
+        _delta_columns(joined.filter(pc.invert(is_changed)), metrics, ranked, diff=False),
+    ]
+    delta = pa.concat_tables(parts, promote_options="permissive")
+    
+    # Keep unchanged rows only when another player's move shifted their rank
+    keep = pc.not_equal(delta["status"], "unchanged")
+    for column in ranked:
+        change = delta[f"{artifact_name(column)}_rank_change"]
+        keep = pc.or_(keep, pc.fill_null(pc.not_equal(change, 0), False))
+    
+    return delta.filter(keep).sort_by("id")
+
+
+def _delta_columns(rows: pa.Table, metrics: List[str], ranked: List[str], diff: bool) -> pa.Table:
+    """Build the output columns for a slice of joined rows."""
+    columns = {"id": rows["id"]}
+    for field in ("name", "alliance"):
+        if field in rows.column_names:
+            prev_field = f"{field}{PREV_SUFFIX}"
+            columns[field] = (
+                pc.coalesce(rows[field], rows[prev_field])
+                if prev_field in rows.column_names else rows[field]
+            )
+    columns["status"] = rows["status"]
+    
+    unchanged = pc.equal(rows["status"], "unchanged")
+    for column in metrics:
+        if diff:
+            delta = pc.subtract(rows[column], rows[f"{column}{PREV_SUFFIX}"])
+        else:
+            # Zero for unchanged rows, undefined for new and departed players
+            delta = pc.if_else(unchanged, pa.scalar(0, pa.int64()), pa.scalar(None, pa.int64()))
+        columns[f"{artifact_name(column)}_delta"] = delta
+    
+    for column in ranked:
+        rank_name = f"{artifact_name(column)}_rank"
+        rank_now = rows[rank_name]
+        rank_prev = rows[f"{rank_name}{PREV_SUFFIX}"]
+        columns[rank_name] = rank_now
+        columns[f"{rank_name}_prev"] = rank_prev
+        columns[f"{rank_name}_change"] = pc.subtract(rank_prev, rank_now)
+    
+    return pa.table(columns)
+
+
+def delta_to_parquet_bytes(delta: pa.Table) -> bytes:
+    """
+    Serialize a delta table as Parquet.
+    
+    Args:
+        delta: Table from compute_delta
+        
+    Returns:
+        Parquet file bytes
+    """
+    buffer = io.BytesIO()
+    pq.write_table(delta, buffer, compression="snappy")
+    return buffer.getvalue()
+
+
+def previous_snapshot(snapshots: Optional[list], dt: str) -> Optional[dict]:
+    """
+    Pick the most recent catalog entry strictly before dt.
+    
+    Args:
+        snapshots: Catalog snapshot entries sorted by date, or None
+        dt: Date being ingested
+        
+    Returns:
+        Catalog entry, or None if dt is the kingdom's first snapshot
+    """
+    earlier = [s for s in snapshots or [] if s["dt"] < dt]
+    return earlier[-1] if earlier else None
@@ -1,163 +1,855 @@
-"""Main AWS Lambda handler for player data ingestion."""
+"""Main AWS Lambda handler for player data ingestion.
 
+Only lightweight modules are imported at load time. pandas, pyarrow and the
+pipeline modules built on them (~0.5 s together) are imported inside the
+functions that need them, so the container starts quickly and invocations
+that never parse data (duplicate inputs, bad events) never load them.
+"""
+
+import io
 import json
 import os
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import TYPE_CHECKING, Optional, Sequence
 from urllib.parse import unquote_plus
+from uuid import uuid4
 
-import pandas as pd
+from .aws_s3 import (
+    S3MultipartWriter,
+    delete_s3_object,
+    download_s3_object,
+    get_s3_object_stream,
+    start_s3_copy,
+    upload_bytes_to_s3,
+    upload_file_to_s3,
+    upload_objects_to_s3,
+)
+from .catalog import (
+    read_local_catalog,
+    read_s3_catalog,
+    snapshot_entry,
+    update_local_catalog,
+    update_s3_catalog,
+)
+from .compression import open_input
+from .config import (
+    CHUNK_ROWS,
+    DELTA_SNAPSHOTS,
+    IDEMPOTENT_INGEST,
+    INGEST_ENGINE,
+    INGEST_ENGINES,
+    LEADERBOARD_ARTIFACTS,
+    MAX_RECORD_WORKERS,
+    MULTI_KINGDOMS,
+    PLAYER_HISTORY,
+    RAW_PREFIX,
+    SERVING_STORE,
+    STREAMABLE_COMPRESSIONS,
+    STREAMABLE_EXTENSIONS,
+    STREAMING_INGEST,
+)
+from .idempotency import fingerprint_s3_object, is_current_run, lookup_ingestion, record_ingestion
+from .instrumentation import StageMetrics
+from .memory import peak_rss_mb
+from .s3_paths import (
+    build_curated_key,
+    build_delta_key,
+    build_leaderboard_key,
+    build_raw_key,
+    parse_filename,
+    parse_inbox_key,
+    parse_raw_key,
+)
 
-from .aws_s3 import download_s3_object, upload_bytes_to_s3, upload_file_to_s3
-from .hashing import add_ingestion_metadata, add_record_hash
-from .normalize import normalize_df
-from .s3_paths import build_curated_key, build_raw_key, parse_inbox_key
-from .validation import validate_required_columns, validate_unique_id
+if TYPE_CHECKING:
+    import pandas as pd
+    import pyarrow as pa
 
 
 def lambda_handler(event, context):
     """
     AWS Lambda entrypoint for S3 event processing.
     
+    Every record in the event is ingested, concurrently on a bounded thread
+    pool, and a failure in one record does not stop the others.
+    
     Args:
-        event: S3 event containing bucket and object key
+        event: S3 event containing one or more bucket/object records
         context: Lambda context object
     
     Returns:
-        Dict with statusCode and body
+        Dict with statusCode and body. The body lists a per-record result;
+        statusCode is 500 if any record failed.
     """
     try:
-        # Parse S3 event
-        record = event["Records"][0]
-        bucket = record["s3"]["bucket"]["name"]
-        key = unquote_plus(record["s3"]["object"]["key"])
-        
-        # Process the ingestion
-        summary = process_s3_ingestion(bucket, key)
-        
-        return {
-            "statusCode": 200,
-            "body": json.dumps(summary)
-        }
-    except Exception as e:
+        records = event["Records"]
+    except (KeyError, TypeError) as e:
         print(f"Error processing S3 event: {str(e)}")
         return {
             "statusCode": 500,
             "body": json.dumps({"error": str(e)})
         }
+    
+    results = process_s3_records(records)
+    failed = sum(1 for r in results if r["status"] == "error")
+    
+    return {
+        "statusCode": 500 if failed else 200,
+        "body": json.dumps({
+            "records": len(results),
+            "succeeded": len(results) - failed,
+            "failed": failed,
+            "results": results,
+        })
+    }
+
+
+def process_s3_records(records: list, max_workers: int = MAX_RECORD_WORKERS) -> list:
+    """
+    Ingest every S3 event record concurrently.
+    
+    Parsing and S3 transfers release the GIL, so a batch of uploads finishes in
+    roughly the time of the slowest file.
+    
+    Args:
+        records: S3 event records
+        max_workers: Upper bound on concurrent ingestions
+        
+    Returns:
+        List of per-record results in event order, each with bucket, key,
+        status ("ok" or "error") and either summary or error
+    """
+    def run(record):
+        bucket = key = None
+        try:
+            bucket = record["s3"]["bucket"]["name"]
+            key = unquote_plus(record["s3"]["object"]["key"])
+            s3_object = record["s3"]["object"]
+            summary = process_s3_ingestion(bucket, key, etag=s3_object.get("eTag"), size=s3_object.get("size"))
+            return {"bucket": bucket, "key": key, "status": "ok", "summary": summary}
+        except Exception as e:
+            print(f"Error processing s3://{bucket}/{key}: {str(e)}")
+            return {"bucket": bucket, "key": key, "status": "error", "error": str(e)}
+    
+    if len(records) <= 1:
+        return [run(record) for record in records]
+    
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(records))) as pool:
+        return list(pool.map(run, records))
 
 
-def process_s3_ingestion(bucket: str, key: str) -> dict:
+def process_s3_ingestion(
+    bucket: str,
+    key: str,
+    streaming: bool = STREAMING_INGEST,
+    chunk_rows: int = CHUNK_ROWS,
+    engine: str = INGEST_ENGINE,
+    artifacts: bool = LEADERBOARD_ARTIFACTS,
+    delta: bool = DELTA_SNAPSHOTS,
+    history: bool = PLAYER_HISTORY,
+    etag: Optional[str] = None,
+    idempotent: bool = IDEMPOTENT_INGEST,
+    size: Optional[int] = None,
+    metrics: Optional[StageMetrics] = None,
+) -> dict:
     """
     Process an S3 ingestion event.
     
+    In streaming mode the object body is parsed straight from S3, the raw tier
+    is written with a server-side copy and the curated Parquet is streamed
+    through a multipart upload, so nothing is staged in /tmp. gzip and zstd
+    inputs are decompressed on the fly. Inputs that cannot be read from a
+    forward-only stream (zip archives) fall back to the temp-file path. The
+    raw tier always stores the uploaded, still compressed bytes.
+    
     Args:
         bucket: S3 bucket name
         key: S3 object key (URL-decoded)
+        streaming: Use the streaming path (default: STREAMING_INGEST)
+        chunk_rows: Process the input in chunks of this many rows, 0 to
+            load it whole (default: CHUNK_ROWS)
+        engine: "pandas" or "arrow" (default: INGEST_ENGINE)
+        artifacts: Publish top-N leaderboard artifacts once the curated
+            snapshot is written (default: LEADERBOARD_ARTIFACTS)
+        delta: Write a delta against the kingdom's previous snapshot
+            (default: DELTA_SNAPSHOTS)
+        history: Fold the snapshot into the kingdom's player history
+            (default: PLAYER_HISTORY)
+        etag: Object ETag from the S3 event, used as the input fingerprint
+        idempotent: Return the original summary for an input that is already
+            the current snapshot of its kingdom and dt (default: IDEMPOTENT_INGEST)
+        size: Object size from the S3 event, reported as input_bytes
+        metrics: Collects stage timings, emitted as one EMF line at the end
+            (default: a new StageMetrics, enabled by EMIT_METRICS)
+    
+    A raw-tier key (raw/.../run_ts=.../<file>) replays that stored input: the
+    curated tier is rebuilt and no new raw copy is made. A multi-kingdom key
+    (kingdom=multi, see MULTI_KINGDOMS) is handed to process_s3_multi_ingestion.
     
     Returns:
-        Dict with processing summary
+        Dict with processing summary; "duplicate" is True when the input was
+        skipped as already ingested
     """
+    from .deltas import SnapshotCollector
+    from .leaderboards import LeaderboardBuilder
+    
     print(f"Processing s3://{bucket}/{key}")
+    metrics = metrics or StageMetrics()
     
-    # Parse the inbox key to extract metadata
-    key_info = parse_inbox_key(key)
+    # Parse the inbox (or raw, when replaying) key to extract metadata
+    replay = key.startswith(RAW_PREFIX)
+    key_info = parse_raw_key(key) if replay else parse_inbox_key(key)
     source = key_info["source"]
     kingdom = key_info["kingdom"]
     dt = key_info["dt"]
     filename = key_info["filename"]
+    ext = key_info["ext"]
+    compression = key_info["compression"]
     
-    # Download file to /tmp
-    tmp_input = f"/tmp/{filename}"
-    download_s3_object(bucket, key, tmp_input)
-    
-    # Parse based on extension
-    if key_info["ext"] == "csv":
-        df = pd.read_csv(tmp_input)
-    elif key_info["ext"] == "json":
-        df = pd.read_json(tmp_input)
-    else:
-        raise ValueError(f"Unsupported file type: {key_info['ext']}")
-    
-    # Normalize column names
-    df.columns = df.columns.str.lower()
-    
-    # Validate
-    validate_required_columns(df)
-    validate_unique_id(df)
+    streaming = (
+        streaming
+        and ext in STREAMABLE_EXTENSIONS
+        and (compression is None or compression in STREAMABLE_COMPRESSIONS)
+    )
     
-    # Normalize data
-    df = normalize_df(df, kingdom, dt)
+    fingerprint = None
+    idempotent = idempotent and not replay
+    if idempotent:
+        with metrics.stage("dedupe"):
+            fingerprint = fingerprint_s3_object(bucket, key, etag)
+            original = find_current_ingestion(bucket, source, kingdom, dt, fingerprint)
+        if original is not None:
+            print(f"Duplicate of run {original['run_id']}, skipping s3://{bucket}/{key}")
+            metrics.emit({"Source": source}, {"kingdom": kingdom, "dt": dt, "key": key, "duplicate": True})
+            return {**original, "duplicate": True}
     
-    # Add metadata
-    df = add_ingestion_metadata(df)
-    df = add_record_hash(df)
+    if kingdom in MULTI_KINGDOMS:
+        return process_s3_multi_ingestion(
+            bucket, key, key_info, artifacts, delta, history, fingerprint, size, metrics
+        )
     
-    # Generate run timestamp
+    # Generate run timestamp and the run_id stamped on every row
     run_ts = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    run_id = str(uuid4())
     
     # Build S3 keys
-    raw_key = build_raw_key(source, kingdom, dt, run_ts, filename)
+    raw_key = key if replay else build_raw_key(source, kingdom, dt, run_ts, filename)
     curated_key = build_curated_key(source, kingdom, dt)
+    leaderboards = LeaderboardBuilder() if artifacts else None
+    snapshot_rows = SnapshotCollector() if delta or history else None
+    collectors = [c for c in (leaderboards, snapshot_rows) if c is not None]
     
-    # Upload raw file to raw prefix
-    upload_file_to_s3(tmp_input, bucket, raw_key)
+    # Raw bytes are already in the bucket: copy them server-side while the
+    # input is parsed rather than after it
+    raw_copy = None if replay else start_s3_copy(bucket, key, bucket, raw_key)
+    overlap_start = time.perf_counter()
+    hidden_upload = 0.0
+    try:
+        if streaming:
+            body = get_s3_object_stream(bucket, key)
+            
+            # Nothing is written if parsing or validation fails part-way
+            with open_input(body, ext, compression) as (input_source, ext):
+                with S3MultipartWriter(bucket, curated_key) as sink:
+                    rows = write_curated(
+                        input_source, ext, kingdom, dt, sink, chunk_rows, engine, collectors, run_id, metrics
+                    )
+            metrics.count("input_bytes", size)
+            metrics.count("output_bytes", sink.bytes_written)
+            # Part uploads that ran while the next part was being encoded
+            hidden_upload = sink.upload_seconds - sink.wait_seconds
+        else:
+            # Unique names: concurrent records often share a filename and run_ts
+            tmp_prefix = f"/tmp/{uuid4().hex}"
+            tmp_input = f"{tmp_prefix}_{filename}"
+            tmp_parquet = f"{tmp_prefix}_curated_{run_ts}.parquet"
+            try:
+                with metrics.stage("download"):
+                    download_s3_object(bucket, key, tmp_input)
+                with open_input(tmp_input, ext, compression) as (input_source, ext):
+                    rows = write_curated(
+                        input_source, ext, kingdom, dt, tmp_parquet,
+                        chunk_rows, engine, collectors, run_id, metrics,
+                    )
+                metrics.count("input_bytes", os.path.getsize(tmp_input))
+                metrics.count("output_bytes", os.path.getsize(tmp_parquet))
+                
+                with metrics.stage("upload"):
+                    upload_file_to_s3(tmp_parquet, bucket, curated_key)
+            finally:
+                # Clean up temp files
+                for tmp_path in (tmp_input, tmp_parquet):
+                    if os.path.exists(tmp_path):
+                        os.remove(tmp_path)
+        
+        foreground = time.perf_counter() - overlap_start
+        copy_seconds = raw_copy.result() if raw_copy is not None else 0.0
+    except BaseException:
+        if raw_copy is not None:
+            discard_raw_copy(raw_copy, bucket, raw_key)
+        raise
     
-    # Write curated parquet to /tmp and upload
-    tmp_parquet = f"/tmp/curated_{run_ts}.parquet"
-    df.to_parquet(tmp_parquet, index=False)
-    upload_file_to_s3(tmp_parquet, bucket, curated_key)
+    # Wall time saved against running the copy, the parse/write and the part
+    # uploads back to back
+    elapsed = time.perf_counter() - overlap_start
+    overlap_saved = max(0.0, foreground + hidden_upload + copy_seconds - elapsed)
+    if raw_copy is not None:
+        metrics.record("raw_copy", copy_seconds)
+    metrics.record("overlap_saved", overlap_saved)
     
-    # Clean up temp files
-    os.remove(tmp_input)
-    os.remove(tmp_parquet)
+    # Published only after the curated snapshot exists, so the API never
+    # serves a leaderboard for data that failed to land
+    outputs = publish_s3_outputs(
+        bucket, source, kingdom, dt, rows, run_id, run_ts, curated_key,
+        leaderboards, snapshot_rows, delta, history, metrics,
+    )
     
     result = {
         "kingdom": kingdom,
         "dt": dt,
         "run_ts": run_ts,
-        "rows": len(df),
+        "run_id": run_id,
+        "rows": rows,
         "raw_key": raw_key,
         "curated_key": curated_key,
+        **outputs,
+        "compression": compression,
+        "streaming": streaming,
+        "overlap_saved_seconds": round(overlap_saved, 3),
+        "chunk_rows": chunk_rows,
+        "engine": "pandas" if chunk_rows else engine,
+        "peak_rss_mb": peak_rss_mb(),
+        "fingerprint": fingerprint,
     }
     
+    if idempotent:
+        with metrics.stage("registry"):
+            record_ingestion(bucket, source, kingdom, dt, fingerprint, result)
+    
+    metrics.count("rows", rows)
+    metrics.emit({"Source": source}, {
+        "kingdom": kingdom,
+        "dt": dt,
+        "key": key,
+        "run_id": run_id,
+        "engine": result["engine"],
+        "streaming": streaming,
+        "duplicate": False,
+    })
+    
     print(f"Ingestion complete: {json.dumps(result)}")
-    return result
+    return {**result, "duplicate": False}
+
+
+def process_s3_multi_ingestion(
+    bucket: str,
+    key: str,
+    key_info: dict,
+    artifacts: bool = LEADERBOARD_ARTIFACTS,
+    delta: bool = DELTA_SNAPSHOTS,
+    history: bool = PLAYER_HISTORY,
+    fingerprint: Optional[str] = None,
+    size: Optional[int] = None,
+    metrics: Optional[StageMetrics] = None,
+) -> dict:
+    """
+    Ingest an upload holding many kingdoms into one snapshot per kingdom.
+    
+    The input is parsed once with the pandas engine and split on its kingdom
+    column. Every kingdom is validated and hashed, then written and
+    published, on a thread pool (MULTI_KINGDOM_WORKERS); no curated snapshot
+    is written unless every kingdom passes validation. The raw tier keeps one
+    copy of the upload under its multi-kingdom key.
+    
+    Args:
+        bucket: S3 bucket name
+        key: Inbox or raw-tier key of the upload
+        key_info: Parsed key, from parse_inbox_key or parse_raw_key
+        artifacts: Publish top-N leaderboard artifacts per kingdom
+        delta: Write each kingdom's delta against its previous snapshot
+        history: Fold each kingdom's snapshot into its player history
+        fingerprint: Input fingerprint; the run is recorded in the idempotency
+            registry under it when given
+        size: Object size from the S3 event, reported as input_bytes
+        metrics: Collects stage timings, summed over kingdoms
+    
+    Returns:
+        Dict with the run summary; "kingdoms" lists a summary per kingdom
+        and "rows" is their total
+    """
+    import pyarrow as pa
+    
+    from .deltas import SnapshotCollector
+    from .layout import write_curated_table
+    from .leaderboards import LeaderboardBuilder
+    from .multi_kingdom import build_partitions, map_kingdoms, read_partitions
+    
+    metrics = metrics or StageMetrics()
+    replay = key.startswith(RAW_PREFIX)
+    source = key_info["source"]
+    dt = key_info["dt"]
+    filename = key_info["filename"]
+    compression = key_info["compression"]
+    
+    run_ts = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    run_id = str(uuid4())
+    raw_key = key if replay else build_raw_key(source, key_info["kingdom"], dt, run_ts, filename)
+    
+    def write_kingdom(kingdom):
+        table = pa.Table.from_pandas(curated.pop(kingdom), preserve_index=False)
+        with metrics.stage("write"):
+            with S3MultipartWriter(bucket, build_curated_key(source, kingdom, dt)) as sink:
+                write_curated_table(table, sink)
+        metrics.count("output_bytes", sink.bytes_written)
+        return table
+    
+    def publish_kingdom(kingdom):
+        table = tables[kingdom]
+        curated_key = build_curated_key(source, kingdom, dt)
+        leaderboards = LeaderboardBuilder() if artifacts else None
+        snapshot_rows = SnapshotCollector() if delta or history else None
+        with metrics.stage("collect"):
+            for collector in (leaderboards, snapshot_rows):
+                if collector is not None:
+                    collector.add(table)
+        outputs = publish_s3_outputs(
+            bucket, source, kingdom, dt, len(table), run_id, run_ts, curated_key,
+            leaderboards, snapshot_rows, delta, history, metrics,
+        )
+        return {"kingdom": kingdom, "rows": len(table), "curated_key": curated_key, **outputs}
+    
+    # Zip archives need random access, so they are staged in /tmp
+    streaming = compression is None or compression in STREAMABLE_COMPRESSIONS
+    raw_copy = None if replay else start_s3_copy(bucket, key, bucket, raw_key)
+    try:
+        if streaming:
+            body = get_s3_object_stream(bucket, key)
+            with open_input(body, key_info["ext"], compression) as (input_source, ext):
+                with metrics.stage("parse"):
+                    parts = read_partitions(input_source, ext)
+        else:
+            tmp_input = f"/tmp/{uuid4().hex}_{filename}"
+            try:
+                with metrics.stage("download"):
+                    download_s3_object(bucket, key, tmp_input)
+                with open_input(tmp_input, key_info["ext"], compression) as (input_source, ext):
+                    with metrics.stage("parse"):
+                        parts = read_partitions(input_source, ext)
+            finally:
+                if os.path.exists(tmp_input):
+                    os.remove(tmp_input)
+        metrics.count("input_bytes", size)
+        
+        curated = build_partitions(parts, dt, run_id, metrics)
+        del parts
+        names = list(curated)
+        tables = dict(zip(names, map_kingdoms(write_kingdom, names)))
+        
+        if raw_copy is not None:
+            metrics.record("raw_copy", raw_copy.result())
+    except BaseException:
+        if raw_copy is not None:
+            discard_raw_copy(raw_copy, bucket, raw_key)
+        raise
+    
+    kingdoms = map_kingdoms(publish_kingdom, tables)
+    rows = sum(k["rows"] for k in kingdoms)
+    
+    result = {
+        "kingdom": key_info["kingdom"],
+        "dt": dt,
+        "run_ts": run_ts,
+        "run_id": run_id,
+        "rows": rows,
+        "raw_key": raw_key,
+        "kingdoms": kingdoms,
+        "compression": compression,
+        "streaming": streaming,
+        "chunk_rows": 0,
+        "engine": "pandas",
+        "peak_rss_mb": peak_rss_mb(),
+        "fingerprint": fingerprint,
+    }
+    
+    if fingerprint is not None:
+        with metrics.stage("registry"):
+            record_ingestion(bucket, source, key_info["kingdom"], dt, fingerprint, result)
+    
+    metrics.count("rows", rows)
+    metrics.count("kingdoms", len(kingdoms))
+    metrics.emit({"Source": source}, {
+        "kingdom": key_info["kingdom"],
+        "dt": dt,
+        "key": key,
+        "run_id": run_id,
+        "engine": "pandas",
+        "streaming": streaming,
+        "duplicate": False,
+    })
+    
+    print(f"Multi-kingdom ingestion complete: {json.dumps(result)}")
+    return {**result, "duplicate": False}
+
+
+def discard_raw_copy(raw_copy: Future, bucket: str, raw_key: str) -> None:
+    """
+    Undo the raw-tier copy of an input whose ingestion failed.
+    
+    The copy starts before parsing, so without this a rejected input would
+    be left in the raw tier, where a backfill would pick it up as the newest
+    run of its snapshot.
+    
+    Args:
+        raw_copy: Future returned by start_s3_copy
+        bucket: S3 bucket name
+        raw_key: Raw-tier key being copied to
+    """
+    try:
+        raw_copy.result()
+        delete_s3_object(bucket, raw_key)
+    except Exception as e:
+        print(f"Could not remove raw copy s3://{bucket}/{raw_key}: {e}")
+
+
+def publish_s3_outputs(
+    bucket: str,
+    source: str,
+    kingdom: str,
+    dt: str,
+    rows: int,
+    run_id: str,
+    run_ts: str,
+    curated_key: str,
+    leaderboards=None,
+    snapshot_rows=None,
+    delta: bool = False,
+    history: bool = False,
+    metrics: Optional[StageMetrics] = None,
+    serving: bool = SERVING_STORE,
+) -> dict:
+    """
+    Publish everything derived from a curated snapshot that is already written.
+    
+    Args:
+        bucket: S3 bucket name
+        source: Source name
+        kingdom: Kingdom identifier
+        dt: Date string (YYYY-MM-DD)
+        rows: Rows in the snapshot
+        run_id: Run identifier of the snapshot
+        run_ts: Run timestamp
+        curated_key: Key of the curated snapshot
+        leaderboards: LeaderboardBuilder fed with the snapshot, None to skip
+            the artifacts
+        snapshot_rows: SnapshotCollector fed with the snapshot; required
+            for the delta and the history
+        delta: Write a delta against the kingdom's previous snapshot
+        history: Fold the snapshot into the kingdom's player history
+        metrics: Receives artifacts, delta, history, serving and catalog
+            stage timings (default: disabled)
+        serving: With history, rebuild the kingdom's serving store from it
+    
+    Returns:
+        Dict with leaderboards (artifact count), delta_key, prev_dt,
+        history_key and serving_key
+    """
+    from .history import update_s3_history
+    from .serving_store import prune_s3_serving_stores, publish_s3_serving_store
+    
+    metrics = metrics or StageMetrics(enabled=False)
+    
+    leaderboard_keys = []
+    if leaderboards is not None:
+        with metrics.stage("artifacts"):
+            objects = {
+                build_leaderboard_key(source, kingdom, dt, name): body
+                for name, body in leaderboards.artifacts(kingdom, dt).items()
+            }
+            upload_objects_to_s3(objects, bucket)
+        leaderboard_keys = sorted(objects)
+    
+    delta_key = prev_dt = None
+    if delta:
+        with metrics.stage("delta"):
+            delta_key, prev_dt = publish_s3_delta(bucket, source, kingdom, dt, snapshot_rows.table())
+    
+    entry = snapshot_entry(dt, rows, run_id, run_ts, curated_key)
+    history_key = pointer = None
+    if history:
+        with metrics.stage("history"):
+            history_key, history_table = update_s3_history(bucket, source, kingdom, dt, snapshot_rows.table())
+        if serving:
+            with metrics.stage("serving"):
+                pointer = publish_s3_serving_store(bucket, source, kingdom, history_table, run_id, run_ts, entry)
+    
+    # Catalog last: once a date is listed, its snapshot and artifacts exist
+    with metrics.stage("catalog"):
+        document = update_s3_catalog(bucket, source, kingdom, entry, serving=pointer)
+    if pointer is not None:
+        prune_s3_serving_stores(bucket, source, kingdom, document.get("serving"))
+    
+    return {
+        "leaderboards": len(leaderboard_keys),
+        "delta_key": delta_key,
+        "prev_dt": prev_dt,
+        "history_key": history_key,
+        "serving_key": pointer["key"] if pointer else None,
+    }
+
+
+def publish_s3_delta(bucket: str, source: str, kingdom: str, dt: str, current: "pa.Table") -> tuple:
+    """
+    Diff a snapshot against the kingdom's previous one and upload the delta.
+    
+    Args:
+        bucket: S3 bucket name
+        source: Source name
+        kingdom: Kingdom identifier
+        dt: Date string (YYYY-MM-DD)
+        current: Current snapshot rows (at least the delta input columns)
+        
+    Returns:
+        Tuple of (delta key, previous dt), both None for a first snapshot
+    """
+    from .deltas import compute_delta, delta_to_parquet_bytes, previous_snapshot, read_snapshot
+    
+    catalog = read_s3_catalog(bucket, source, kingdom) or {}
+    prev = previous_snapshot(catalog.get("snapshots"), dt)
+    if prev is None:
+        return None, None
+    
+    previous = read_snapshot(io.BytesIO(get_s3_object_stream(bucket, prev["curated_key"]).read()))
+    delta_key = build_delta_key(source, kingdom, dt)
+    upload_bytes_to_s3(delta_to_parquet_bytes(compute_delta(current, previous)), bucket, delta_key)
+    return delta_key, prev["dt"]
+
+
+def publish_local_delta(out_dir: str, kingdom: str, dt: str, current: "pa.Table") -> tuple:
+    """
+    Local counterpart of publish_s3_delta.
+    
+    Args:
+        out_dir: Local output root
+        kingdom: Kingdom identifier
+        dt: Date string (YYYY-MM-DD)
+        current: Current snapshot rows (at least the delta input columns)
+        
+    Returns:
+        Tuple of (delta path, previous dt), both None for a first snapshot
+    """
+    from .deltas import compute_delta, delta_to_parquet_bytes, previous_snapshot, read_snapshot
+    
+    catalog = read_local_catalog(out_dir, "rok_players", kingdom) or {}
+    prev = previous_snapshot(catalog.get("snapshots"), dt)
+    if prev is None or not os.path.exists(prev["curated_key"]):
+        return None, None
+    
+    path = Path(out_dir) / build_delta_key("rok_players", kingdom, dt)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(delta_to_parquet_bytes(compute_delta(current, read_snapshot(prev["curated_key"]))))
+    return str(path), prev["dt"]
+
+
+def find_current_ingestion(bucket: str, source: str, kingdom: str, dt: str, fingerprint: str) -> Optional[dict]:
+    """
+    Find an earlier ingestion of the same input that is still current.
+    
+    See idempotency.is_current_run.
+    
+    Args:
+        bucket: S3 bucket name
+        source: Source name
+        kingdom: Kingdom identifier
+        dt: Date string (YYYY-MM-DD)
+        fingerprint: Input fingerprint
+        
+    Returns:
+        The original run summary, or None if the input must be ingested
+    """
+    original = lookup_ingestion(bucket, source, kingdom, dt, fingerprint)
+    if original is None or not is_current_run(bucket, source, dt, original):
+        return None
+    return original
+
+
+def write_curated(
+    input_source,
+    ext: str,
+    kingdom: str,
+    dt: str,
+    sink,
+    chunk_rows: int = 0,
+    engine: str = INGEST_ENGINE,
+    collectors: Sequence = (),
+    run_id: Optional[str] = None,
+    metrics: Optional[StageMetrics] = None,
+) -> int:
+    """
+    Parse an input, build the curated rows and write them as Parquet.
+    
+    Args:
+        input_source: Local file path or file-like object
+        ext: File extension without dot ("csv" or "json")
+        kingdom: Kingdom identifier
+        dt: Date string (YYYY-MM-DD)
+        sink: Output path or writable file object
+        chunk_rows: Rows per chunk for bounded-memory mode, 0 to load whole
+        engine: "pandas" or "arrow"; ignored in chunked mode
+        collectors: Objects whose add(table) receives the curated rows as they
+            are written, such as LeaderboardBuilder
+        run_id: Run identifier stamped on every row (default: new UUID)
+        metrics: Receives parse, validate, hash, transform, write and
+            collect stage timings (default: disabled)
+        
+    Returns:
+        Number of rows written
+        
+    Raises:
+        ValueError: If engine is not supported
+    """
+    import pyarrow as pa
+    
+    from .arrow_engine import build_curated_table, read_table, write_table
+    from .chunked import ingest_chunks, iter_input_chunks
+    from .io_local import read_input
+    from .layout import write_curated_table
+    
+    if engine not in INGEST_ENGINES:
+        raise ValueError(f"Unsupported ingest engine: {engine}. Supported: {sorted(INGEST_ENGINES)}")
+    
+    metrics = metrics or StageMetrics(enabled=False)
+    
+    if chunk_rows:
+        chunks = iter_input_chunks(input_source, ext, chunk_rows)
+        return ingest_chunks(chunks, kingdom, dt, sink, collectors, run_id, metrics)
+    
+    if engine == "arrow":
+        with metrics.stage("parse"):
+            table = read_table(input_source, ext)
+        with metrics.stage("transform"):
+            table = build_curated_table(table, kingdom, dt, run_id=run_id)
+        with metrics.stage("write"):
+            write_table(table, sink)
+    else:
+        with metrics.stage("parse"):
+            df = read_input(input_source, ext)
+        df = build_curated_df(df, kingdom, dt, run_id, metrics)
+        with metrics.stage("write"):
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            write_curated_table(table, sink)
+    
+    with metrics.stage("collect"):
+        for collector in collectors:
+            collector.add(table)
+    return len(table)
+
+
+def build_curated_df(
+    df: "pd.DataFrame",
+    kingdom: str,
+    dt: str,
+    run_id: Optional[str] = None,
+    metrics: Optional[StageMetrics] = None,
+) -> "pd.DataFrame":
+    """
+    Run the shared validate/normalize/metadata/hash steps on a parsed input.
+    
+    Args:
+        df: Parsed input DataFrame
+        kingdom: Kingdom identifier
+        dt: Date string (YYYY-MM-DD)
+        run_id: Run identifier stamped on every row (default: new UUID)
+        metrics: Receives validate and hash stage timings (default: disabled)
+        
+    Returns:
+        Curated DataFrame ready to write as Parquet
+    """
+    from .hashing import add_ingestion_metadata, add_record_hash
+    from .normalize import normalize_df
+    from .validation import validate_required_columns, validate_unique_id
+    
+    metrics = metrics or StageMetrics(enabled=False)
+    
+    with metrics.stage("validate"):
+        # Normalize column names to lowercase
+        df.columns = df.columns.str.lower()
+        
+        # Validate
+        validate_required_columns(df)
+        validate_unique_id(df)
+        
+        # Normalize data
+        df = normalize_df(df, kingdom, dt)
+    
+    with metrics.stage("hash"):
+        # Add metadata
+        df = add_ingestion_metadata(df, run_id=run_id)
+        df = add_record_hash(df)
+    
+    return df
 
 
-def process_ingestion(input_path: str, kingdom: str, dt: str, out_dir: str = "local_out") -> dict:
+def process_ingestion(
+    input_path: str,
+    kingdom: str,
+    dt: str,
+    out_dir: str = "local_out",
+    chunk_rows: int = 0,
+    engine: str = INGEST_ENGINE,
+    artifacts: bool = LEADERBOARD_ARTIFACTS,
+    delta: bool = DELTA_SNAPSHOTS,
+    history: bool = PLAYER_HISTORY,
+    copy_raw: bool = True,
+) -> dict:
     """
     Local-friendly entrypoint used by scripts/run_local.py.
     
     Args:
-        input_path: Local file path to CSV or JSON
+        input_path: Local file path to CSV or JSON, optionally compressed
+            (.gz, .zst or .zip)
         kingdom: Kingdom identifier
         dt: Date string (YYYY-MM-DD)
         out_dir: Output directory (default: "local_out")
+        chunk_rows: Process the input in chunks of this many rows, 0 to
+            load it whole (default: 0)
+        engine: "pandas" or "arrow" (default: INGEST_ENGINE)
+        artifacts: Write top-N leaderboard artifacts (default: LEADERBOARD_ARTIFACTS)
+        delta: Write a delta against the kingdom's previous snapshot
+            (default: DELTA_SNAPSHOTS)
+        history: Fold the snapshot into the kingdom's player history
+            (default: PLAYER_HISTORY)
+        copy_raw: Copy the input into the raw tier; off when replaying an
+            input that is already there (default: True)
         
+    A multi-kingdom kingdom (see MULTI_KINGDOMS) is handed to
+    process_local_multi_ingestion.
+    
     Returns:
         Dictionary with ingestion summary
     """
-    # Step 1: Read input file
-    df = read_input_file(input_path)
+    if kingdom in MULTI_KINGDOMS:
+        return process_local_multi_ingestion(
+            input_path, kingdom, dt, out_dir, artifacts, delta, history, copy_raw
+        )
     
-    # Step 1b: Normalize column names to lowercase
-    df.columns = df.columns.str.lower()
+    import pyarrow as pa
     
-    # Step 2: Validate required columns
-    validate_required_columns(df)
+    from .deltas import SnapshotCollector
+    from .io_local import copy_raw_file, read_input_file, write_parquet
+    from .leaderboards import LeaderboardBuilder
     
-    # Step 3: Validate unique id
-    validate_unique_id(df)
+    run_id = str(uuid4())
     
-    # Step 4: Normalize data
-    df = normalize_df(df, kingdom, dt)
-    
-    # Step 5: Add ingestion metadata
-    df = add_ingestion_metadata(df)
-    
-    # Step 6: Add record hash
-    df = add_record_hash(df)
+    # Step 1: Read input file (pandas whole-file mode only)
+    df = None
+    if not chunk_rows and engine == "pandas":
+        df = read_input_file(input_path)
+        
+        # Steps 2-6: Validate, normalize, add metadata and record hash
+        df = build_curated_df(df, kingdom, dt, run_id)
     
     # Step 7: Compute run_ts
     run_ts = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
@@ -175,18 +867,215 @@ def process_ingestion(input_path: str, kingdom: str, dt: str, out_dir: str = "lo
         f"kingdom={kingdom}/dt={dt}/players.parquet"
     )
     
-    # Step 9: Copy raw file
-    copy_raw_file(input_path, raw_path)
+    leaderboards = LeaderboardBuilder() if artifacts else None
+    snapshot_rows = SnapshotCollector() if delta or history else None
+    collectors = [c for c in (leaderboards, snapshot_rows) if c is not None]
     
-    # Step 10: Write curated parquet
-    write_parquet(df, curated_path)
+    # Step 9: Write curated parquet (other modes validate while writing)
+    if df is None:
+        Path(curated_path).parent.mkdir(parents=True, exist_ok=True)
+        ext, compression = parse_filename(Path(input_path).name)
+        
+        # Write beside the target and rename, so a failed chunk never leaves
+        # a truncated snapshot behind
+        tmp_path = f"{curated_path}.tmp"
+        try:
+            with open_input(input_path, ext, compression) as (input_source, ext):
+                rows = write_curated(
+                    input_source, ext, kingdom, dt, tmp_path, chunk_rows, engine, collectors, run_id
+                )
+            os.replace(tmp_path, curated_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    else:
+        write_parquet(df, curated_path)
+        rows = len(df)
+        if collectors:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            for collector in collectors:
+                collector.add(table)
+    
+    # Step 10: Copy raw file
+    if copy_raw:
+        copy_raw_file(input_path, raw_path)
+    else:
+        raw_path = input_path
     
-    # Step 11: Return summary
+    # Steps 11-14: Write leaderboard artifacts, the delta and the player
+    # history, then record the snapshot in the kingdom's catalog
+    outputs = publish_local_outputs(
+        out_dir, kingdom, dt, rows, run_id, run_ts, curated_path, leaderboards, snapshot_rows, delta, history
+    )
+    
+    # Step 15: Return summary
     return {
         "kingdom": kingdom,
         "dt": dt,
         "run_ts": run_ts,
-        "rows": len(df),
+        "run_id": run_id,
+        "rows": rows,
         "raw_path": raw_path,
         "curated_path": curated_path,
+        **outputs,
+        "engine": "pandas" if chunk_rows else engine,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def process_local_multi_ingestion(
+    input_path: str,
+    kingdom: str,
+    dt: str,
+    out_dir: str = "local_out",
+    artifacts: bool = LEADERBOARD_ARTIFACTS,
+    delta: bool = DELTA_SNAPSHOTS,
+    history: bool = PLAYER_HISTORY,
+    copy_raw: bool = True,
+) -> dict:
+    """
+    Local counterpart of process_s3_multi_ingestion.
+    
+    Args:
+        input_path: Local file path to CSV or JSON with a kingdom column,
+            optionally compressed
+        kingdom: Multi-kingdom segment the raw copy is filed under, e.g. "multi"
+        dt: Date string (YYYY-MM-DD)
+        out_dir: Output directory (default: "local_out")
+        artifacts: Write top-N leaderboard artifacts per kingdom
+        delta: Write each kingdom's delta against its previous snapshot
+        history: Fold each kingdom's snapshot into its player history
+        copy_raw: Copy the input into the raw tier (default: True)
+    
+    Returns:
+        Dictionary with the run summary; "kingdoms" lists a summary per
+        kingdom and "rows" is their total
+    """
+    import pyarrow as pa
+    
+    from .deltas import SnapshotCollector
+    from .io_local import copy_raw_file, write_parquet
+    from .leaderboards import LeaderboardBuilder
+    from .multi_kingdom import build_partitions, map_kingdoms, read_partitions
+    
+    run_id = str(uuid4())
+    ext, compression = parse_filename(Path(input_path).name)
+    with open_input(input_path, ext, compression) as (input_source, ext):
+        parts = read_partitions(input_source, ext)
+    curated = build_partitions(parts, dt, run_id)
+    del parts
+    
+    run_ts = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    
+    def ingest_kingdom(name):
+        df = curated.pop(name)
+        curated_path = str(Path(out_dir) / build_curated_key("rok_players", name, dt))
+        write_parquet(df, curated_path)
+        
+        leaderboards = LeaderboardBuilder() if artifacts else None
+        snapshot_rows = SnapshotCollector() if delta or history else None
+        collectors = [c for c in (leaderboards, snapshot_rows) if c is not None]
+        if collectors:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            for collector in collectors:
+                collector.add(table)
+        
+        outputs = publish_local_outputs(
+            out_dir, name, dt, len(df), run_id, run_ts, curated_path,
+            leaderboards, snapshot_rows, delta, history,
+        )
+        return {"kingdom": name, "rows": len(df), "curated_path": curated_path, **outputs}
+    
+    kingdoms = map_kingdoms(ingest_kingdom, list(curated))
+    
+    raw_path = input_path
+    if copy_raw:
+        raw_path = str(
+            Path(out_dir) / build_raw_key("rok_players", kingdom, dt, run_ts, Path(input_path).name)
+        )
+        copy_raw_file(input_path, raw_path)
+    
+    return {
+        "kingdom": kingdom,
+        "dt": dt,
+        "run_ts": run_ts,
+        "run_id": run_id,
+        "rows": sum(k["rows"] for k in kingdoms),
+        "raw_path": raw_path,
+        "kingdoms": kingdoms,
+        "engine": "pandas",
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def publish_local_outputs(
+    out_dir: str,
+    kingdom: str,
+    dt: str,
+    rows: int,
+    run_id: str,
+    run_ts: str,
+    curated_path: str,
+    leaderboards=None,
+    snapshot_rows=None,
+    delta: bool = False,
+    history: bool = False,
+    serving: bool = SERVING_STORE,
+) -> dict:
+    """
+    Local counterpart of publish_s3_outputs.
+    
+    Args:
+        out_dir: Local output root
+        kingdom: Kingdom identifier
+        dt: Date string (YYYY-MM-DD)
+        rows: Rows in the snapshot
+        run_id: Run identifier of the snapshot
+        run_ts: Run timestamp
+        curated_path: Path of the curated snapshot
+        leaderboards: LeaderboardBuilder fed with the snapshot, None to skip
+            the artifacts
+        snapshot_rows: SnapshotCollector fed with the snapshot; required
+            for the delta and the history
+        delta: Write a delta against the kingdom's previous snapshot
+        history: Fold the snapshot into the kingdom's player history
+        serving: With history, rebuild the kingdom's serving store from it
+    
+    Returns:
+        Dict with leaderboards (artifact count), delta_path, prev_dt,
+        history_path and serving_path
+    """
+    from .history import update_local_history
+    from .serving_store import prune_local_serving_stores, publish_local_serving_store
+    
+    leaderboard_paths = []
+    if leaderboards is not None:
+        for name, body in leaderboards.artifacts(kingdom, dt).items():
+            path = Path(out_dir) / build_leaderboard_key("rok_players", kingdom, dt, name)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(body)
+            leaderboard_paths.append(str(path))
+    
+    delta_path = prev_dt = None
+    if delta:
+        delta_path, prev_dt = publish_local_delta(out_dir, kingdom, dt, snapshot_rows.table())
+    
+    entry = snapshot_entry(dt, rows, run_id, run_ts, curated_path)
+    history_path = pointer = None
+    if history:
+        history_path, history_table = update_local_history(out_dir, kingdom, dt, snapshot_rows.table())
+        if serving:
+            pointer = publish_local_serving_store(out_dir, kingdom, history_table, run_id, run_ts, entry)
+    
+    # Catalog last, as in S3
+    document = update_local_catalog(out_dir, "rok_players", kingdom, entry, serving=pointer)
+    if pointer is not None:
+        prune_local_serving_stores(out_dir, kingdom, document.get("serving"))
+    
+    return {
+        "leaderboards": len(leaderboard_paths),
+        "delta_path": delta_path,
+        "prev_dt": prev_dt,
+        "history_path": history_path,
+        "serving_path": pointer["key"] if pointer else None,
     }
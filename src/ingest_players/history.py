@@ -0,0 +1,256 @@
+"""Per-kingdom player history compacted from curated snapshots.
+
+All of a kingdom's snapshots live in one Parquet file sorted by id and then
+snapshot_date, written in small row groups with statistics. One player's
+timeline is contiguous, so a reader only fetches the row groups whose id
+min/max cover that player instead of scanning every dt partition.
+"""
+
+import io
+import os
+import random
+import time
+from pathlib import Path
+from typing import Iterable, Optional, Tuple
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from .aws_s3 import (
+    get_s3_object_stream,
+    get_s3_object_with_etag,
+    put_s3_object_if_unchanged,
+)
+from .catalog import read_local_catalog, read_s3_catalog
+from .config import CATALOG_MAX_ATTEMPTS, HISTORY_ROW_GROUP_SIZE
+from .deltas import read_snapshot
+from .leaderboards import LEADERBOARD_COLUMNS
+from .s3_paths import build_history_key
+
+HISTORY_COLUMNS = ("id", "snapshot_date", "name", "alliance") + LEADERBOARD_COLUMNS
+
+HISTORY_SORT = [("id", "ascending"), ("snapshot_date", "ascending")]
+
+
+def _project(snapshot: pa.Table, dt: str) -> pa.Table:
+    columns = [c for c in HISTORY_COLUMNS if c in snapshot.column_names and c != "snapshot_date"]
+    table = snapshot.select(columns)
+    return table.add_column(1, "snapshot_date", pa.repeat(pa.scalar(dt), len(table)))
+
+
+def build_history(snapshots: Iterable[Tuple[str, pa.Table]]) -> pa.Table:
+    """
+    Build a history table from scratch.
+    
+    Args:
+        snapshots: (dt, curated rows) pairs
+        
+    Returns:
+        History table sorted by id, snapshot_date
+    """
+    tables = [_project(table, dt) for dt, table in snapshots]
+    return pa.concat_tables(tables, promote_options="permissive").sort_by(HISTORY_SORT)
+
+
+def merge_history(history: Optional[pa.Table], snapshot: pa.Table, dt: str) -> pa.Table:
+    """
+    Add one snapshot to an existing history.
+    
+    Rows already present for dt are replaced, so re-ingesting a date does not
+    duplicate it.
+    
+    Args:
+        history: Current history table, None if there is none yet
+        snapshot: Curated rows of the new snapshot
+        dt: Snapshot date
+        
+    Returns:
+        History table sorted by id, snapshot_date
+    """
+    new_rows = _project(snapshot, dt)
+    if history is None or len(history) == 0:
+        return new_rows.sort_by(HISTORY_SORT)
+    
+    kept = history.filter(pc.not_equal(history["snapshot_date"], dt))
+    return pa.concat_tables([kept, new_rows], promote_options="permissive").sort_by(HISTORY_SORT)
+
+
+def history_to_parquet_bytes(history: pa.Table, row_group_size: int = HISTORY_ROW_GROUP_SIZE) -> bytes:
+    """
+    Serialize a history table with per-row-group id statistics.
+    
+    Args:
+        history: Sorted history table
+        row_group_size: Rows per row group
+        
+    Returns:
+        Parquet file bytes
+    """
+    buffer = io.BytesIO()
+    pq.write_table(
+        history,
+        buffer,
+        row_group_size=row_group_size,
+        compression="snappy",
+        use_dictionary=[c for c in ("name", "alliance", "snapshot_date") if c in history.column_names],
+        write_statistics=True,
+        write_page_index=True,
+    )
+    return buffer.getvalue()
+
+
+def update_s3_history(
+    bucket: str,
+    source: str,
+    kingdom: str,
+    dt: str,
+    snapshot: pa.Table,
+    max_attempts: int = CATALOG_MAX_ATTEMPTS,
+) -> Tuple[str, pa.Table]:
+    """
+    Fold a new snapshot into the kingdom's S3 history.
+    
+    Only the existing history and the new snapshot are read, never the other
+    dt partitions. Writes are conditional on the ETag read, like the catalog,
+    so concurrent ingestions for a kingdom cannot lose each other's rows.
+    
+    Args:
+        bucket: S3 bucket name
+        source: Source name
+        kingdom: Kingdom identifier
+        dt: Snapshot date
+        snapshot: Curated rows of the new snapshot
+        max_attempts: Attempts before giving up
+        
+    Returns:
+        Tuple of (history object key, history table as written)
+        
+    Raises:
+        RuntimeError: If every attempt lost the race
+    """
+    key = build_history_key(source, kingdom)
+    
+    for attempt in range(max_attempts):
+        body, etag = get_s3_object_with_etag(bucket, key)
+        history = merge_history(pq.read_table(pa.BufferReader(body)) if body else None, snapshot, dt)
+        if put_s3_object_if_unchanged(history_to_parquet_bytes(history), bucket, key, etag):
+            return key, history
+        time.sleep(random.uniform(0, 0.05 * 2 ** attempt))
+    
+    raise RuntimeError(f"Could not update history s3://{bucket}/{key} after {max_attempts} attempts")
+
+
+def update_local_history(out_dir: str, kingdom: str, dt: str, snapshot: pa.Table) -> Tuple[str, pa.Table]:
+    """
+    Local counterpart of update_s3_history.
+    
+    Args:
+        out_dir: Local output root
+        kingdom: Kingdom identifier
+        dt: Snapshot date
+        snapshot: Curated rows of the new snapshot
+        
+    Returns:
+        Tuple of (history file path, history table as written)
+    """
+    path = Path(out_dir) / build_history_key("rok_players", kingdom)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    
+    history = merge_history(pq.read_table(path) if path.exists() else None, snapshot, dt)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(history_to_parquet_bytes(history))
+    os.replace(tmp_path, path)
+    
+    return str(path), history
+
+
+def compact_s3_history(bucket: str, source: str, kingdom: str, max_attempts: int = CATALOG_MAX_ATTEMPTS) -> dict:
+    """
+    Rebuild a kingdom's S3 history from every snapshot in its catalog.
+    
+    The write is conditional on the ETag of the history read first, like
+    update_s3_history, so a compaction never overwrites a snapshot merged by a
+    concurrent ingestion. Rows of dates the history has but the catalog does
+    not list yet belong to an ingestion that has not committed its catalog
+    entry, and are carried over.
+    
+    Args:
+        bucket: S3 bucket name
+        source: Source name
+        kingdom: Kingdom identifier
+        max_attempts: Attempts before giving up
+        
+    Returns:
+        Summary with key, snapshots, rows and row_groups
+        
+    Raises:
+        ValueError: If the catalog lists no snapshots
+        RuntimeError: If every attempt lost the race
+    """
+    key = build_history_key(source, kingdom)
+    
+    for attempt in range(max_attempts):
+        # Read before the catalog, so a merge missed by the catalog read is in
+        # the body and a later merge changes the ETag
+        body, etag = get_s3_object_with_etag(bucket, key)
+        catalog = read_s3_catalog(bucket, source, kingdom) or {}
+        snapshots = [
+            (s["dt"], read_snapshot(io.BytesIO(get_s3_object_stream(bucket, s["curated_key"]).read())))
+            for s in catalog.get("snapshots", [])
+        ]
+        if not snapshots:
+            raise ValueError(f"No snapshots in the catalog for kingdom {kingdom}")
+        
+        history = build_history(snapshots)
+        if body:
+            current = pq.read_table(pa.BufferReader(body))
+            cataloged = pc.is_in(
+                pc.cast(current["snapshot_date"], pa.string()), value_set=pa.array([dt for dt, _ in snapshots])
+            )
+            pending = current.filter(pc.invert(cataloged))
+            if len(pending):
+                history = pa.concat_tables([history, pending], promote_options="permissive").sort_by(HISTORY_SORT)
+        
+        data = history_to_parquet_bytes(history)
+        if put_s3_object_if_unchanged(data, bucket, key, etag):
+            return {
+                "key": key,
+                "snapshots": len(snapshots),
+                "rows": len(history),
+                "row_groups": pq.ParquetFile(pa.BufferReader(data)).num_row_groups,
+            }
+        time.sleep(random.uniform(0, 0.05 * 2 ** attempt))
+    
+    raise RuntimeError(f"Could not compact history s3://{bucket}/{key} after {max_attempts} attempts")
+
+
+def compact_local_history(out_dir: str, kingdom: str) -> dict:
+    """
+    Local counterpart of compact_s3_history.
+    
+    Args:
+        out_dir: Local output root
+        kingdom: Kingdom identifier
+        
+    Returns:
+        Summary with key, snapshots, rows and row_groups
+    """
+    catalog = read_local_catalog(out_dir, "rok_players", kingdom) or {}
+    snapshots = [(s["dt"], read_snapshot(s["curated_key"])) for s in catalog.get("snapshots", [])]
+    if not snapshots:
+        raise ValueError(f"No snapshots in the catalog for kingdom {kingdom}")
+    
+    history = build_history(snapshots)
+    path = Path(out_dir) / build_history_key("rok_players", kingdom)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = history_to_parquet_bytes(history)
+    path.write_bytes(data)
+    
+    return {
+        "key": str(path),
+        "snapshots": len(snapshots),
+        "rows": len(history),
+        "row_groups": pq.ParquetFile(pa.BufferReader(data)).num_row_groups,
+    }
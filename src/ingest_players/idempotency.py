@@ -0,0 +1,127 @@
+"""Content-addressed registry of already-ingested inputs.
+
+S3 event notifications are delivered at least once and exports are often
+re-uploaded unchanged. Each successful ingestion records the input's
+fingerprint under its kingdom and dt; a later event with the same
+fingerprint returns the original summary instead of redoing the work.
+"""
+
+import hashlib
+import json
+from typing import Optional
+
+from .aws_s3 import get_s3_object_with_etag, head_s3_object, put_s3_object_if_unchanged
+from .catalog import read_s3_catalog
+from .s3_paths import build_registry_key
+
+
+def fingerprint_s3_object(bucket: str, key: str, etag: Optional[str] = None) -> str:
+    """
+    Fingerprint an S3 object without reading its body.
+    
+    A SHA-256 checksum stored with the object is preferred. Otherwise the
+    ETag is used, which is the MD5 of the content for single-part uploads and
+    stable for identical multipart uploads.
+    
+    Args:
+        bucket: S3 bucket name
+        key: S3 object key
+        etag: ETag from the S3 event record, saves a HEAD request
+        
+    Returns:
+        Fingerprint string such as "etag:<hex>" or "sha256:<base64>"
+    """
+    if etag is None:
+        response = head_s3_object(bucket, key)
+        if response.get("ChecksumSHA256"):
+            return f"sha256:{response['ChecksumSHA256']}"
+        etag = response["ETag"]
+    return f"etag:{etag.strip(chr(34))}"
+
+
+def _registry_key(source: str, kingdom: str, dt: str, fingerprint: str) -> str:
+    digest = hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()
+    return build_registry_key(source, kingdom, dt, digest)
+
+
+def lookup_ingestion(bucket: str, source: str, kingdom: str, dt: str, fingerprint: str) -> Optional[dict]:
+    """
+    Find the summary of an earlier ingestion of the same input.
+    
+    Args:
+        bucket: S3 bucket name
+        source: Source name
+        kingdom: Kingdom identifier
+        dt: Date string (YYYY-MM-DD)
+        fingerprint: Input fingerprint
+        
+    Returns:
+        The original run summary, or None if this input was never ingested
+    """
+    body, _ = get_s3_object_with_etag(bucket, _registry_key(source, kingdom, dt, fingerprint))
+    return json.loads(body)["summary"] if body else None
+
+
+def is_current_run(bucket: str, source: str, dt: str, summary: dict) -> bool:
+    """
+    Check whether a registered run still produced the current snapshot.
+    
+    An input re-uploaded after a different export for the same date is not a
+    duplicate: its run must be redone to restore the snapshot. The catalog
+    tells which run produced the current snapshot; for a multi-kingdom input,
+    the catalog of every kingdom it held.
+    
+    Args:
+        bucket: S3 bucket name
+        source: Source name
+        dt: Date string (YYYY-MM-DD)
+        summary: Registered run summary
+        
+    Returns:
+        True if every kingdom the run wrote still has its snapshot for dt
+    """
+    for run in summary.get("kingdoms") or [summary]:
+        catalog = read_s3_catalog(bucket, source, run["kingdom"]) or {}
+        current = {s["dt"]: s["run_id"] for s in catalog.get("snapshots", [])}
+        if current.get(dt) != summary["run_id"]:
+            return False
+    return True
+
+
+def record_ingestion(
+    bucket: str,
+    source: str,
+    kingdom: str,
+    dt: str,
+    fingerprint: str,
+    summary: dict,
+) -> None:
+    """
+    Register a successful ingestion under its input fingerprint.
+    
+    A concurrent duplicate that finished second keeps the registered summary
+    while its run is still current. A summary whose run was superseded by
+    another export (A, then B, then A again) is replaced, conditionally on the
+    ETag read, so later retries of the input are recognized again.
+    
+    Args:
+        bucket: S3 bucket name
+        source: Source name
+        kingdom: Kingdom identifier
+        dt: Date string (YYYY-MM-DD)
+        fingerprint: Input fingerprint
+        summary: Run summary to return for later duplicates
+    """
+    key = _registry_key(source, kingdom, dt, fingerprint)
+    body, etag = get_s3_object_with_etag(bucket, key)
+    if body is not None and is_current_run(bucket, source, dt, json.loads(body)["summary"]):
+        return
+    
+    document = {"fingerprint": fingerprint, "summary": summary}
+    # Losing the race means another run registered the input meanwhile
+    put_s3_object_if_unchanged(
+        json.dumps(document, separators=(",", ":")).encode("utf-8"),
+        bucket,
+        key,
+        etag,
+    )
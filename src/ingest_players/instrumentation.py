@@ -0,0 +1,118 @@
+"""Per-stage timing of an ingestion run, emitted as CloudWatch EMF.
+
+A run accumulates wall time per stage (chunked ingestion enters the same
+stage once per chunk) plus row and byte counts, and prints them as a single
+Embedded Metric Format line. CloudWatch turns that line into metrics while
+the run's identifiers stay searchable as log properties.
+
+A disabled StageMetrics does nothing: stage() returns a shared no-op context
+manager, so instrumented code costs one attribute check per stage.
+"""
+
+import json
+import threading
+import time
+from contextlib import nullcontext
+from typing import Dict, Optional
+
+from .config import EMIT_METRICS, METRICS_NAMESPACE
+from .memory import peak_rss_mb
+
+_NOOP = nullcontext()
+
+
+class _Stage:
+    """Context manager adding its wall time to one stage's total."""
+    
+    __slots__ = ("metrics", "name", "start")
+    
+    def __init__(self, metrics: "StageMetrics", name: str):
+        self.metrics = metrics
+        self.name = name
+    
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.metrics.record(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class StageMetrics:
+    """Stage timings and counts of one ingestion run."""
+    
+    def __init__(self, enabled: bool = EMIT_METRICS, namespace: str = METRICS_NAMESPACE):
+        self.enabled = enabled
+        self.namespace = namespace
+        self.stages: Dict[str, float] = {}
+        self.counts: Dict[str, float] = {}
+        self._start = time.perf_counter()
+        # Kingdoms of a multi-kingdom upload record stages from worker threads
+        self._lock = threading.Lock()
+    
+    def stage(self, name: str):
+        """
+        Time a block as part of a stage.
+        
+        Args:
+            name: Stage name, e.g. "parse" or "hash"
+        
+        Returns:
+            Context manager; a shared no-op when disabled
+        """
+        if not self.enabled:
+            return _NOOP
+        return _Stage(self, name)
+    
+    def record(self, name: str, seconds: float) -> None:
+        """Add wall time measured elsewhere, e.g. on a background thread, to a stage."""
+        if self.enabled:
+            with self._lock:
+                self.stages[name] = self.stages.get(name, 0.0) + seconds * 1000
+    
+    def count(self, name: str, value: Optional[float]) -> None:
+        """Add to a run-level count such as rows or input_bytes; None is ignored."""
+        if self.enabled and value is not None:
+            with self._lock:
+                self.counts[name] = self.counts.get(name, 0) + value
+    
+    def to_emf(self, dimensions: Dict[str, str], properties: Optional[dict] = None) -> dict:
+        """
+        Build the EMF document for the run so far.
+        
+        Args:
+            dimensions: Low-cardinality metric dimensions, e.g. {"Source": ...}
+            properties: Extra log fields that are not metrics (kingdom, run_id)
+        
+        Returns:
+            EMF document
+        """
+        values = {f"{name}_ms": round(ms, 3) for name, ms in self.stages.items()}
+        values["total_ms"] = round((time.perf_counter() - self._start) * 1000, 3)
+        units = {name: "Milliseconds" for name in values}
+        
+        for name, value in self.counts.items():
+            values[name] = value
+            units[name] = "Bytes" if name.endswith("_bytes") else "Count"
+        values["peak_rss_mb"] = peak_rss_mb()
+        units["peak_rss_mb"] = "Megabytes"
+        
+        return {
+            "_aws": {
+                "Timestamp": int(time.time() * 1000),
+                "CloudWatchMetrics": [{
+                    "Namespace": self.namespace,
+                    "Dimensions": [sorted(dimensions)],
+                    "Metrics": [{"Name": name, "Unit": units[name]} for name in values],
+                }],
+            },
+            **(properties or {}),
+            **dimensions,
+            **values,
+        }
+    
+    def emit(self, dimensions: Dict[str, str], properties: Optional[dict] = None) -> None:
+        """Print the run's EMF line to stdout (CloudWatch Logs in Lambda)."""
+        if self.enabled:
+            print(json.dumps(self.to_emf(dimensions, properties)))
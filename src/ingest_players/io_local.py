@@ -2,14 +2,25 @@
 
 import shutil
 from pathlib import Path
+from typing import Dict
 
 import pandas as pd
+import pyarrow as pa
+
+from .compression import open_input
+from .json_input import read_json_df
+from .layout import write_curated_table
+from .s3_paths import parse_filename
+from .schema import BUSINESS_COLUMNS, read_csv_typed
 
 
 def read_input_file(path: str) -> pd.DataFrame:
     """
     Read CSV or JSON file from local filesystem.
     
+    gzip, zstd and zip compressed files (players.csv.gz, players.csv.zst,
+    players.zip) are decompressed as they are parsed.
+    
     Args:
         path: Local file path
         
@@ -17,27 +28,43 @@ def read_input_file(path: str) -> pd.DataFrame:
         DataFrame containing the parsed data
         
     Raises:
-        ValueError: If file extension is not supported
+        ValueError: If file extension or compression is not supported
     """
-    path_obj = Path(path)
-    extension = path_obj.suffix.lower()
+    ext, compression = parse_filename(Path(path).name)
+    with open_input(path, ext, compression) as (source, ext):
+        return read_input(source, ext)
+
+
+def read_input(source, ext: str, columns: Dict[str, str] = BUSINESS_COLUMNS) -> pd.DataFrame:
+    """
+    Parse CSV or JSON input from a path or a forward-only file object.
+    
+    Columns are projected and typed from the declared schema; CSV columns
+    that are not declared are skipped by the parser. JSON may be an array or
+    newline-delimited; see json_input.
     
-    if extension == ".csv":
-        return pd.read_csv(path)
-    elif extension == ".json":
-        # Try standard JSON array first
-        try:
-            return pd.read_json(path)
-        except ValueError:
-            # Retry with newline-delimited JSON
-            return pd.read_json(path, lines=True)
+    Args:
+        source: Local file path or file-like object (e.g. an S3 streaming body)
+        ext: File extension without dot ("csv" or "json")
+        columns: Declared columns and types (default: BUSINESS_COLUMNS)
+        
+    Returns:
+        DataFrame containing the parsed data
+        
+    Raises:
+        ValueError: If ext is not supported
+    """
+    if ext == "csv":
+        return read_csv_typed(source, columns=columns)
+    elif ext == "json":
+        return read_json_df(source, columns)
     else:
-        raise ValueError(f"Unsupported file extension: {extension}. Supported: .csv, .json")
+        raise ValueError(f"Unsupported file type: {ext}")
 
 
 def write_parquet(df: pd.DataFrame, path: str) -> None:
     """
-    Write DataFrame to Parquet file.
+    Write DataFrame to Parquet file with the curated layout.
     
     Args:
         df: DataFrame to write
@@ -45,7 +72,7 @@ def write_parquet(df: pd.DataFrame, path: str) -> None:
     """
     path_obj = Path(path)
     path_obj.parent.mkdir(parents=True, exist_ok=True)
-    df.to_parquet(path, index=False)
+    write_curated_table(pa.Table.from_pandas(df, preserve_index=False), path)
 
 
 def copy_raw_file(src_path: str, dest_path: str) -> None:
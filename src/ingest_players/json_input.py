@@ -0,0 +1,294 @@
+"""Streaming JSON input shared by every ingestion path.
+
+The first non-blank character decides the format: "[" is a JSON array of
+records, "{" is newline-delimited JSON (one record per line). Either way the
+input is decoded incrementally from the file or S3 stream and parsed exactly
+once, record by record, so memory tracks the batch size rather than the
+file size.
+
+Scanner tools nest some fields, e.g. {"kills": {"t4": 10}, "rss":
+{"gathered": 5}}. One level of nesting is flattened into the declared
+columns ("t4 kills", "rss gathered"); keys are matched case-insensitively
+with underscores read as spaces.
+"""
+
+import codecs
+import json
+import re
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional
+
+import pandas as pd
+
+from .config import JSON_BATCH_ROWS
+from .schema import BUSINESS_COLUMNS, conform_df
+
+# Bytes read from the input per step
+READ_SIZE = 1024 * 1024
+
+# A record still unparsed after this many characters is malformed, not truncated
+MAX_RECORD_CHARS = 1024 * 1024
+
+# Keys whose value stands for a nested object that is itself a declared
+# column, e.g. {"alliance": {"tag": "ACE"}}
+NESTED_VALUE_KEYS = ("tag", "name", "value")
+
+_SEPARATORS = re.compile(r"[\s,]*")
+
+
+def _input_name(key: str) -> str:
+    """Normalize an input key for matching against declared columns."""
+    return key.strip().lower().replace("_", " ")
+
+
+@lru_cache(maxsize=4096)
+def _nested_name(key: str, parent: str) -> Optional[str]:
+    """Map a key nested under parent to a declared column, or None."""
+    key = _input_name(key)
+    parent = _input_name(parent)
+    for candidate in (f"{key} {parent}", f"{parent} {key}"):
+        if candidate in BUSINESS_COLUMNS:
+            return candidate
+    if parent in BUSINESS_COLUMNS and key in NESTED_VALUE_KEYS:
+        return parent
+    # A bare nested metric ({"stats": {"power": 1}}) is unambiguous; a bare
+    # nested id or name usually belongs to something else, such as the alliance
+    if BUSINESS_COLUMNS.get(key) == "bigint":
+        return key
+    return None
+
+
+def _plan(record: dict, columns: Dict[str, str]) -> tuple:
+    """Split a record layout into declared scalar keys and nested objects."""
+    flat = []
+    nested = []
+    for key, value in record.items():
+        if isinstance(value, dict):
+            nested.append(key)
+        elif _input_name(key) in columns:
+            flat.append((key, _input_name(key)))
+    return tuple(flat), tuple(nested)
+
+
+def flatten_record(
+    record: dict,
+    plans: Optional[dict] = None,
+    columns: Dict[str, str] = BUSINESS_COLUMNS,
+) -> dict:
+    """
+    Project one input record onto the declared columns.
+    
+    Top-level keys win over nested keys that map to the same column.
+    
+    Args:
+        record: Parsed JSON object
+        plans: Cache of projections by key layout, shared across the records
+            of one input; records with the same keys are assumed to nest
+            the same way
+        columns: Declared columns matched by top-level keys (default:
+            BUSINESS_COLUMNS); nested keys always map to business columns
+    
+    Returns:
+        Dict of declared column -> value
+    
+    Raises:
+        ValueError: If the record is not a JSON object
+    """
+    if not isinstance(record, dict):
+        raise ValueError(f"JSON records must be objects, got: {type(record).__name__}")
+    
+    if plans is None:
+        flat_keys, nested_keys = _plan(record, columns)
+    else:
+        layout = tuple(record)
+        if layout not in plans:
+            plans[layout] = _plan(record, columns)
+        flat_keys, nested_keys = plans[layout]
+    
+    flat = {name: record[key] for key, name in flat_keys}
+    if not nested_keys:
+        return flat
+    
+    nested = {}
+    for key in nested_keys:
+        value = record[key]
+        if not isinstance(value, dict):
+            continue
+        for child, child_value in value.items():
+            name = _nested_name(child, key)
+            if name is not None and not isinstance(child_value, (dict, list)):
+                nested.setdefault(name, child_value)
+    return {**nested, **flat}
+
+
+def _iter_text(source) -> Iterator[str]:
+    """Decode a path or binary stream as UTF-8 text, one read at a time."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    stream = open(source, "rb") if not hasattr(source, "read") else source
+    try:
+        while True:
+            block = stream.read(READ_SIZE)
+            if not block:
+                break
+            text = decoder.decode(block)
+            if text:
+                yield text
+        tail = decoder.decode(b"", final=True)
+        if tail:
+            yield tail
+    finally:
+        if stream is not source:
+            stream.close()
+
+
+def _iter_array(buffer: str, chunks: Iterator[str]) -> Iterator[dict]:
+    """Parse the elements of a JSON array whose "[" is already consumed."""
+    decoder = json.JSONDecoder()
+    pos = 0
+    eof = False
+    
+    while True:
+        pos = _SEPARATORS.match(buffer, pos).end()
+        if pos < len(buffer) and buffer[pos] == "]":
+            return
+        
+        try:
+            if pos == len(buffer):
+                raise json.JSONDecodeError("Expecting value", buffer, pos)
+            record, pos = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError as e:
+            # Usually the record continues in the next read
+            if eof or len(buffer) - pos > MAX_RECORD_CHARS:
+                raise ValueError(f"Invalid JSON array: {e.msg}") from e
+            chunk = next(chunks, None)
+            if chunk is None:
+                eof = True
+            else:
+                buffer = buffer[pos:] + chunk
+                pos = 0
+            continue
+        
+        yield record
+
+
+def _iter_lines(buffer: str, chunks: Iterator[str]) -> Iterator[dict]:
+    """Parse newline-delimited JSON records."""
+    line_number = 0
+    pending = buffer
+    while True:
+        chunk = next(chunks, None)
+        lines = (pending + (chunk or "")).split("\n")
+        # The last line may continue in the next read
+        pending = lines.pop() if chunk is not None else ""
+        
+        for line in lines:
+            line_number += 1
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid JSON on line {line_number}: {e.msg}") from e
+        
+        if chunk is None:
+            return
+
+
+def iter_json_records(source) -> Iterator[dict]:
+    """
+    Parse a JSON array or newline-delimited JSON input record by record.
+    
+    Args:
+        source: Local file path or binary file-like object (e.g. an S3
+            streaming body)
+    
+    Yields:
+        Parsed records, in input order
+    
+    Raises:
+        ValueError: If the input is neither format or is malformed
+    """
+    chunks = _iter_text(source)
+    buffer = ""
+    for chunk in chunks:
+        buffer += chunk
+        if buffer.strip():
+            break
+    
+    buffer = buffer.lstrip()
+    if not buffer:
+        return
+    
+    if buffer[0] == "[":
+        yield from _iter_array(buffer[1:], chunks)
+    elif buffer[0] == "{":
+        yield from _iter_lines(buffer, chunks)
+    else:
+        raise ValueError("JSON input must be an array of records or newline-delimited records")
+
+
+def iter_json_batches(
+    source,
+    batch_rows: int = JSON_BATCH_ROWS,
+    columns: Dict[str, str] = BUSINESS_COLUMNS,
+) -> Iterator[List[dict]]:
+    """
+    Group flattened records into batches.
+    
+    Args:
+        source: Local file path or binary file-like object
+        batch_rows: Maximum records per batch
+        columns: Declared columns and types (default: BUSINESS_COLUMNS)
+    
+    Yields:
+        Lists of flattened records
+    """
+    batch = []
+    plans = {}
+    for record in iter_json_records(source):
+        batch.append(flatten_record(record, plans, columns))
+        if len(batch) >= batch_rows:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def iter_json_frames(
+    source,
+    batch_rows: int = JSON_BATCH_ROWS,
+    columns: Dict[str, str] = BUSINESS_COLUMNS,
+) -> Iterator[pd.DataFrame]:
+    """
+    Read JSON input as DataFrames typed through the declared schema.
+    
+    Args:
+        source: Local file path or binary file-like object
+        batch_rows: Maximum rows per DataFrame
+        columns: Declared columns and types (default: BUSINESS_COLUMNS)
+    
+    Yields:
+        Conformed DataFrames
+    """
+    for batch in iter_json_batches(source, batch_rows, columns):
+        yield conform_df(pd.DataFrame.from_records(batch), columns)
+
+
+def read_json_df(source, columns: Dict[str, str] = BUSINESS_COLUMNS) -> pd.DataFrame:
+    """
+    Read a whole JSON input into one DataFrame.
+    
+    Args:
+        source: Local file path or binary file-like object
+        columns: Declared columns and types (default: BUSINESS_COLUMNS)
+    
+    Returns:
+        Conformed DataFrame; empty if the input has no records
+    """
+    frames = list(iter_json_frames(source, columns=columns))
+    if not frames:
+        return pd.DataFrame()
+    if len(frames) == 1:
+        return frames[0]
+    # Columns missing from some batches come back as nulls
+    return conform_df(pd.concat(frames, ignore_index=True), columns)
@@ -0,0 +1,109 @@
+"""Physical layout of the curated Parquet files."""
+
+import os
+from dataclasses import dataclass, field
+from typing import Optional, Tuple
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+COMPRESSION_CODECS = {"snappy", "zstd", "gzip", "none"}
+
+
+@dataclass(frozen=True)
+class CuratedLayout:
+    """How curated Parquet is sorted, split into row groups, encoded and indexed.
+    
+    Sorting by a metric descending puts the top of that leaderboard in the
+    first row group, and min/max statistics plus the page index let readers
+    skip the rest for ORDER BY metric DESC LIMIT n queries.
+    """
+    
+    sort_key: Optional[str] = None
+    row_group_size: Optional[int] = None
+    compression: str = "snappy"
+    dictionary_columns: Tuple[str, ...] = field(
+        default=("alliance", "kingdom", "snapshot_date", "ingested_at", "run_id")
+    )
+    page_index: bool = True
+    
+    def __post_init__(self):
+        if self.compression not in COMPRESSION_CODECS:
+            raise ValueError(
+                f"Unsupported compression: {self.compression}. Supported: {sorted(COMPRESSION_CODECS)}"
+            )
+        if self.row_group_size is not None and self.row_group_size < 1:
+            raise ValueError(f"row_group_size must be positive, got: {self.row_group_size}")
+    
+    @classmethod
+    def from_env(cls) -> "CuratedLayout":
+        """Load the layout from CURATED_* environment variables with defaults."""
+        row_group_size = os.getenv("CURATED_ROW_GROUP_SIZE")
+        dictionary_columns = os.getenv("CURATED_DICTIONARY_COLUMNS")
+        
+        return cls(
+            sort_key=os.getenv("CURATED_SORT_KEY") or None,
+            row_group_size=int(row_group_size) if row_group_size else None,
+            compression=os.getenv("CURATED_COMPRESSION", "snappy"),
+            dictionary_columns=(
+                tuple(c.strip() for c in dictionary_columns.split(",") if c.strip())
+                if dictionary_columns is not None
+                else cls.dictionary_columns
+            ),
+            page_index=os.getenv("CURATED_PAGE_INDEX", "1") == "1",
+        )
+    
+    def writer_options(self, schema: pa.Schema) -> dict:
+        """
+        Build ParquetWriter / write_table keyword arguments for a schema.
+        
+        Args:
+            schema: Schema of the table being written
+            
+        Returns:
+            Dict of writer keyword arguments
+        """
+        return {
+            "compression": self.compression,
+            "use_dictionary": [c for c in self.dictionary_columns if c in schema.names],
+            "write_statistics": True,
+            "write_page_index": self.page_index,
+        }
+    
+    def sort(self, table: pa.Table) -> pa.Table:
+        """
+        Sort a table by the sort key, descending (nulls last).
+        
+        Args:
+            table: Table to sort
+            
+        Returns:
+            Sorted table (unchanged if no sort key is configured)
+            
+        Raises:
+            ValueError: If the sort key is not a column of the table
+        """
+        if not self.sort_key:
+            return table
+        if self.sort_key not in table.column_names:
+            raise ValueError(f"Sort key '{self.sort_key}' is not a curated column")
+        return table.sort_by([(self.sort_key, "descending")])
+
+
+def write_curated_table(table: pa.Table, sink, layout: Optional[CuratedLayout] = None) -> None:
+    """
+    Write a curated table to Parquet with the configured layout.
+    
+    Args:
+        table: Curated table
+        sink: Output path or writable file object
+        layout: Layout to apply (default: CuratedLayout.from_env())
+    """
+    layout = layout or CuratedLayout.from_env()
+    table = layout.sort(table)
+    pq.write_table(
+        table,
+        sink,
+        row_group_size=layout.row_group_size,
+        **layout.writer_options(table.schema),
+    )
@@ -0,0 +1,120 @@
+"""Precomputed leaderboard artifacts.
+
+At ingestion time the top LEADERBOARD_TOP_N rows of every metric column are
+materialized as small pre-serialized JSON documents. The leaderboard API can
+then answer any limit up to that size without running an Athena query.
+"""
+
+import json
+from typing import Dict, Optional
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from .config import LEADERBOARD_TOP_N
+from .schema import BUSINESS_COLUMNS
+
+# Every bigint business column is a leaderboard metric
+LEADERBOARD_COLUMNS = tuple(name for name, kind in BUSINESS_COLUMNS.items() if kind == "bigint")
+
+# Row fields carried next to the metric value
+LEADERBOARD_FIELDS = ("id", "name", "alliance")
+
+
+def artifact_name(column: str) -> str:
+    """
+    Get the artifact file stem for a metric column ("t4 kills" -> "t4_kills").
+    
+    Args:
+        column: Curated metric column name
+        
+    Returns:
+        File stem without extension
+    """
+    return column.replace(" ", "_")
+
+
+def top_rows(table: pa.Table, column: str, n: int) -> pa.Table:
+    """
+    Select the top n rows of a metric without fully sorting the table.
+    
+    Args:
+        table: Table with id, optional name/alliance and the metric column
+        column: Metric column
+        n: Number of rows to keep
+        
+    Returns:
+        Table with the LEADERBOARD_FIELDS present in the input plus "value",
+        ordered by value descending (nulls last), ties broken by id
+    """
+    fields = [f for f in LEADERBOARD_FIELDS if f in table.column_names]
+    subset = table.select(fields + [column]).rename_columns(fields + ["value"])
+    return _top_by_value(subset, n)
+
+
+def _top_by_value(table: pa.Table, n: int) -> pa.Table:
+    if len(table) > n:
+        table = table.take(pc.select_k_unstable(table, n, [("value", "descending")]))
+    return table.sort_by([("value", "descending"), ("id", "ascending")])
+
+
+class LeaderboardBuilder:
+    """Keep a running top-N per metric over one or more curated tables.
+    
+    Chunked ingestion feeds every chunk, so memory stays at N rows per metric
+    regardless of file size.
+    """
+    
+    def __init__(self, top_n: int = LEADERBOARD_TOP_N):
+        self.top_n = top_n
+        self._tops: Dict[str, pa.Table] = {}
+        self.run_id: Optional[str] = None
+    
+    def add(self, table: pa.Table) -> None:
+        """
+        Merge a curated table (or chunk) into the running leaderboards.
+        
+        Args:
+            table: Curated table
+        """
+        if self.run_id is None and "run_id" in table.column_names and len(table):
+            self.run_id = table["run_id"][0].as_py()
+        
+        for column in LEADERBOARD_COLUMNS:
+            if column not in table.column_names:
+                continue
+            top = top_rows(table, column, self.top_n)
+            if column in self._tops:
+                merged = pa.concat_tables([self._tops[column], top], promote_options="permissive")
+                top = _top_by_value(merged, self.top_n)
+            self._tops[column] = top
+    
+    def artifacts(self, kingdom: str, dt: str) -> Dict[str, bytes]:
+        """
+        Serialize every leaderboard as compact JSON.
+        
+        Args:
+            kingdom: Kingdom identifier
+            dt: Date string (YYYY-MM-DD)
+            
+        Returns:
+            Dict of artifact file name -> UTF-8 JSON bytes
+        """
+        result = {}
+        for column, top in self._tops.items():
+            rows = top.to_pylist()
+            for row in rows:
+                for field in LEADERBOARD_FIELDS:
+                    row.setdefault(field, None)
+            document = {
+                "kingdom": kingdom,
+                "dt": dt,
+                "column": column,
+                "run_id": self.run_id,
+                "top_n": self.top_n,
+                "rows": rows,
+            }
+            result[f"{artifact_name(column)}.json"] = json.dumps(
+                document, separators=(",", ":"), ensure_ascii=False
+            ).encode("utf-8")
+        return result
@@ -0,0 +1,18 @@
+"""Process memory reporting."""
+
+import resource
+import sys
+
+
+def peak_rss_mb() -> float:
+    """
+    Get the peak resident set size of this process so far.
+    
+    Returns:
+        Peak RSS in MiB
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and KiB on Linux
+    if sys.platform == "darwin":
+        return round(peak / (1024 * 1024), 1)
+    return round(peak / 1024, 1)
@@ -0,0 +1,131 @@
+"""Split one upload holding many kingdoms into per-kingdom snapshots.
+
+Some exports cover a whole server cluster. Uploaded under a multi-kingdom
+inbox segment (kingdom=multi or kingdom=_all, see MULTI_KINGDOMS) with a
+"kingdom" column, the file is parsed once and partitioned on that column in
+a single pass. Every kingdom is then validated, normalized and hashed on a
+thread pool; if any kingdom fails, nothing is written, so a bad row in one
+kingdom cannot leave the cluster's snapshots half-updated.
+"""
+
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from .config import MULTI_KINGDOM_WORKERS, MULTI_KINGDOMS
+from .instrumentation import StageMetrics
+from .io_local import read_input
+from .schema import MULTI_KINGDOM_COLUMNS
+
+KINGDOM_COLUMN = "kingdom"
+
+# Kingdom values become S3 key segments
+_KINGDOM_PATTERN = re.compile(r"^[A-Za-z0-9_-]+$")
+
+
+def is_multi_kingdom(kingdom: str) -> bool:
+    """Whether an inbox kingdom segment marks a multi-kingdom upload."""
+    return kingdom in MULTI_KINGDOMS
+
+
+def read_partitions(source, ext: str) -> Dict[str, pd.DataFrame]:
+    """
+    Parse a multi-kingdom input and split it by its kingdom column.
+    
+    Args:
+        source: Local file path or file-like object
+        ext: File extension without dot ("csv" or "json")
+    
+    Returns:
+        Dict of kingdom -> that kingdom's rows without the kingdom column,
+        in kingdom order
+    
+    Raises:
+        ValueError: If the kingdom column is missing, blank on some rows or
+            holds a value that cannot be a kingdom identifier
+    """
+    df = read_input(source, ext, MULTI_KINGDOM_COLUMNS)
+    df.columns = df.columns.str.lower()
+    if KINGDOM_COLUMN not in df.columns:
+        raise ValueError(f"Multi-kingdom input is missing the '{KINGDOM_COLUMN}' column")
+    
+    kingdoms = df[KINGDOM_COLUMN].astype("string").str.strip()
+    blank = int((kingdoms.isna() | (kingdoms == "")).sum())
+    if blank:
+        raise ValueError(f"Multi-kingdom input has {blank} rows without a kingdom")
+    
+    # One hash pass over the column gives every kingdom's row positions
+    positions = kingdoms.groupby(kingdoms, sort=True).indices
+    invalid = [k for k in positions if not _KINGDOM_PATTERN.match(k) or is_multi_kingdom(k)]
+    if invalid:
+        raise ValueError(f"Invalid kingdom values in multi-kingdom input: {invalid[:10]}")
+    
+    df = df.drop(columns=KINGDOM_COLUMN)
+    return {
+        kingdom: df.take(rows).reset_index(drop=True)
+        for kingdom, rows in positions.items()
+    }
+
+
+def map_kingdoms(func: Callable, kingdoms: Iterable[str], max_workers: int = MULTI_KINGDOM_WORKERS) -> List:
+    """
+    Run func(kingdom) for every kingdom on a bounded thread pool.
+    
+    Args:
+        func: Called once per kingdom
+        kingdoms: Kingdom identifiers
+        max_workers: Upper bound on concurrent calls
+    
+    Returns:
+        Results in kingdom order
+    
+    Raises:
+        Exception: The first failure, once every call has finished
+    """
+    kingdoms = list(kingdoms)
+    if len(kingdoms) <= 1 or max_workers <= 1:
+        return [func(kingdom) for kingdom in kingdoms]
+    
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(kingdoms))) as pool:
+        return list(pool.map(func, kingdoms))
+
+
+def build_partitions(
+    parts: Dict[str, pd.DataFrame],
+    dt: str,
+    run_id: str,
+    metrics: Optional[StageMetrics] = None,
+    max_workers: int = MULTI_KINGDOM_WORKERS,
+) -> Dict[str, pd.DataFrame]:
+    """
+    Validate, normalize and hash every kingdom of a multi-kingdom input.
+    
+    Args:
+        parts: Dict of kingdom -> parsed rows, from read_partitions
+        dt: Date string (YYYY-MM-DD)
+        run_id: Run identifier stamped on every row
+        metrics: Receives validate and hash stage timings, summed over
+            kingdoms (default: disabled)
+        max_workers: Kingdoms processed concurrently
+    
+    Returns:
+        Dict of kingdom -> curated DataFrame, in kingdom order
+    
+    Raises:
+        ValueError: Listing every kingdom that failed validation
+    """
+    from .handler import build_curated_df
+    
+    def build(kingdom):
+        try:
+            return build_curated_df(parts[kingdom], kingdom, dt, run_id, metrics), None
+        except ValueError as e:
+            return None, f"kingdom {kingdom}: {e}"
+    
+    results = map_kingdoms(build, parts, max_workers)
+    errors = [error for _, error in results if error is not None]
+    if errors:
+        raise ValueError(f"Multi-kingdom input failed validation for {len(errors)} kingdoms: " + "; ".join(errors))
+    return {kingdom: df for kingdom, (df, _) in zip(parts, results)}
@@ -2,6 +2,52 @@
 
 import re
 from pathlib import Path
+from typing import Optional, Tuple
+
+from .config import ALLOWED_COMPRESSIONS, ALLOWED_EXTENSIONS, COMPRESSION_SUFFIXES
+
+
+def parse_filename(filename: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Split an input filename into its format and compression.
+    
+    Examples:
+        players.csv -> ("csv", None)
+        players.csv.gz -> ("csv", "gzip")
+        players.zip -> (None, "zip"), the format comes from the archive member
+    
+    Args:
+        filename: Input filename
+    
+    Returns:
+        Tuple of (ext, compression); ext is None only for a zip archive
+        whose name does not give the format
+    
+    Raises:
+        ValueError: If the extension or compression is not supported
+    """
+    suffixes = [s.lstrip(".").lower() for s in Path(filename).suffixes]
+    if not suffixes:
+        raise ValueError(f"Filename must have an extension: {filename}")
+    
+    compression = None
+    if suffixes[-1] in COMPRESSION_SUFFIXES:
+        suffix = suffixes.pop()
+        if suffix not in ALLOWED_COMPRESSIONS:
+            raise ValueError(
+                f"Unsupported compression (must be one of {sorted(ALLOWED_COMPRESSIONS)}): {suffix}"
+            )
+        compression = COMPRESSION_SUFFIXES[suffix]
+    
+    ext = suffixes[-1] if suffixes else None
+    if compression == "zip" and ext not in ALLOWED_EXTENSIONS:
+        return None, compression
+    
+    if ext not in ALLOWED_EXTENSIONS:
+        raise ValueError(
+            f"Unsupported file extension (must be one of {sorted(ALLOWED_EXTENSIONS)}): {ext}"
+        )
+    return ext, compression
 
 
 def parse_inbox_key(key: str) -> dict:
@@ -18,7 +64,8 @@ def parse_inbox_key(key: str) -> dict:
         key: S3 key string to parse
     
     Returns:
-        Dictionary with keys: source, kingdom, dt, filename, ext
+        Dictionary with keys: source, kingdom, dt, filename, ext and
+        compression (see parse_filename)
     
     Raises:
         ValueError: If key format is invalid, dt format is wrong, or extension unsupported
@@ -55,15 +102,7 @@ def parse_inbox_key(key: str) -> dict:
     if not filename:
         raise ValueError(f"Key must end with a filename: {key}")
     
-    path_obj = Path(filename)
-    ext = path_obj.suffix.lstrip(".").lower()
-    
-    if not ext:
-        raise ValueError(f"Filename must have an extension: {filename}")
-    
-    # Validate extension is csv or json
-    if ext not in ("csv", "json"):
-        raise ValueError(f"Unsupported file extension (must be csv or json): {ext}")
+    ext, compression = parse_filename(filename)
     
     return {
         "source": segments["source"],
@@ -71,9 +110,39 @@ def parse_inbox_key(key: str) -> dict:
         "dt": dt,
         "filename": filename,
         "ext": ext,
+        "compression": compression,
     }
 
 
+def parse_raw_key(key: str) -> dict:
+    """
+    Parse a raw-tier key written by build_raw_key.
+    
+    Expected format:
+        raw/source=<source>/kingdom=<kingdom>/dt=<dt>/run_ts=<run_ts>/<filename>
+    
+    Args:
+        key: S3 key (or path relative to a local out_dir) to parse
+    
+    Returns:
+        Dictionary with keys: source, kingdom, dt, run_ts, filename, ext, compression
+    
+    Raises:
+        ValueError: If the key is not a valid raw-tier key
+    """
+    if not key.startswith("raw/"):
+        raise ValueError(f"Key must start with 'raw/', got: {key}")
+    
+    run_ts = [part.split("=", 1)[1] for part in key.split("/") if part.startswith("run_ts=")]
+    if not run_ts or not run_ts[0]:
+        raise ValueError(f"Key missing 'run_ts=' segment: {key}")
+    
+    # Apart from run_ts the layout matches the inbox, so share its validation
+    info = parse_inbox_key("inbox/" + key[len("raw/"):])
+    info["run_ts"] = run_ts[0]
+    return info
+
+
 def build_raw_key(source: str, kingdom: str, dt: str, run_ts: str, filename: str) -> str:
     """
     Build an S3 key for the raw storage tier.
@@ -116,3 +185,117 @@ def build_curated_key(source: str, kingdom: str, dt: str) -> str:
         S3 key string
     """
     return f"curated/source={source}/kingdom={kingdom}/dt={dt}/players.parquet"
+
+
+def build_leaderboard_key(source: str, kingdom: str, dt: str, filename: str) -> str:
+    """
+    Build an S3 key for a precomputed leaderboard artifact.
+    
+    Artifacts live under their own prefix rather than in the curated partition,
+    because Athena reads every object under the table location as Parquet.
+    
+    Format:
+        leaderboards/source=<source>/kingdom=<kingdom>/dt=<dt>/<filename>
+    
+    Args:
+        source: Source name (e.g., "rok_players")
+        kingdom: Kingdom identifier (e.g., "51")
+        dt: Date in YYYY-MM-DD format
+        filename: Artifact file name (e.g., "power.json")
+    
+    Returns:
+        S3 key string
+    """
+    return f"leaderboards/source={source}/kingdom={kingdom}/dt={dt}/{filename}"
+
+
+def build_catalog_key(source: str, kingdom: str) -> str:
+    """
+    Build the S3 key of a kingdom's snapshot catalog manifest.
+    
+    Format:
+        catalog/source=<source>/kingdom=<kingdom>/snapshots.json
+    
+    Args:
+        source: Source name (e.g., "rok_players")
+        kingdom: Kingdom identifier (e.g., "51")
+    
+    Returns:
+        S3 key string
+    """
+    return f"catalog/source={source}/kingdom={kingdom}/snapshots.json"
+
+
+def build_delta_key(source: str, kingdom: str, dt: str) -> str:
+    """
+    Build an S3 key for a snapshot's delta against the previous snapshot.
+    
+    Format:
+        deltas/source=<source>/kingdom=<kingdom>/dt=<dt>/players_delta.parquet
+    
+    Args:
+        source: Source name (e.g., "rok_players")
+        kingdom: Kingdom identifier (e.g., "51")
+        dt: Date in YYYY-MM-DD format
+    
+    Returns:
+        S3 key string
+    """
+    return f"deltas/source={source}/kingdom={kingdom}/dt={dt}/players_delta.parquet"
+
+
+def build_registry_key(source: str, kingdom: str, dt: str, digest: str) -> str:
+    """
+    Build an S3 key in the idempotency registry of ingested inputs.
+    
+    Format:
+        registry/source=<source>/kingdom=<kingdom>/dt=<dt>/<digest>.json
+    
+    Args:
+        source: Source name (e.g., "rok_players")
+        kingdom: Kingdom identifier (e.g., "51")
+        dt: Date in YYYY-MM-DD format
+        digest: Hex digest of the input fingerprint
+    
+    Returns:
+        S3 key string
+    """
+    return f"registry/source={source}/kingdom={kingdom}/dt={dt}/{digest}.json"
+
+
+def build_history_key(source: str, kingdom: str) -> str:
+    """
+    Build the S3 key of a kingdom's player history dataset.
+    
+    Format:
+        history/source=<source>/kingdom=<kingdom>/players_history.parquet
+    
+    Args:
+        source: Source name (e.g., "rok_players")
+        kingdom: Kingdom identifier (e.g., "51")
+    
+    Returns:
+        S3 key string
+    """
+    return f"history/source={source}/kingdom={kingdom}/players_history.parquet"
+
+
+def build_serving_store_key(source: str, kingdom: str, run_ts: str, run_id: str) -> str:
+    """
+    Build the S3 key of one version of a kingdom's SQLite serving store.
+    
+    Versions are immutable; the kingdom's catalog names the current one.
+    
+    Format:
+        serving/source=<source>/kingdom=<kingdom>/store_<run_ts>_<run_id>.sqlite
+    
+    Args:
+        source: Source name (e.g., "rok_players")
+        kingdom: Kingdom identifier (e.g., "51")
+        run_ts: Run timestamp of the build (e.g., "20260126T153012Z")
+        run_id: Run identifier of the build
+    
+    Returns:
+        S3 key string
+    """
+    return f"serving/source={source}/kingdom={kingdom}/store_{run_ts}_{run_id}.sqlite"
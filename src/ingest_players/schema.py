@@ -0,0 +1,290 @@
+"""Declared schema of the curated rok_players dataset.
+
+This is the single definition of the curated columns and their types. It
+drives typed, projected reads in both ingestion engines, and
+tests/test_schema.py checks it against
+infra/athena/create_table_rok_players.sql. Columns not declared here are
+skipped at parse time.
+"""
+
+import csv
+import io
+import re
+from typing import Dict, List
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+
+# Business columns as they appear (lowercased) in uploads, with Athena types
+BUSINESS_COLUMNS: Dict[str, str] = {
+    "id": "string",
+    "name": "string",
+    "power": "bigint",
+    "killpoints": "bigint",
+    "deads": "bigint",
+    "t1 kills": "bigint",
+    "t2 kills": "bigint",
+    "t3 kills": "bigint",
+    "t4 kills": "bigint",
+    "t5 kills": "bigint",
+    "total kills": "bigint",
+    "t45 kills": "bigint",
+    "ranged": "bigint",
+    "rss gathered": "bigint",
+    "rss assistance": "bigint",
+    "helps": "bigint",
+    "alliance": "string",
+}
+
+# Columns added during ingestion and stored in the Parquet files
+METADATA_COLUMNS: Dict[str, str] = {
+    "snapshot_date": "string",
+    "ingested_at": "string",
+    "run_id": "string",
+    "record_hash": "string",
+}
+
+# Hive partition columns (taken from the S3 key, not the file)
+PARTITION_COLUMNS: Dict[str, str] = {
+    "kingdom": "string",
+    "dt": "string",
+}
+
+# Columns read from a multi-kingdom upload, which names each row's kingdom
+MULTI_KINGDOM_COLUMNS: Dict[str, str] = {**BUSINESS_COLUMNS, "kingdom": "string"}
+
+# Nullable Int64 keeps blank metric cells from turning a column into float64.
+# pandas' Int64 CSV converter is several times slower than its inferred
+# numeric parse, so bigint columns are parsed untyped and cast afterwards.
+_PANDAS_DTYPES = {"string": str, "bigint": "Int64"}
+_PANDAS_READ_DTYPES = {"string": str}
+
+# Arrow reads bigint cells as double so exports that write "1500.0" still
+# parse; conform_table then casts back to int64 and rejects fractional values
+_ARROW_READ_TYPES = {"string": pa.string(), "bigint": pa.float64()}
+ARROW_TYPES = {"string": pa.string(), "bigint": pa.int64()}
+
+
+def project_columns(names: List[str], columns: Dict[str, str] = BUSINESS_COLUMNS) -> Dict[str, str]:
+    """
+    Map the input's column names to declared columns, case-insensitively.
+    
+    Args:
+        names: Column names as they appear in the input
+        columns: Declared columns and types (default: BUSINESS_COLUMNS)
+        
+    Returns:
+        Dict of input name -> declared (lowercase) name, for declared columns only
+    """
+    return {name: name.lower() for name in names if name.lower() in columns}
+
+
+def pandas_read_options(header: List[str], columns: Dict[str, str] = BUSINESS_COLUMNS) -> dict:
+    """
+    Build pd.read_csv keyword arguments that project and type the columns.
+    
+    Only string columns are typed at parse time; conform_df casts the
+    bigint columns.
+    
+    Args:
+        header: Column names from the CSV header
+        columns: Declared columns and types (default: BUSINESS_COLUMNS)
+        
+    Returns:
+        Dict with usecols and dtype
+    """
+    projected = project_columns(header, columns)
+    return {
+        "usecols": list(projected),
+        "dtype": {
+            name: _PANDAS_READ_DTYPES[columns[lower]]
+            for name, lower in projected.items()
+            if columns[lower] in _PANDAS_READ_DTYPES
+        },
+    }
+
+
+def read_csv_typed(source, chunksize: int = 0, columns: Dict[str, str] = BUSINESS_COLUMNS):
+    """
+    Read CSV through the declared schema with pandas.
+    
+    Args:
+        source: Local file path or file-like object
+        chunksize: Yield DataFrames of this many rows instead of one frame
+        columns: Declared columns and types (default: BUSINESS_COLUMNS)
+        
+    Returns:
+        DataFrame, or an iterator of DataFrames when chunksize is given
+        
+    Raises:
+        ValueError: If a bigint column holds non-integer values
+    """
+    header, source = read_csv_header(source)
+    options = pandas_read_options(header, columns)
+    if chunksize:
+        return _iter_conformed(pd.read_csv(source, chunksize=chunksize, **options), columns)
+    return conform_df(pd.read_csv(source, **options), columns)
+
+
+def _iter_conformed(reader, columns: Dict[str, str]):
+    """Conform every chunk of a read_csv chunk reader."""
+    with reader:
+        for chunk in reader:
+            yield conform_df(chunk, columns)
+
+
+def arrow_convert_options(header: List[str]) -> pa_csv.ConvertOptions:
+    """
+    Build Arrow CSV convert options that project and type the columns.
+    
+    Args:
+        header: Column names from the CSV header
+        
+    Returns:
+        ConvertOptions with include_columns and column_types
+    """
+    projected = project_columns(header)
+    return pa_csv.ConvertOptions(
+        include_columns=list(projected),
+        column_types={name: _ARROW_READ_TYPES[BUSINESS_COLUMNS[lower]] for name, lower in projected.items()},
+        strings_can_be_null=True,
+    )
+
+
+def conform_df(df: pd.DataFrame, columns: Dict[str, str] = BUSINESS_COLUMNS) -> pd.DataFrame:
+    """
+    Project and cast an already parsed DataFrame to the schema.
+    
+    Args:
+        df: Parsed input DataFrame
+        columns: Declared columns and types (default: BUSINESS_COLUMNS)
+        
+    Returns:
+        DataFrame with only declared columns, cast to declared types
+        
+    Raises:
+        ValueError: If a bigint column holds non-integer values
+    """
+    projected = project_columns(list(df.columns), columns)
+    df = df[list(projected)]
+    
+    casts = {}
+    for name, lower in projected.items():
+        dtype = _PANDAS_DTYPES[columns[lower]]
+        if dtype is str:
+            # One dtype whatever the chunk holds (an all-null JSON chunk is
+            # object with None), with missing values kept as NA
+            if not isinstance(df[name].dtype, pd.StringDtype):
+                casts[name] = df[name].astype("string")
+        elif df[name].dtype != dtype:
+            casts[name] = _to_int64(df[name], name)
+    return df.assign(**casts)
+
+
+def _to_int64(series: pd.Series, name: str) -> pd.Series:
+    """Cast a column to nullable Int64, rejecting fractional values."""
+    try:
+        return pd.to_numeric(series).astype("Int64")
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Column '{name}' must contain whole numbers: {e}") from e
+
+
+def conform_table(table: pa.Table) -> pa.Table:
+    """
+    Project and cast an Arrow table to the declared schema.
+    
+    Args:
+        table: Parsed input table
+        
+    Returns:
+        Table with only declared columns, cast to declared types
+        
+    Raises:
+        ValueError: If a bigint column holds non-integer values
+    """
+    projected = project_columns(table.column_names)
+    table = table.select(list(projected))
+    
+    for i, (name, lower) in enumerate(projected.items()):
+        target = ARROW_TYPES[BUSINESS_COLUMNS[lower]]
+        column = table.column(i)
+        if column.type == target:
+            continue
+        try:
+            if pa.types.is_integer(target) and pa.types.is_string(column.type):
+                column = column.cast(pa.float64())
+            # Safe casts reject fractional values instead of truncating them
+            column = column.cast(target)
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError) as e:
+            raise ValueError(f"Column '{name}' must contain whole numbers: {e}") from e
+        table = table.set_column(i, name, column)
+    
+    return table
+
+
+def read_csv_header(source):
+    """
+    Read the CSV header without losing it from a forward-only stream.
+    
+    Args:
+        source: Local file path or file-like object
+        
+    Returns:
+        Tuple of (column names, source to pass to the parser). For streams,
+        the returned source replays the bytes consumed to find the header.
+    """
+    if not hasattr(source, "read"):
+        with open(source, "r", encoding="utf-8-sig", newline="") as f:
+            return next(csv.reader(f), []), source
+    
+    prefix = b""
+    while b"\n" not in prefix:
+        block = source.read(64 * 1024)
+        if not block:
+            break
+        prefix += block
+    
+    first_line = prefix.split(b"\n", 1)[0].decode("utf-8-sig")
+    header = next(csv.reader([first_line]), [])
+    return header, io.BufferedReader(_PrefixedStream(prefix, source))
+
+
+class _PrefixedStream(io.RawIOBase):
+    """Readable stream that yields already consumed bytes before the rest."""
+    
+    def __init__(self, prefix: bytes, stream):
+        super().__init__()
+        self._prefix = prefix
+        self._stream = stream
+    
+    def readable(self) -> bool:
+        return True
+    
+    def readinto(self, buffer) -> int:
+        if self._prefix:
+            n = min(len(buffer), len(self._prefix))
+            buffer[:n] = self._prefix[:n]
+            self._prefix = self._prefix[n:]
+            return n
+        data = self._stream.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+
+def parse_ddl_columns(ddl: str) -> Dict[str, str]:
+    """
+    Extract column names and types from a CREATE EXTERNAL TABLE statement.
+    
+    Both the column list and the PARTITIONED BY list are included.
+    
+    Args:
+        ddl: Athena DDL text
+        
+    Returns:
+        Dict of column name -> lowercase Athena type
+    """
+    columns = {}
+    for match in re.finditer(r"^\s*(`[^`]+`|\w+)\s+(STRING|BIGINT|DOUBLE|INT|BOOLEAN)\s*,?\s*$", ddl, re.M | re.I):
+        columns[match.group(1).strip("`")] = match.group(2).lower()
+    return columns
@@ -0,0 +1,363 @@
+"""Per-kingdom SQLite serving store materialized from the player history.
+
+Each ingestion that updates a kingdom's player history also writes one small
+SQLite file holding everything the API serves for that kingdom:
+
+- snapshots: the catalog listing (dt, rows, run_id)
+- leaderboard: the top LEADERBOARD_TOP_N rows of every metric per snapshot,
+  clustered on (dt, metric, rank)
+- players: every player's row per snapshot, clustered on (id, dt)
+
+A store is immutable: every build gets a new versioned key and the kingdom's
+catalog manifest names the current one. The API downloads a version once per
+container and answers from local index lookups instead of Athena.
+"""
+
+import os
+import sqlite3
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Optional
+from uuid import uuid4
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from .aws_s3 import delete_s3_object, get_s3_object_stream, list_s3_keys, upload_bytes_to_s3
+from .catalog import (
+    merge_snapshot,
+    read_local_catalog,
+    read_s3_catalog,
+    update_local_catalog,
+    update_s3_catalog,
+)
+from .config import LEADERBOARD_TOP_N
+from .history import HISTORY_COLUMNS
+from .leaderboards import LEADERBOARD_COLUMNS, artifact_name, top_rows
+from .s3_paths import build_history_key, build_serving_store_key
+
+# Bumped when the tables change; the API skips stores of another format
+SERVING_STORE_FORMAT = 1
+
+# History columns stored per player and snapshot
+PLAYER_COLUMNS = tuple(c for c in HISTORY_COLUMNS if c not in ("id", "snapshot_date"))
+
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL) WITHOUT ROWID;
+CREATE TABLE snapshots (
+    dt TEXT PRIMARY KEY,
+    rows INTEGER NOT NULL,
+    run_id TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE leaderboard (
+    dt TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    rank INTEGER NOT NULL,
+    id TEXT NOT NULL,
+    name TEXT,
+    value INTEGER,
+    PRIMARY KEY (dt, metric, rank)
+) WITHOUT ROWID;
+"""
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _players_ddl() -> str:
+    columns = ", ".join(
+        f"{_quote(c)} {'TEXT' if c in ('name', 'alliance') else 'INTEGER'}" for c in PLAYER_COLUMNS
+    )
+    return f"CREATE TABLE players (id TEXT NOT NULL, dt TEXT NOT NULL, {columns}, PRIMARY KEY (id, dt)) WITHOUT ROWID"
+
+
+def _column(table: pa.Table, name: str, kind: pa.DataType) -> pa.Array:
+    """A column of the table, or nulls if no snapshot had it."""
+    if name in table.column_names:
+        return table.column(name)
+    return pa.nulls(len(table), kind)
+
+
+def build_serving_store(path: str, history: pa.Table, snapshots: List[dict], top_n: int = LEADERBOARD_TOP_N) -> dict:
+    """
+    Write a serving store for one kingdom.
+    
+    Args:
+        path: Output SQLite file; must not exist
+        history: Kingdom's player history (see history.merge_history)
+        snapshots: Catalog entries of the kingdom's snapshots
+        top_n: Leaderboard rows kept per metric and snapshot
+    
+    Returns:
+        Dict with snapshots, players and leaderboard row counts
+    """
+    conn = sqlite3.connect(path)
+    try:
+        # A half-written file is discarded, so skip the journal
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.executescript(SCHEMA)
+        conn.execute(_players_ddl())
+        
+        conn.executemany(
+            "INSERT INTO meta VALUES (?, ?)",
+            [
+                ("format", str(SERVING_STORE_FORMAT)),
+                ("top_n", str(top_n)),
+                ("built_at", datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")),
+            ],
+        )
+        conn.executemany(
+            "INSERT INTO snapshots VALUES (?, ?, ?)",
+            [(s["dt"], s["rows"], s["run_id"]) for s in snapshots],
+        )
+        
+        columns = [history.column("id"), history.column("snapshot_date")] + [
+            _column(history, c, pa.string() if c in ("name", "alliance") else pa.int64())
+            for c in PLAYER_COLUMNS
+        ]
+        placeholders = ", ".join("?" * len(columns))
+        conn.executemany(
+            f"INSERT INTO players VALUES ({placeholders})",
+            zip(*(c.to_pylist() for c in columns)),
+        )
+        
+        leaderboard_rows = 0
+        for dt in pc.unique(history.column("snapshot_date")).to_pylist():
+            snapshot = history.filter(pc.equal(history.column("snapshot_date"), dt))
+            for column in LEADERBOARD_COLUMNS:
+                if column not in snapshot.column_names:
+                    snapshot = snapshot.append_column(column, pa.nulls(len(snapshot), pa.int64()))
+                top = top_rows(snapshot, column, top_n)
+                names = _column(top, "name", pa.string()).to_pylist()
+                conn.executemany(
+                    "INSERT INTO leaderboard VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        (dt, artifact_name(column), rank, player_id, name or None, value)
+                        for rank, (player_id, name, value) in enumerate(
+                            zip(top.column("id").to_pylist(), names, top.column("value").to_pylist()), 1
+                        )
+                    ),
+                )
+                leaderboard_rows += len(top)
+        
+        conn.commit()
+    finally:
+        conn.close()
+    
+    return {"snapshots": len(snapshots), "players": len(history), "leaderboard": leaderboard_rows}
+
+
+def _build_bytes(history: pa.Table, snapshots: List[dict]) -> bytes:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "store.sqlite")
+        build_serving_store(path, history, snapshots)
+        with open(path, "rb") as f:
+            return f.read()
+
+
+def serving_pointer(key: str, run_ts: str, data: bytes, snapshots: List[dict]) -> dict:
+    """
+    Build the catalog's pointer to a serving store version.
+    
+    Args:
+        key: Key or path of the store
+        run_ts: Run timestamp of the build, orders versions
+        data: Store file bytes
+        snapshots: Catalog entries the store holds
+    
+    Returns:
+        Pointer dict for catalog.merge_snapshot
+    """
+    return {
+        "key": key,
+        "run_ts": run_ts,
+        "format": SERVING_STORE_FORMAT,
+        "bytes": len(data),
+        "snapshots": len(snapshots),
+    }
+
+
+def publish_s3_serving_store(
+    bucket: str,
+    source: str,
+    kingdom: str,
+    history: pa.Table,
+    run_id: str,
+    run_ts: str,
+    entry: Optional[dict] = None,
+) -> dict:
+    """
+    Build a kingdom's serving store and upload it as a new version.
+    
+    The catalog is not changed here; the caller records the returned pointer
+    with its catalog update, after which the version is served.
+    
+    Args:
+        bucket: S3 bucket name
+        source: Source name
+        kingdom: Kingdom identifier
+        history: Kingdom's player history, including the new snapshot
+        run_id: Run identifier of the build
+        run_ts: Run timestamp of the build
+        entry: Catalog entry of a snapshot not yet in the catalog
+    
+    Returns:
+        Pointer dict from serving_pointer
+    """
+    document = read_s3_catalog(bucket, source, kingdom)
+    if entry is not None:
+        document = merge_snapshot(document, source, kingdom, entry)
+    snapshots = (document or {}).get("snapshots", [])
+    
+    key = build_serving_store_key(source, kingdom, run_ts, run_id)
+    data = _build_bytes(history, snapshots)
+    upload_bytes_to_s3(data, bucket, key)
+    return serving_pointer(key, run_ts, data, snapshots)
+
+
+def publish_local_serving_store(
+    out_dir: str,
+    kingdom: str,
+    history: pa.Table,
+    run_id: str,
+    run_ts: str,
+    entry: Optional[dict] = None,
+) -> dict:
+    """
+    Local counterpart of publish_s3_serving_store.
+    
+    Args:
+        out_dir: Local output root
+        kingdom: Kingdom identifier
+        history: Kingdom's player history, including the new snapshot
+        run_id: Run identifier of the build
+        run_ts: Run timestamp of the build
+        entry: Catalog entry of a snapshot not yet in the catalog
+    
+    Returns:
+        Pointer dict from serving_pointer, with the file path as key
+    """
+    document = read_local_catalog(out_dir, "rok_players", kingdom)
+    if entry is not None:
+        document = merge_snapshot(document, "rok_players", kingdom, entry)
+    snapshots = (document or {}).get("snapshots", [])
+    
+    path = Path(out_dir) / build_serving_store_key("rok_players", kingdom, run_ts, run_id)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = _build_bytes(history, snapshots)
+    path.write_bytes(data)
+    return serving_pointer(str(path), run_ts, data, snapshots)
+
+
+def _older_versions(keys: List[str], serving: dict) -> List[str]:
+    """
+    Select the store versions that are safe to delete.
+    
+    A version whose run_ts is not older than the current one may belong to
+    a concurrent ingestion that has uploaded it but not yet committed it to
+    the catalog, so it is kept along with the current and previous versions.
+    """
+    keep = {serving["key"], serving.get("previous_key")}
+    older = []
+    for key in keys:
+        # store_{run_ts}_{run_id}.sqlite, see build_serving_store_key
+        run_ts = os.path.basename(key)[len("store_"):].split("_", 1)[0]
+        if key not in keep and run_ts < serving["run_ts"]:
+            older.append(key)
+    return older
+
+
+def prune_s3_serving_stores(bucket: str, source: str, kingdom: str, serving: Optional[dict]) -> List[str]:
+    """
+    Delete store versions older than the one the catalog points at.
+    
+    The previous version is kept, since containers holding a catalog read
+    before the swap may still download it. Newer versions are kept too; a
+    concurrent ingestion may not have committed its pointer yet.
+    
+    Args:
+        bucket: S3 bucket name
+        source: Source name
+        kingdom: Kingdom identifier
+        serving: The catalog's current pointer
+    
+    Returns:
+        Deleted keys
+    """
+    if not serving:
+        return []
+    
+    prefix = serving["key"].rsplit("/", 1)[0] + "/"
+    deleted = _older_versions([key for key, _ in list_s3_keys(bucket, prefix)], serving)
+    for key in deleted:
+        delete_s3_object(bucket, key)
+    return deleted
+
+
+def prune_local_serving_stores(out_dir: str, kingdom: str, serving: Optional[dict]) -> List[str]:
+    """
+    Local counterpart of prune_s3_serving_stores.
+    
+    Args:
+        out_dir: Local output root
+        kingdom: Kingdom identifier
+        serving: The catalog's current pointer
+    
+    Returns:
+        Deleted paths
+    """
+    if not serving:
+        return []
+    
+    directory = Path(serving["key"]).parent
+    deleted = _older_versions([str(p) for p in directory.glob("*.sqlite")], serving)
+    for path in deleted:
+        os.remove(path)
+    return deleted
+
+
+def rebuild_s3_serving_store(bucket: str, source: str, kingdom: str) -> dict:
+    """
+    Rebuild a kingdom's serving store from its S3 history and point the catalog at it.
+    
+    Used after a backfill, whose replays skip the history and the store.
+    
+    Args:
+        bucket: S3 bucket name
+        source: Source name
+        kingdom: Kingdom identifier
+    
+    Returns:
+        Pointer dict of the new version
+    """
+    history = pq.read_table(pa.BufferReader(get_s3_object_stream(bucket, build_history_key(source, kingdom)).read()))
+    run_ts = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    
+    pointer = publish_s3_serving_store(bucket, source, kingdom, history, str(uuid4()), run_ts)
+    document = update_s3_catalog(bucket, source, kingdom, None, serving=pointer)
+    prune_s3_serving_stores(bucket, source, kingdom, document.get("serving"))
+    return pointer
+
+
+def rebuild_local_serving_store(out_dir: str, kingdom: str) -> dict:
+    """
+    Local counterpart of rebuild_s3_serving_store.
+    
+    Args:
+        out_dir: Local output root
+        kingdom: Kingdom identifier
+    
+    Returns:
+        Pointer dict of the new version
+    """
+    history = pq.read_table(Path(out_dir) / build_history_key("rok_players", kingdom))
+    run_ts = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    
+    pointer = publish_local_serving_store(out_dir, kingdom, history, str(uuid4()), run_ts)
+    document = update_local_catalog(out_dir, "rok_players", kingdom, None, serving=pointer)
+    prune_local_serving_stores(out_dir, kingdom, document.get("serving"))
+    return pointer
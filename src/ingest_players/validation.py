@@ -48,3 +48,24 @@ def validate_unique_id(df: pd.DataFrame) -> None:
             f"id column contains duplicate values. "
             f"Examples: {list(duplicate_ids)}"
         )
+
+
+def validate_unique_id_across_chunks(df: pd.DataFrame, seen_ids: set) -> None:
+    """
+    Validate that no id in this chunk appeared in an earlier chunk.
+    
+    Args:
+        df: Normalized chunk (id already a stripped string)
+        seen_ids: ids from earlier chunks, updated in place
+        
+    Raises:
+        ValueError: If an id repeats across chunks
+    """
+    ids = df["id"].tolist()
+    repeated = seen_ids.intersection(ids)
+    if repeated:
+        raise ValueError(
+            f"id column contains duplicate values. "
+            f"Examples: {sorted(repeated)[:5]}"
+        )
+    seen_ids.update(ids)
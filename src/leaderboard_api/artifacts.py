@@ -0,0 +1,67 @@
+"""Precomputed leaderboard artifacts written by the ingestion pipeline."""
+
+import json
+from typing import Any, Dict, List, Optional
+
+from botocore.exceptions import ClientError
+
+from clients import get_client
+
+
+def artifact_key(source: str, kingdom: str, dt: str, metric: str) -> str:
+    """Build the S3 key of a leaderboard artifact.
+    
+    Must match ingest_players.s3_paths.build_leaderboard_key.
+    
+    Args:
+        source: Source name (e.g. "rok_players")
+        kingdom: Kingdom ID (already validated)
+        dt: Date string (already validated, not "latest")
+        metric: Metric key (e.g. "t4_kills")
+        
+    Returns:
+        S3 object key
+    """
+    return f"leaderboards/source={source}/kingdom={kingdom}/dt={dt}/{metric}.json"
+
+
+def get_artifact_rows(
+    bucket: str,
+    source: str,
+    kingdom: str,
+    dt: str,
+    metric: str,
+    limit: int
+) -> Optional[List[Dict[str, Any]]]:
+    """Read the top rows of a metric from its precomputed artifact.
+    
+    Args:
+        bucket: Data bucket name
+        source: Source name
+        kingdom: Kingdom ID
+        dt: Concrete snapshot date
+        metric: Metric key
+        limit: Number of rows to return
+        
+    Returns:
+        Up to limit {id, name, value} rows ordered by value, or None if no
+        artifact exists or it holds fewer rows than requested while the
+        snapshot may have more
+    """
+    try:
+        response = get_client("s3").get_object(Bucket=bucket, Key=artifact_key(source, kingdom, dt, metric))
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") in ("NoSuchKey", "404"):
+            return None
+        raise
+    
+    document = json.loads(response["Body"].read())
+    rows = document["rows"]
+    
+    # A full artifact was truncated at top_n, so it cannot answer a larger limit
+    if limit > len(rows) and len(rows) >= document["top_n"]:
+        return None
+    
+    # Artifacts also hold alliance; responses keep the {id, name, value} rows
+    # of every other source, with empty names as null like Athena returns them
+    return [{"id": r["id"], "name": r.get("name") or None, "value": r["value"]} for r in rows[:limit]]
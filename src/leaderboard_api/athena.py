@@ -1,8 +1,11 @@
 """Athena query execution and result processing."""
 
+import random
 import time
-from typing import Dict, List, Any, Optional
-import boto3
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from clients import get_client
 
 
 def start_query(sql: str, database: str, results_s3: str, region: str) -> str:
@@ -20,7 +23,7 @@ def start_query(sql: str, database: str, results_s3: str, region: str) -> str:
     Raises:
         Exception: If query fails to start
     """
-    athena = boto3.client("athena", region_name=region)
+    athena = get_client("athena", region)
     
     response = athena.start_query_execution(
         QueryString=sql,
@@ -31,13 +34,86 @@ def start_query(sql: str, database: str, results_s3: str, region: str) -> str:
     return response['QueryExecutionId']
 
 
-def wait_for_query(qid: str, region: str, timeout_seconds: int = 30) -> Dict[str, Any]:
+@dataclass(frozen=True)
+class PollPolicy:
+    """Delays between get_query_execution calls while waiting for a query.
+    
+    Leaderboard queries usually finish in one to three seconds, so polls
+    start 100 ms apart and back off only to max_delay; completion is noticed
+    within a few hundred ms instead of up to a second late. Jitter keeps
+    concurrent containers from polling in lockstep. The defaults were picked
+    with benchmarks/bench_athena_polling.py.
+    """
+    
+    first_delay: float = 0.1
+    max_delay: float = 0.3
+    multiplier: float = 1.2
+    jitter: float = 0.2
+    
+    def delay(self, attempt: int, rng: Callable[[], float] = random.random) -> float:
+        """Seconds to sleep before poll number attempt + 1 (attempt counts from 0)."""
+        base = min(self.max_delay, self.first_delay * self.multiplier ** attempt)
+        return base * (1 + self.jitter * (2 * rng() - 1))
+
+
+# The loop this module used before adaptive polling: one poll per second
+FIXED_POLL_POLICY = PollPolicy(first_delay=1.0, max_delay=1.0, multiplier=1.0, jitter=0.0)
+
+
+@dataclass
+class QueryTrace:
+    """Where the time of one Athena query went.
+    
+    queue_ms, engine_ms and total_ms come from the execution's Statistics;
+    polling_overhead_ms is wall time spent waiting beyond Athena's own total,
+    i.e. the cost of noticing completion late.
+    """
+    
+    polls: int = 0
+    wait_ms: float = 0.0
+    queue_ms: Optional[int] = None
+    engine_ms: Optional[int] = None
+    total_ms: Optional[int] = None
+    
+    @property
+    def polling_overhead_ms(self) -> Optional[float]:
+        if self.total_ms is None:
+            return None
+        return max(0.0, self.wait_ms - self.total_ms)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "polls": self.polls,
+            "wait_ms": round(self.wait_ms, 1),
+            "queue_ms": self.queue_ms,
+            "engine_ms": self.engine_ms,
+            "total_ms": self.total_ms,
+            "polling_overhead_ms": (
+                round(self.polling_overhead_ms, 1) if self.polling_overhead_ms is not None else None
+            ),
+        }
+
+
+def wait_for_query(
+    qid: str,
+    region: str,
+    timeout_seconds: float = 30,
+    policy: PollPolicy = PollPolicy(),
+    trace: Optional[QueryTrace] = None,
+    sleep: Callable[[float], None] = time.sleep,
+    clock: Callable[[], float] = time.monotonic
+) -> Dict[str, Any]:
     """Wait for an Athena query to complete.
     
     Args:
         qid: Query execution ID
         region: AWS region  
-        timeout_seconds: Maximum time to wait
+        timeout_seconds: Maximum time to wait; callers pass what is left of
+            the Lambda's time budget
+        policy: Delays between polls (default: adaptive backoff)
+        trace: Filled with poll count, wait time and Athena's statistics
+        sleep: Sleep function, replaced by simulations
+        clock: Monotonic clock, replaced by simulations
         
     Returns:
         Final query execution state dict
@@ -46,22 +122,39 @@ def wait_for_query(qid: str, region: str, timeout_seconds: int = 30) -> Dict[str
         TimeoutError: If query doesn't complete within timeout
         Exception: If query fails
     """
-    athena = boto3.client("athena", region_name=region)
+    athena = get_client("athena", region)
+    trace = trace if trace is not None else QueryTrace()
     
-    start_time = time.time()
+    start_time = clock()
+    deadline = start_time + timeout_seconds
+    attempt = 0
     
-    while time.time() - start_time < timeout_seconds:
+    while True:
         response = athena.get_query_execution(QueryExecutionId=qid)
+        trace.polls += 1
+        trace.wait_ms = (clock() - start_time) * 1000
         execution = response['QueryExecution']
         state = execution['Status']['State']
         
+        if state in ['SUCCEEDED', 'FAILED', 'CANCELLED']:
+            statistics = execution.get('Statistics', {})
+            trace.queue_ms = statistics.get('QueryQueueTimeInMillis')
+            trace.engine_ms = statistics.get('EngineExecutionTimeInMillis')
+            trace.total_ms = statistics.get('TotalExecutionTimeInMillis')
+        
         if state == 'SUCCEEDED':
             return execution
         elif state in ['FAILED', 'CANCELLED']:
             reason = execution['Status'].get('StateChangeReason', 'Unknown error')
             raise Exception(f"Query {state.lower()}: {reason}")
         
-        time.sleep(1)
+        remaining = deadline - clock()
+        if remaining <= 0:
+            break
+        
+        # Never sleep past the deadline; one last poll happens at it
+        sleep(min(policy.delay(attempt), remaining))
+        attempt += 1
     
     raise TimeoutError(f"Query {qid} did not complete within {timeout_seconds} seconds")
 
@@ -76,7 +169,7 @@ def get_results(qid: str, region: str) -> List[Dict[str, Any]]:
     Returns:
         List of result rows as dictionaries
     """
-    athena = boto3.client("athena", region_name=region)
+    athena = get_client("athena", region)
     
     response = athena.get_query_results(QueryExecutionId=qid)
     
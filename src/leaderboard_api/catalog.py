@@ -0,0 +1,92 @@
+"""Snapshot catalog lookups for the leaderboard API."""
+
+import json
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from botocore.exceptions import ClientError
+
+from clients import get_client
+
+# (bucket, source, kingdom) -> (expires_at, manifest); lives for the container's lifetime
+_cache: Dict[Tuple[str, str, str], Tuple[float, Optional[Dict[str, Any]]]] = {}
+
+
+def catalog_key(source: str, kingdom: str) -> str:
+    """Build the S3 key of a kingdom's catalog manifest.
+    
+    Must match ingest_players.s3_paths.build_catalog_key.
+    
+    Args:
+        source: Source name (e.g. "rok_players")
+        kingdom: Kingdom ID (already validated)
+        
+    Returns:
+        S3 object key
+    """
+    return f"catalog/source={source}/kingdom={kingdom}/snapshots.json"
+
+
+def get_catalog(
+    bucket: str,
+    source: str,
+    kingdom: str,
+    ttl_seconds: float
+) -> Optional[Dict[str, Any]]:
+    """Get a kingdom's catalog manifest.
+    
+    Results, including a missing manifest, are cached in memory for
+    ttl_seconds so a warm container answers without touching S3.
+    
+    Args:
+        bucket: Data bucket name
+        source: Source name
+        kingdom: Kingdom ID
+        ttl_seconds: How long a cached manifest stays valid
+        
+    Returns:
+        Manifest document, or None if the kingdom has none
+    """
+    cache_key = (bucket, source, kingdom)
+    now = time.monotonic()
+    
+    cached = _cache.get(cache_key)
+    if cached is not None and cached[0] > now:
+        return cached[1]
+    
+    try:
+        response = get_client("s3").get_object(Bucket=bucket, Key=catalog_key(source, kingdom))
+        document = json.loads(response["Body"].read())
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") not in ("NoSuchKey", "404"):
+            raise
+        document = None
+    
+    _cache[cache_key] = (now + ttl_seconds, document)
+    return document
+
+
+def get_snapshots(
+    bucket: str,
+    source: str,
+    kingdom: str,
+    ttl_seconds: float
+) -> Optional[List[Dict[str, Any]]]:
+    """Get a kingdom's snapshots from its catalog manifest.
+    
+    Args:
+        bucket: Data bucket name
+        source: Source name
+        kingdom: Kingdom ID
+        ttl_seconds: How long a cached manifest stays valid
+        
+    Returns:
+        Snapshot entries sorted by date, or None if the kingdom has no manifest
+    """
+    document = get_catalog(bucket, source, kingdom, ttl_seconds)
+    return document["snapshots"] if document is not None else None
+
+
+def clear_cache() -> None:
+    """Drop every cached manifest."""
+    _cache.clear()
@@ -0,0 +1,30 @@
+"""Shared AWS clients for the leaderboard API."""
+
+from typing import Any, Dict, Optional, Tuple
+
+# (service, region) -> client. Creating a client costs ~200 ms and opens a new
+# connection pool, so each one is built on first use and kept for the
+# container's lifetime
+_clients: Dict[Tuple[str, Optional[str]], Any] = {}
+
+
+def get_client(service: str, region: Optional[str] = None) -> Any:
+    """Get the container's client for an AWS service, creating it on first use.
+    
+    boto3 is imported here so requests that never call AWS (health checks,
+    validation errors) do not pay for it.
+    
+    Args:
+        service: boto3 service name (e.g. "s3", "athena")
+        region: AWS region, None for the environment default
+    
+    Returns:
+        boto3 client
+    """
+    key = (service, region)
+    client = _clients.get(key)
+    if client is None:
+        import boto3
+        
+        client = _clients[key] = boto3.client(service, region_name=region)
+    return client
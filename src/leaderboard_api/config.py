@@ -2,8 +2,12 @@
 
 import os
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Optional
 
+SERVING_MODES = {"athena", "artifacts", "store"}
+QUERY_ENGINES = {"athena", "parquet"}
+
 
 @dataclass
 class Config:
@@ -13,6 +17,17 @@ class Config:
     athena_table: str
     athena_results_s3: str
     aws_region: str
+    data_bucket: str = ""
+    source: str = "rok_players"
+    serving_mode: str = "athena"
+    catalog_ttl_seconds: float = 60.0
+    result_cache_entries: int = 1024
+    result_cache_latest_ttl_seconds: float = 30.0
+    shared_query_cache: bool = True
+    shared_cache_wait_seconds: float = 10.0
+    athena_timeout_seconds: float = 30.0
+    query_engine: str = "athena"
+    serving_store_kingdoms: int = 8
     
     @classmethod
     def from_env(cls) -> "Config":
@@ -25,9 +40,45 @@ class Config:
         if not athena_results_s3:
             raise ValueError("ATHENA_RESULTS_S3 environment variable is required")
         
+        # "artifacts" serves precomputed top-N files and "store" the kingdom's
+        # SQLite serving store; both fall back to the query engine
+        serving_mode = os.getenv("LEADERBOARD_SERVING", "athena")
+        if serving_mode not in SERVING_MODES:
+            raise ValueError(f"LEADERBOARD_SERVING must be one of {sorted(SERVING_MODES)}")
+        
+        # "parquet" reads the curated partition directly and falls back to Athena
+        query_engine = os.getenv("QUERY_ENGINE", "athena")
+        if query_engine not in QUERY_ENGINES:
+            raise ValueError(f"QUERY_ENGINE must be one of {sorted(QUERY_ENGINES)}")
+        
         return cls(
             athena_database=os.getenv("ATHENA_DATABASE", "rok_ingestion_data"),
             athena_table=os.getenv("ATHENA_TABLE", "rok_players_curated"),
             athena_results_s3=athena_results_s3,
-            aws_region=os.getenv("AWS_REGION", "us-east-1")
-        )
\ No newline at end of file
+            aws_region=os.getenv("AWS_REGION", "us-east-1"),
+            data_bucket=os.getenv("DATA_BUCKET", ""),
+            source=os.getenv("SOURCE_NAME", "rok_players"),
+            serving_mode=serving_mode,
+            catalog_ttl_seconds=float(os.getenv("CATALOG_TTL_SECONDS", "60")),
+            # 0 disables the in-container leaderboard result cache
+            result_cache_entries=int(os.getenv("RESULT_CACHE_ENTRIES", "1024")),
+            result_cache_latest_ttl_seconds=float(os.getenv("RESULT_CACHE_LATEST_TTL_SECONDS", "30")),
+            # Share Athena results between containers through DATA_BUCKET
+            shared_query_cache=os.getenv("SHARED_QUERY_CACHE", "1") == "1",
+            shared_cache_wait_seconds=float(os.getenv("SHARED_CACHE_WAIT_SECONDS", "10")),
+            # Also capped by the Lambda's remaining time
+            athena_timeout_seconds=float(os.getenv("ATHENA_TIMEOUT_SECONDS", "30")),
+            query_engine=query_engine,
+            # Kingdom stores a container keeps on local storage
+            serving_store_kingdoms=int(os.getenv("SERVING_STORE_KINGDOMS", "8"))
+        )
+
+
+@lru_cache(maxsize=1)
+def get_config() -> Config:
+    """Load the configuration once per container.
+    
+    Environment variables cannot change during a container's lifetime, so
+    warm invocations reuse the first result.
+    """
+    return Config.from_env()
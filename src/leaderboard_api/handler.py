@@ -1,13 +1,31 @@
 """Lambda handler for the leaderboard API."""
 
 import json
-from typing import Dict, Any, Optional
+import time
+from typing import Callable, Dict, Any, Optional, Tuple
 
-from config import Config
-from metrics import get_metric_column
-from validation import parse_params, error_response, ok_response, options_response
+from artifacts import get_artifact_rows
+from catalog import get_catalog, get_snapshots
+from config import Config, get_config
+from history import history_available, history_key, open_history, read_player_history
+from metrics import METRICS, get_metric_column
+from parquet_engine import curated_key, open_partition, parquet_available, read_top_rows
+from result_cache import cache_stats, get_rows, put_rows
+from serving_store import open_store, store_leaderboard, store_player_history, store_stats
+from shared_cache import get_or_query, query_cache_key, query_fingerprint, shared_cache_stats
+from validation import (
+    parse_kingdom,
+    parse_params,
+    parse_player_params,
+    error_response,
+    ok_response,
+    options_response,
+)
 from sql import sql_latest_dt, sql_leaderboard
-from athena import start_query, wait_for_query, get_results
+from athena import QueryTrace, start_query, wait_for_query, get_results
+
+# Left of the invocation's time budget for building the response after a query
+RESPONSE_RESERVE_SECONDS = 0.5
 
 
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
@@ -35,6 +53,10 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             return handle_health_check(context)
         elif path == "/leaderboard":
             return handle_leaderboard(event, context)
+        elif path == "/snapshots":
+            return handle_snapshots(event, context)
+        elif path == "/player":
+            return handle_player(event, context)
         else:
             return error_response(404, "Not found")
         
@@ -58,7 +80,10 @@ def handle_health_check(context: Any) -> Dict[str, Any]:
         "status": "healthy",
         "service": "leaderboard-api",
         "version": "1.0.0",
-        "request_id": getattr(context, 'aws_request_id', None)
+        "request_id": getattr(context, 'aws_request_id', None),
+        "cache": cache_stats(),
+        "shared_cache": shared_cache_stats(),
+        "serving_store": store_stats()
     }
     
     return ok_response(response_data)
@@ -67,6 +92,10 @@ def handle_health_check(context: Any) -> Dict[str, Any]:
 def handle_leaderboard(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """Handle leaderboard query requests.
     
+    Results are cached in the container (see result_cache): a repeated
+    request, or one for fewer rows than a cached result, never reaches S3
+    or Athena.
+    
     Args:
         event: API Gateway HTTP API event
         context: Lambda context object
@@ -76,7 +105,7 @@ def handle_leaderboard(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     try:
         # Load configuration
-        config = Config.from_env()
+        config = get_config()
         
         # Parse and validate request parameters
         params = parse_params(event)
@@ -90,49 +119,72 @@ def handle_leaderboard(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         # Get the metric column name
         metric_column = get_metric_column(metric)
         
+        use_cache = config.result_cache_entries > 0
         resolved_dt = dt
+        rows = None
+        served_from = "cache"
+        
+        # A cached "latest" entry also remembers the date it resolved to
+        if use_cache:
+            cached = get_rows(config.source, kingdom, metric, dt, limit)
+            if cached is not None:
+                resolved_dt, rows = cached
+        alias_hit = rows is not None
         
         # If dt is "latest", resolve it to the actual latest date
-        if dt == "latest":
-            latest_sql = sql_latest_dt(config.athena_database, config.athena_table, kingdom)
-            
-            latest_qid = start_query(
-                latest_sql, 
-                config.athena_database, 
-                config.athena_results_s3, 
-                config.aws_region
-            )
-            print(f"Latest dt query execution ID: {latest_qid}")
-            
-            wait_for_query(latest_qid, config.aws_region)
-            latest_results = get_results(latest_qid, config.aws_region)
-            
-            if not latest_results or not latest_results[0].get("dt"):
+        if rows is None and dt == "latest":
+            resolved_dt = resolve_latest_dt(config, kingdom, context)
+            if resolved_dt is None:
                 return error_response(404, f"No data found for kingdom {kingdom}")
-            
-            resolved_dt = latest_results[0]["dt"]
             print(f"Resolved latest dt to: {resolved_dt}")
+            
+            if use_cache:
+                cached = get_rows(config.source, kingdom, metric, resolved_dt, limit)
+                if cached is not None:
+                    rows = cached[1]
         
-        # Execute leaderboard query
-        leaderboard_sql = sql_leaderboard(
-            config.athena_database,
-            config.athena_table, 
-            kingdom,
-            resolved_dt,
-            metric_column,
-            limit
-        )
+        if rows is None:
+            served_from = "athena"
         
-        leaderboard_qid = start_query(
-            leaderboard_sql,
-            config.athena_database,
-            config.athena_results_s3, 
-            config.aws_region
-        )
-        print(f"Leaderboard query execution ID: {leaderboard_qid}")
+        # The serving store answers from a local index once downloaded
+        if rows is None and config.serving_mode == "store" and config.data_bucket:
+            store = get_serving_store(config, kingdom)
+            if store is not None:
+                rows = store_leaderboard(store, resolved_dt, metric, limit)
+            if rows is None:
+                print(f"Serving store cannot answer kingdom={kingdom}, dt={resolved_dt}, metric={metric}")
+            else:
+                served_from = "store"
         
-        wait_for_query(leaderboard_qid, config.aws_region)
-        rows = get_results(leaderboard_qid, config.aws_region)
+        # Precomputed artifacts answer with a single S3 GET
+        if rows is None and config.serving_mode == "artifacts" and config.data_bucket:
+            rows = get_artifact_rows(
+                config.data_bucket,
+                config.source,
+                kingdom,
+                resolved_dt,
+                metric,
+                limit
+            )
+            if rows is None:
+                print(f"No leaderboard artifact for kingdom={kingdom}, dt={resolved_dt}, metric={metric}")
+            else:
+                served_from = "artifact"
+        
+        if rows is None:
+            rows, served_from = query_leaderboard(config, kingdom, resolved_dt, metric_column, limit, context)
+        
+        if use_cache and served_from != "cache":
+            put_rows(
+                config.source, kingdom, metric, resolved_dt, resolved_dt, limit, rows,
+                config.result_cache_entries, config.result_cache_latest_ttl_seconds
+            )
+        # Refreshed only on a miss, so the TTL bounds how stale "latest" gets
+        if use_cache and dt == "latest" and not alias_hit:
+            put_rows(
+                config.source, kingdom, metric, dt, resolved_dt, limit, rows,
+                config.result_cache_entries, config.result_cache_latest_ttl_seconds
+            )
         
         # Return successful response
         response_data = {
@@ -140,6 +192,7 @@ def handle_leaderboard(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             "dt": resolved_dt,
             "metric": metric,
             "limit": limit,
+            "served_from": served_from,
             "rows": rows
         }
         
@@ -154,4 +207,363 @@ def handle_leaderboard(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         # Log error with request ID if available
         request_id = getattr(context, 'aws_request_id', 'unknown')
         print(f"Error processing request {request_id}: {e}")
-        return error_response(500, "Internal server error")
\ No newline at end of file
+        return error_response(500, "Internal server error")
+
+
+def handle_snapshots(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """Handle snapshot listing requests.
+    
+    Args:
+        event: API Gateway HTTP API event
+        context: Lambda context object
+        
+    Returns:
+        API Gateway response dict listing the kingdom's snapshot dates
+    """
+    try:
+        config = get_config()
+        kingdom = parse_kingdom(event)
+        
+        snapshots = None
+        if config.data_bucket:
+            snapshots = get_snapshots(
+                config.data_bucket,
+                config.source,
+                kingdom,
+                config.catalog_ttl_seconds
+            )
+        
+        if not snapshots:
+            return error_response(404, f"No data found for kingdom {kingdom}")
+        
+        return ok_response({
+            "kingdom": kingdom,
+            "latest": snapshots[-1]["dt"],
+            "snapshots": [
+                {"dt": s["dt"], "rows": s["rows"], "run_id": s["run_id"]}
+                for s in snapshots
+            ]
+        })
+        
+    except ValueError as e:
+        print(f"Validation error: {e}")
+        return error_response(400, str(e))
+        
+    except Exception as e:
+        request_id = getattr(context, 'aws_request_id', 'unknown')
+        print(f"Error processing request {request_id}: {e}")
+        return error_response(500, "Internal server error")
+
+
+def handle_player(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """Handle player history requests.
+    
+    With LEADERBOARD_SERVING=store the timeline comes from the kingdom's
+    serving store. Otherwise the kingdom's history file is read, fetching only
+    the row groups whose id statistics cover the requested player.
+    
+    Args:
+        event: API Gateway HTTP API event
+        context: Lambda context object
+        
+    Returns:
+        API Gateway response dict with one row per snapshot date
+    """
+    try:
+        config = get_config()
+        params = parse_player_params(event)
+        kingdom = params["kingdom"]
+        player_id = params["id"]
+        metrics = params["metrics"] or list(METRICS)
+        columns = {get_metric_column(m): m for m in metrics}
+        
+        store = None
+        if config.serving_mode == "store" and config.data_bucket:
+            store = get_serving_store(config, kingdom)
+        
+        if store is not None:
+            history = {"rows": store_player_history(store, player_id, list(columns))}
+            print(f"Player request: kingdom={kingdom}, id={player_id}, served from store")
+        else:
+            if not history_available():
+                return error_response(501, "Player history is not available")
+            
+            parquet_file = None
+            if config.data_bucket:
+                parquet_file = open_history(
+                    config.data_bucket,
+                    history_key(config.source, kingdom),
+                    config.aws_region
+                )
+            
+            if parquet_file is None:
+                return error_response(404, f"No history found for kingdom {kingdom}")
+            
+            history = read_player_history(parquet_file, player_id, list(columns))
+            print(
+                f"Player request: kingdom={kingdom}, id={player_id}, "
+                f"row_groups={history['row_groups_read']}/{history['row_groups_total']}"
+            )
+        
+        if not history["rows"]:
+            return error_response(404, f"No history found for player {player_id}")
+        
+        response_data = {
+            "kingdom": kingdom,
+            "id": player_id,
+            "metrics": metrics,
+            "served_from": "store" if store is not None else "history",
+            "rows": [
+                {columns.get(k, k): v for k, v in row.items()}
+                for row in history["rows"]
+            ]
+        }
+        if store is None:
+            response_data["row_groups_read"] = history["row_groups_read"]
+            response_data["row_groups_total"] = history["row_groups_total"]
+        
+        return ok_response(response_data)
+        
+    except ValueError as e:
+        print(f"Validation error: {e}")
+        return error_response(400, str(e))
+        
+    except Exception as e:
+        request_id = getattr(context, 'aws_request_id', 'unknown')
+        print(f"Error processing request {request_id}: {e}")
+        return error_response(500, "Internal server error")
+
+
+def get_serving_store(config: Config, kingdom: str) -> Optional[Any]:
+    """Open the kingdom's serving store named in its catalog manifest.
+    
+    The first request for a store version downloads it; later ones reuse the
+    container's copy until the manifest names a newer version.
+    
+    Args:
+        config: API configuration
+        kingdom: Kingdom ID
+        
+    Returns:
+        Open store (see serving_store), or None if the kingdom has none
+    """
+    document = get_catalog(config.data_bucket, config.source, kingdom, config.catalog_ttl_seconds)
+    return open_store(
+        config.data_bucket,
+        config.source,
+        kingdom,
+        (document or {}).get("serving"),
+        config.serving_store_kingdoms
+    )
+
+
+def query_timeout(config: Config, context: Any) -> float:
+    """Seconds an Athena wait may take within this invocation.
+    
+    Args:
+        config: API configuration
+        context: Lambda context object, or None outside Lambda
+        
+    Returns:
+        ATHENA_TIMEOUT_SECONDS, capped by the invocation's remaining time
+        less RESPONSE_RESERVE_SECONDS
+    """
+    remaining_ms = getattr(context, "get_remaining_time_in_millis", None)
+    if remaining_ms is None:
+        return config.athena_timeout_seconds
+    return max(0.0, min(config.athena_timeout_seconds, remaining_ms() / 1000 - RESPONSE_RESERVE_SECONDS))
+
+
+def run_athena_query(config: Config, sql: str, name: str, context: Any = None) -> list:
+    """Run a query on Athena and log where its time went.
+    
+    Args:
+        config: API configuration
+        sql: SQL to run
+        name: Query name for the log line, e.g. "leaderboard"
+        context: Lambda context object, bounds the wait
+        
+    Returns:
+        Result rows
+    """
+    qid = start_query(
+        sql,
+        config.athena_database,
+        config.athena_results_s3,
+        config.aws_region
+    )
+    
+    trace = QueryTrace()
+    try:
+        wait_for_query(qid, config.aws_region, timeout_seconds=query_timeout(config, context), trace=trace)
+    finally:
+        print(json.dumps({"athena_query": name, "query_execution_id": qid, **trace.to_dict()}))
+    return get_results(qid, config.aws_region)
+
+
+def resolve_latest_dt(config: Config, kingdom: str, context: Any = None) -> Optional[str]:
+    """Resolve "latest" to a kingdom's most recent snapshot date.
+    
+    The catalog manifest answers from memory or a single S3 GET. Kingdoms
+    ingested before the catalog existed fall back to a max(dt) Athena query.
+    
+    Args:
+        config: API configuration
+        kingdom: Kingdom ID
+        context: Lambda context object, bounds the Athena wait
+        
+    Returns:
+        Date string, or None if the kingdom has no data
+    """
+    if config.data_bucket:
+        snapshots = get_snapshots(
+            config.data_bucket,
+            config.source,
+            kingdom,
+            config.catalog_ttl_seconds
+        )
+        if snapshots is not None:
+            return snapshots[-1]["dt"] if snapshots else None
+    
+    latest_sql = sql_latest_dt(config.athena_database, config.athena_table, kingdom)
+    latest_results = run_athena_query(config, latest_sql, "latest_dt", context)
+    
+    if not latest_results or not latest_results[0].get("dt"):
+        return None
+    
+    return latest_results[0]["dt"]
+
+
+def query_leaderboard(
+    config: Config,
+    kingdom: str,
+    dt: str,
+    metric_column: str,
+    limit: int,
+    context: Any = None
+) -> Tuple[list, str]:
+    """Answer a leaderboard with the configured query engine (QUERY_ENGINE).
+    
+    Every engine takes the same arguments and returns rows of the same shape.
+    
+    Args:
+        config: API configuration
+        kingdom: Kingdom ID
+        dt: Concrete snapshot date
+        metric_column: Column name for the metric
+        limit: Result limit
+        context: Lambda context object, bounds the query
+        
+    Returns:
+        Tuple of (result rows, served_from naming where they came from)
+    """
+    engine = LEADERBOARD_ENGINES[config.query_engine]
+    return engine(config, kingdom, dt, metric_column, limit, context)
+
+
+def athena_leaderboard(
+    config: Config,
+    kingdom: str,
+    dt: str,
+    metric_column: str,
+    limit: int,
+    context: Any = None
+) -> Tuple[list, str]:
+    """Answer a leaderboard with an Athena query.
+    
+    With a data bucket and SHARED_QUERY_CACHE, results are shared between
+    containers through S3 (see shared_cache), so a burst of identical
+    requests runs the query once.
+    
+    Args:
+        config: API configuration
+        kingdom: Kingdom ID
+        dt: Concrete snapshot date
+        metric_column: Column name for the metric
+        limit: Result limit
+        context: Lambda context object, bounds the Athena wait
+        
+    Returns:
+        Tuple of (result rows, served_from): "athena" or "shared_cache"
+    """
+    leaderboard_sql = sql_leaderboard(
+        config.athena_database,
+        config.athena_table, 
+        kingdom,
+        dt,
+        metric_column,
+        limit
+    )
+    
+    def run_query() -> list:
+        return run_athena_query(config, leaderboard_sql, "leaderboard", context)
+    
+    if not (config.shared_query_cache and config.data_bucket):
+        return run_query(), "athena"
+    
+    # The snapshot's run_id versions the entry, so a re-ingested date misses
+    snapshots = get_snapshots(config.data_bucket, config.source, kingdom, config.catalog_ttl_seconds)
+    run_id = next((s["run_id"] for s in snapshots or [] if s["dt"] == dt), None)
+    key = query_cache_key(config.source, query_fingerprint(leaderboard_sql, run_id))
+    
+    return get_or_query(
+        config.data_bucket,
+        key,
+        run_query,
+        wait_seconds=config.shared_cache_wait_seconds
+    )
+
+
+def parquet_leaderboard(
+    config: Config,
+    kingdom: str,
+    dt: str,
+    metric_column: str,
+    limit: int,
+    context: Any = None
+) -> Tuple[list, str]:
+    """Answer a leaderboard from the curated partition with pyarrow.
+    
+    Reads only the id, name and metric columns of one kingdom/dt file and
+    selects the top rows without sorting the whole partition (see
+    parquet_engine). Falls back to Athena without pyarrow or a data bucket,
+    or when the partition is missing.
+    
+    Args:
+        config: API configuration
+        kingdom: Kingdom ID
+        dt: Concrete snapshot date
+        metric_column: Column name for the metric
+        limit: Result limit
+        context: Lambda context object, bounds the Athena fallback
+        
+    Returns:
+        Tuple of (result rows, served_from): "parquet", or the Athena
+        engine's when falling back
+    """
+    parquet_file = None
+    key = curated_key(config.source, kingdom, dt)
+    if config.data_bucket and parquet_available():
+        parquet_file = open_partition(config.data_bucket, key, config.aws_region)
+    
+    if parquet_file is None:
+        print(f"No curated partition readable at {key}, querying Athena")
+        return athena_leaderboard(config, kingdom, dt, metric_column, limit, context)
+    
+    start = time.perf_counter()
+    result = read_top_rows(parquet_file, metric_column, limit)
+    print(json.dumps({
+        "parquet_query": "leaderboard",
+        "key": key,
+        "row_groups_read": result["row_groups_read"],
+        "row_groups_total": result["row_groups_total"],
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 1),
+    }))
+    return result["rows"], "parquet"
+
+
+# QUERY_ENGINE name -> engine; config.QUERY_ENGINES lists the same names
+LEADERBOARD_ENGINES: Dict[str, Callable[..., Tuple[list, str]]] = {
+    "athena": athena_leaderboard,
+    "parquet": parquet_leaderboard,
+}
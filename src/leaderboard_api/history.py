@@ -0,0 +1,125 @@
+"""Player time series read from the per-kingdom history files.
+
+Reading Parquet needs pyarrow, which is not bundled in the ZIP package; it is
+provided by a Lambda layer. Without it, player lookups are reported as
+unavailable instead of failing the whole API.
+"""
+
+import importlib.util
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence
+
+if TYPE_CHECKING:
+    import pyarrow.parquet as pq
+
+HISTORY_FIELDS = ("snapshot_date", "name", "alliance")
+
+
+def history_available() -> bool:
+    """Whether pyarrow is importable in this runtime.
+    
+    pyarrow itself is imported on the first player lookup, not at cold start.
+    """
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def history_key(source: str, kingdom: str) -> str:
+    """Build the S3 key of a kingdom's player history.
+    
+    Must match ingest_players.s3_paths.build_history_key.
+    
+    Args:
+        source: Source name (e.g. "rok_players")
+        kingdom: Kingdom ID (already validated)
+    
+    Returns:
+        S3 object key
+    """
+    return f"history/source={source}/kingdom={kingdom}/players_history.parquet"
+
+
+def open_history(bucket: str, key: str, region: str) -> Optional["pq.ParquetFile"]:
+    """Open a history file for ranged reads.
+    
+    Only the footer is fetched here; row groups are fetched on demand.
+    
+    Args:
+        bucket: Data bucket name
+        key: History object key
+        region: AWS region of the bucket
+    
+    Returns:
+        ParquetFile, or None if the kingdom has no history yet
+    """
+    import pyarrow.fs as pafs
+    import pyarrow.parquet as pq
+    
+    filesystem = pafs.S3FileSystem(region=region)
+    try:
+        source = filesystem.open_input_file(f"{bucket}/{key}")
+    except FileNotFoundError:
+        return None
+    return pq.ParquetFile(source)
+
+
+def covering_row_groups(parquet_file: "pq.ParquetFile", player_id: str) -> List[int]:
+    """Select the row groups whose id statistics include a player.
+    
+    The history is sorted by id (a string, as in the curated table), so this
+    is usually one row group, or two when the player's timeline straddles a
+    boundary.
+    
+    Args:
+        parquet_file: Open history file
+        player_id: Player ID
+    
+    Returns:
+        Row group indexes
+    """
+    metadata = parquet_file.metadata
+    id_index = parquet_file.schema_arrow.get_field_index("id")
+    
+    selected = []
+    for i in range(metadata.num_row_groups):
+        stats = metadata.row_group(i).column(id_index).statistics
+        # Without statistics the row group cannot be ruled out
+        if stats is None or not stats.has_min_max or stats.min <= player_id <= stats.max:
+            selected.append(i)
+    return selected
+
+
+def read_player_history(
+    parquet_file: "pq.ParquetFile",
+    player_id: str,
+    columns: Sequence[str]
+) -> Dict[str, Any]:
+    """Read one player's rows from the covering row groups only.
+    
+    Args:
+        parquet_file: Open history file
+        player_id: Player ID
+        columns: Metric columns to return
+    
+    Returns:
+        Dict with rows ordered by snapshot_date, row_groups_read and
+        row_groups_total
+    """
+    import pyarrow.compute as pc
+    
+    available = parquet_file.schema_arrow.names
+    wanted = ["id"] + [c for c in list(HISTORY_FIELDS) + list(columns) if c in available]
+    
+    row_groups = covering_row_groups(parquet_file, player_id)
+    rows = []
+    if row_groups:
+        table = parquet_file.read_row_groups(row_groups, columns=wanted)
+        table = table.filter(pc.equal(table["id"], player_id)).sort_by("snapshot_date")
+        rows = [
+            {k: v for k, v in row.items() if k != "id"}
+            for row in table.to_pylist()
+        ]
+    
+    return {
+        "rows": rows,
+        "row_groups_read": len(row_groups),
+        "row_groups_total": parquet_file.metadata.num_row_groups,
+    }
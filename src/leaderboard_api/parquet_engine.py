@@ -0,0 +1,163 @@
+"""Leaderboard queries answered straight from the curated Parquet partition.
+
+A leaderboard reads one kingdom/dt partition, which is a single file of a few
+tens of thousands of rows. Reading its id, name and metric columns with
+pyarrow and selecting the top N takes milliseconds, where an Athena query
+spends seconds queued, planned and polled for.
+
+Like /player, this needs pyarrow from a Lambda layer; without it the handler
+keeps using Athena.
+"""
+
+import importlib.util
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+
+def parquet_available() -> bool:
+    """Whether pyarrow is importable in this runtime.
+    
+    pyarrow itself is imported on the first query, not at cold start.
+    """
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def curated_key(source: str, kingdom: str, dt: str) -> str:
+    """Build the S3 key of a curated partition.
+    
+    Must match ingest_players.s3_paths.build_curated_key.
+    
+    Args:
+        source: Source name (e.g. "rok_players")
+        kingdom: Kingdom ID (already validated)
+        dt: Date string (already validated, not "latest")
+    
+    Returns:
+        S3 object key
+    """
+    return f"curated/source={source}/kingdom={kingdom}/dt={dt}/players.parquet"
+
+
+def open_partition(bucket: str, key: str, region: str) -> Optional["pq.ParquetFile"]:
+    """Open a curated partition for ranged reads.
+    
+    Only the footer is fetched here; column chunks are fetched on demand.
+    
+    Args:
+        bucket: Data bucket name
+        key: Curated object key
+        region: AWS region of the bucket
+    
+    Returns:
+        ParquetFile, or None if the partition does not exist
+    """
+    import pyarrow.fs as pafs
+    import pyarrow.parquet as pq
+    
+    filesystem = pafs.S3FileSystem(region=region)
+    try:
+        source = filesystem.open_input_file(f"{bucket}/{key}")
+    except FileNotFoundError:
+        return None
+    return pq.ParquetFile(source)
+
+
+def _row_groups_by_max(parquet_file: "pq.ParquetFile", metric_column: str) -> List[Tuple[int, Optional[Any]]]:
+    """Row groups with their max metric value, highest first.
+    
+    Groups without statistics come first with a max of None, since they
+    cannot be ruled out.
+    """
+    metadata = parquet_file.metadata
+    names = parquet_file.schema_arrow.names
+    if metric_column not in names:
+        return [(i, None) for i in range(metadata.num_row_groups)]
+    
+    metric_index = names.index(metric_column)
+    groups = []
+    for i in range(metadata.num_row_groups):
+        stats = metadata.row_group(i).column(metric_index).statistics
+        groups.append((i, stats.max if stats is not None and stats.has_min_max else None))
+    
+    return sorted(groups, key=lambda g: (g[1] is None, g[1] or 0), reverse=True)
+
+
+def _read_group(parquet_file: "pq.ParquetFile", row_group: int, metric_column: str) -> "pa.Table":
+    """Read one row group as id, name and value columns.
+    
+    A column the upload did not have reads as nulls, as it does in Athena.
+    """
+    import pyarrow as pa
+    
+    available = parquet_file.schema_arrow.names
+    wanted = [c for c in ("id", "name", metric_column) if c in available]
+    table = parquet_file.read_row_group(row_group, columns=wanted)
+    
+    columns = {
+        "id": table.column("id"),
+        "name": table.column("name") if "name" in wanted else pa.nulls(len(table), pa.string()),
+        "value": table.column(metric_column) if metric_column in wanted else pa.nulls(len(table), pa.int64()),
+    }
+    return pa.table(columns)
+
+
+def _top(table: "pa.Table", limit: int) -> "pa.Table":
+    """Select the top rows by value (nulls last, ties by id) without a full sort."""
+    import pyarrow.compute as pc
+    
+    sort_keys = [("value", "descending"), ("id", "ascending")]
+    if len(table) > limit:
+        table = table.take(pc.select_k_unstable(table, limit, sort_keys))
+    return table.sort_by(sort_keys)
+
+
+def read_top_rows(parquet_file: "pq.ParquetFile", metric_column: str, limit: int) -> Dict[str, Any]:
+    """Compute a leaderboard from a curated partition.
+    
+    Row groups are visited in descending order of their max metric value, and
+    reading stops once the next group's max cannot reach the current N-th
+    value. With the default layout that is the one row group anyway; with a
+    CURATED_SORT_KEY it is usually the first.
+    
+    Args:
+        parquet_file: Open curated partition
+        metric_column: Curated column of the metric
+        limit: Number of rows to return
+    
+    Returns:
+        Dict with rows shaped like the Athena results ({"id", "name",
+        "value"}, ordered by value descending, nulls last), row_groups_read
+        and row_groups_total
+    """
+    import pyarrow as pa
+    
+    top = None
+    row_groups_read = 0
+    
+    for row_group, group_max in _row_groups_by_max(parquet_file, metric_column):
+        if (
+            top is not None
+            and len(top) >= limit
+            and top.column("value").null_count == 0
+            and group_max is not None
+            and group_max < top.column("value")[-1].as_py()
+        ):
+            break
+        
+        group = _read_group(parquet_file, row_group, metric_column)
+        top = _top(group if top is None else pa.concat_tables([top, group]), limit)
+        row_groups_read += 1
+    
+    rows = top.to_pylist() if top is not None else []
+    for row in rows:
+        # Athena returns empty strings as null
+        row["name"] = row["name"] or None
+    
+    return {
+        "rows": rows,
+        "row_groups_read": row_groups_read,
+        "row_groups_total": parquet_file.metadata.num_row_groups,
+    }
@@ -0,0 +1,113 @@
+"""In-container cache of leaderboard results.
+
+A warm container answers a repeated leaderboard request from memory. Entries
+are keyed on (source, kingdom, metric, dt) and hold the rows of the largest
+limit fetched so far, so a cached top 500 also answers a top 10 by slicing.
+
+A concrete date's snapshot does not change once published, so its entries
+never expire; they only leave the cache when it is full (least recently used
+first). An entry for "latest" remembers which date it resolved to and
+expires after a short TTL, so a newly ingested snapshot is picked up.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+# (source, kingdom, metric, dt) -> (expires_at or None, limit, resolved dt, rows),
+# least recently used first; lives for the container's lifetime
+_cache: "OrderedDict[Tuple[str, str, str, str], Tuple[Optional[float], int, str, List[Dict[str, Any]]]]" = OrderedDict()
+_stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+
+def get_rows(
+    source: str,
+    kingdom: str,
+    metric: str,
+    dt: str,
+    limit: int
+) -> Optional[Tuple[str, List[Dict[str, Any]]]]:
+    """Look up the top rows of a leaderboard.
+    
+    Args:
+        source: Source name
+        kingdom: Kingdom ID
+        metric: Metric key
+        dt: Date string or "latest"
+        limit: Number of rows wanted
+    
+    Returns:
+        Tuple of (resolved dt, up to limit rows), or None if no live entry
+        holds at least limit rows or the whole leaderboard
+    """
+    key = (source, kingdom, metric, dt)
+    cached = _cache.get(key)
+    
+    if cached is not None and cached[0] is not None and cached[0] <= time.monotonic():
+        del _cache[key]
+        cached = None
+    
+    # Fewer rows than the limit they were fetched with is the whole leaderboard
+    if cached is None or (limit > cached[1] and len(cached[3]) >= cached[1]):
+        _stats["misses"] += 1
+        return None
+    
+    _cache.move_to_end(key)
+    _stats["hits"] += 1
+    return cached[2], cached[3][:limit]
+
+
+def put_rows(
+    source: str,
+    kingdom: str,
+    metric: str,
+    dt: str,
+    resolved_dt: str,
+    limit: int,
+    rows: List[Dict[str, Any]],
+    max_entries: int,
+    latest_ttl_seconds: float
+) -> None:
+    """Cache the rows fetched for a leaderboard request.
+    
+    Args:
+        source: Source name
+        kingdom: Kingdom ID
+        metric: Metric key
+        dt: Requested date string or "latest"
+        resolved_dt: Concrete date the rows belong to
+        limit: Limit the rows were fetched with
+        rows: Result rows, ordered by value
+        max_entries: Entries kept before the least recently used is evicted
+        latest_ttl_seconds: How long a "latest" entry stays valid
+    """
+    if max_entries <= 0:
+        return
+    
+    key = (source, kingdom, metric, dt)
+    
+    # Keep a larger result already cached, it answers this limit too
+    cached = _cache.get(key)
+    if cached is not None and cached[1] > limit and cached[2] == resolved_dt:
+        _cache.move_to_end(key)
+        return
+    
+    expires_at = time.monotonic() + latest_ttl_seconds if dt == "latest" else None
+    _cache[key] = (expires_at, limit, resolved_dt, rows)
+    _cache.move_to_end(key)
+    
+    while len(_cache) > max_entries:
+        _cache.popitem(last=False)
+        _stats["evictions"] += 1
+
+
+def cache_stats() -> Dict[str, int]:
+    """Hit, miss and eviction counters since the container started, with the entry count."""
+    return {**_stats, "entries": len(_cache)}
+
+
+def clear_cache() -> None:
+    """Drop every cached result and reset the counters."""
+    _cache.clear()
+    for name in _stats:
+        _stats[name] = 0
@@ -0,0 +1,172 @@
+"""Leaderboards and player timelines from a kingdom's SQLite serving store.
+
+Ingestion publishes each kingdom's store as an immutable versioned object and
+names the current version in the catalog manifest (see
+ingest_players.serving_store). A container downloads a version once to local
+storage and then answers from SQLite's clustered indexes: a leaderboard is a
+range scan of (dt, metric, rank) and a player timeline one of (id, dt), both
+well under a millisecond. sqlite3 is in the standard library, so unlike the
+Parquet readers this needs no layer.
+"""
+
+import os
+import sqlite3
+import tempfile
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from botocore.exceptions import ClientError
+
+from clients import get_client
+
+# Must match ingest_players.serving_store.SERVING_STORE_FORMAT
+SERVING_STORE_FORMAT = 1
+
+STORE_DIR = os.path.join(tempfile.gettempdir(), "serving")
+
+# (bucket, source, kingdom) -> (key, connection, local path), least recently
+# used first; one version per kingdom, kept for the container's lifetime
+_stores: "OrderedDict[Tuple[str, str, str], Tuple[str, sqlite3.Connection, str]]" = OrderedDict()
+_stats = {"hits": 0, "downloads": 0, "evictions": 0}
+
+
+def _close(entry: Tuple[str, sqlite3.Connection, str]) -> None:
+    _, conn, path = entry
+    conn.close()
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def open_store(
+    bucket: str,
+    source: str,
+    kingdom: str,
+    pointer: Optional[Dict[str, Any]],
+    max_stores: int
+) -> Optional[sqlite3.Connection]:
+    """Open the store version a catalog points at, downloading it on first use.
+    
+    A newer version replaces the kingdom's previous one, and past max_stores
+    kingdoms the least recently used store is closed and its file deleted.
+    
+    Args:
+        bucket: Data bucket name
+        source: Source name
+        kingdom: Kingdom ID
+        pointer: The manifest's "serving" entry, None if it has none
+        max_stores: Kingdom stores kept on local storage
+    
+    Returns:
+        Read-only connection, or None if there is no usable store
+    """
+    if not pointer or pointer.get("format") != SERVING_STORE_FORMAT or max_stores <= 0:
+        return None
+    
+    slot = (bucket, source, kingdom)
+    cached = _stores.get(slot)
+    if cached is not None and cached[0] == pointer["key"]:
+        _stores.move_to_end(slot)
+        _stats["hits"] += 1
+        return cached[1]
+    
+    os.makedirs(STORE_DIR, exist_ok=True)
+    path = os.path.join(STORE_DIR, pointer["key"].replace("/", "_"))
+    tmp_path = f"{path}.tmp"
+    try:
+        get_client("s3").download_file(bucket, pointer["key"], tmp_path)
+    except ClientError as e:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        if e.response.get("Error", {}).get("Code") not in ("NoSuchKey", "404"):
+            raise
+        # Pruned after a newer version replaced it; the catalog TTL catches up
+        print(f"Serving store s3://{bucket}/{pointer['key']} not found")
+        return None
+    os.replace(tmp_path, path)
+    _stats["downloads"] += 1
+    
+    # immutable=1: the file never changes, so SQLite skips locking
+    conn = sqlite3.connect(f"file:{path}?mode=ro&immutable=1", uri=True, check_same_thread=False)
+    if cached is not None:
+        _close(cached)
+    _stores[slot] = (pointer["key"], conn, path)
+    _stores.move_to_end(slot)
+    
+    while len(_stores) > max_stores:
+        _close(_stores.popitem(last=False)[1])
+        _stats["evictions"] += 1
+    
+    return conn
+
+
+def store_leaderboard(
+    conn: sqlite3.Connection,
+    dt: str,
+    metric: str,
+    limit: int
+) -> Optional[List[Dict[str, Any]]]:
+    """Read the top rows of a metric from a store.
+    
+    Args:
+        conn: Open store
+        dt: Concrete snapshot date
+        metric: Metric key
+        limit: Number of rows to return
+    
+    Returns:
+        Up to limit rows shaped like the Athena results, or None if the store
+        does not hold the snapshot or holds fewer rows than requested while the
+        snapshot has more
+    """
+    snapshot = conn.execute("SELECT rows FROM snapshots WHERE dt = ?", (dt,)).fetchone()
+    if snapshot is None:
+        return None
+    
+    rows = conn.execute(
+        "SELECT id, name, value FROM leaderboard WHERE dt = ? AND metric = ? ORDER BY rank LIMIT ?",
+        (dt, metric, limit)
+    ).fetchall()
+    
+    # Only the top N of each metric are stored
+    if len(rows) < limit and len(rows) < snapshot[0]:
+        return None
+    
+    return [{"id": player_id, "name": name, "value": value} for player_id, name, value in rows]
+
+
+def store_player_history(
+    conn: sqlite3.Connection,
+    player_id: str,
+    columns: Sequence[str]
+) -> List[Dict[str, Any]]:
+    """Read one player's timeline from a store.
+    
+    Args:
+        conn: Open store
+        player_id: Player ID
+        columns: Metric columns to return
+    
+    Returns:
+        Rows ordered by snapshot_date, shaped like history.read_player_history
+    """
+    available = {row[1] for row in conn.execute("PRAGMA table_info(players)")}
+    wanted = ["name", "alliance"] + [c for c in columns if c in available]
+    selected = ", ".join('"' + c.replace('"', '""') + '"' for c in wanted)
+    
+    cursor = conn.execute(f"SELECT dt, {selected} FROM players WHERE id = ? ORDER BY dt", (player_id,))
+    return [dict(zip(["snapshot_date"] + wanted, row)) for row in cursor]
+
+
+def store_stats() -> Dict[str, int]:
+    """Store hit, download and eviction counters since the container started, with the open store count."""
+    return {**_stats, "open": len(_stores)}
+
+
+def close_stores() -> None:
+    """Close every store, delete the local files and reset the counters."""
+    while _stores:
+        _close(_stores.popitem(last=False)[1])
+    for name in _stats:
+        _stats[name] = 0
@@ -0,0 +1,174 @@
+"""Query result cache shared by every API container through S3.
+
+The in-container cache (result_cache) only helps the container that filled
+it. Under a traffic spike API Gateway starts many cold containers at once,
+and each would run the same 2-5 s Athena query. Here the first container to
+miss stores the result in the data bucket under a fingerprint of the query,
+and every other container answers with a single GET.
+
+Concurrent misses are collapsed with a lease object created by a conditional
+PUT (If-None-Match): only the container that creates it queries Athena, the
+others poll for the result. A lease left behind by a container that died
+mid-query expires after lease_seconds and is taken over, and a waiter that
+sees no result within wait_seconds runs the query itself, so a lost lease
+holder costs latency but never fails a request.
+"""
+
+import hashlib
+import json
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from botocore.exceptions import ClientError
+
+from clients import get_client
+
+QUERY_CACHE_PREFIX = "query-cache/"
+
+# Counters since the container started, reported by /health
+_stats = {"hits": 0, "misses": 0, "waits": 0, "takeovers": 0}
+
+
+def query_fingerprint(sql: str, version: Optional[str] = None) -> str:
+    """Fingerprint a query and the version of the data it reads.
+    
+    Args:
+        sql: Generated SQL
+        version: Identifies the data the query reads, such as the run_id of
+            the snapshot; a re-ingested snapshot then gets new entries
+    
+    Returns:
+        Hex SHA-256 digest
+    """
+    return hashlib.sha256(f"{version or ''}\n{sql}".encode("utf-8")).hexdigest()
+
+
+def query_cache_key(source: str, fingerprint: str) -> str:
+    """Build the S3 key of a cached query result.
+    
+    Args:
+        source: Source name (e.g. "rok_players")
+        fingerprint: Query fingerprint from query_fingerprint
+    
+    Returns:
+        S3 object key; the lease sits beside it with a .lock suffix
+    """
+    return f"{QUERY_CACHE_PREFIX}source={source}/{fingerprint}.json"
+
+
+def _error_code(e: ClientError) -> str:
+    return e.response.get("Error", {}).get("Code", "")
+
+
+def _read(bucket: str, key: str) -> Tuple[Optional[dict], Optional[str]]:
+    """Read a JSON object and its ETag, (None, None) if it does not exist."""
+    try:
+        response = get_client("s3").get_object(Bucket=bucket, Key=key)
+    except ClientError as e:
+        if _error_code(e) in ("NoSuchKey", "404"):
+            return None, None
+        raise
+    return json.loads(response["Body"].read()), response.get("ETag")
+
+
+def _acquire_lease(bucket: str, lock_key: str, lease_seconds: float) -> bool:
+    """Create the lease, or take over one that has expired.
+    
+    Returns:
+        True if this container now holds the lease
+    """
+    s3 = get_client("s3")
+    body = json.dumps({"expires_at": time.time() + lease_seconds}).encode("utf-8")
+    try:
+        s3.put_object(Bucket=bucket, Key=lock_key, Body=body, IfNoneMatch="*")
+        return True
+    except ClientError as e:
+        if _error_code(e) not in ("PreconditionFailed", "ConditionalRequestConflict"):
+            raise
+    
+    lease, etag = _read(bucket, lock_key)
+    if lease is None or lease.get("expires_at", 0) > time.time():
+        return False
+    
+    # The holder died mid-query; the ETag makes only one waiter take over
+    try:
+        s3.put_object(Bucket=bucket, Key=lock_key, Body=body, IfMatch=etag)
+    except ClientError as e:
+        if _error_code(e) not in ("PreconditionFailed", "ConditionalRequestConflict"):
+            raise
+        return False
+    _stats["takeovers"] += 1
+    return True
+
+
+def get_or_query(
+    bucket: str,
+    key: str,
+    run_query: Callable[[], List[Dict[str, Any]]],
+    lease_seconds: float = 30.0,
+    wait_seconds: float = 10.0,
+    poll_seconds: float = 0.25
+) -> Tuple[List[Dict[str, Any]], str]:
+    """Answer a query from the shared cache, running it at most once across containers.
+    
+    Args:
+        bucket: Data bucket name
+        key: Cache key from query_cache_key
+        run_query: Runs the query and returns its rows
+        lease_seconds: How long a lease holder may take before others take over
+        wait_seconds: How long to wait for another container's result before
+            running the query here
+        poll_seconds: Interval between checks while waiting
+    
+    Returns:
+        Tuple of (rows, served_from): "shared_cache" when another container
+        produced the rows, "athena" when this one ran the query
+    """
+    cached, _ = _read(bucket, key)
+    if cached is not None:
+        _stats["hits"] += 1
+        return cached["rows"], "shared_cache"
+    
+    _stats["misses"] += 1
+    lock_key = key + ".lock"
+    deadline = time.monotonic() + wait_seconds
+    
+    while not _acquire_lease(bucket, lock_key, lease_seconds):
+        if time.monotonic() >= deadline:
+            print(f"Gave up waiting for s3://{bucket}/{key}, querying directly")
+            return run_query(), "athena"
+        
+        _stats["waits"] += 1
+        time.sleep(poll_seconds)
+        cached, _ = _read(bucket, key)
+        if cached is not None:
+            return cached["rows"], "shared_cache"
+    
+    s3 = get_client("s3")
+    try:
+        # Another container may have finished between our read and the lease
+        cached, _ = _read(bucket, key)
+        if cached is not None:
+            return cached["rows"], "shared_cache"
+        
+        rows = run_query()
+        body = json.dumps({"rows": rows, "created_at": time.time()}).encode("utf-8")
+        s3.put_object(Bucket=bucket, Key=key, Body=body, ContentType="application/json")
+        return rows, "athena"
+    finally:
+        try:
+            s3.delete_object(Bucket=bucket, Key=lock_key)
+        except ClientError as e:
+            # The lease expires on its own
+            print(f"Could not release s3://{bucket}/{lock_key}: {e}")
+
+
+def shared_cache_stats() -> Dict[str, int]:
+    """Shared cache counters since the container started."""
+    return dict(_stats)
+
+
+def reset_stats() -> None:
+    """Reset the counters."""
+    for name in _stats:
+        _stats[name] = 0
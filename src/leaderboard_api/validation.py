@@ -21,12 +21,7 @@ def parse_params(event: Dict[str, Any]) -> Dict[str, Any]:
     query_params = event.get("queryStringParameters", {}) or {}
     
     # Extract and validate kingdom (required)
-    kingdom = query_params.get("kingdom")
-    if not kingdom:
-        raise ValueError("kingdom parameter is required")
-    
-    if not re.match(r"^\d{1,6}$", kingdom):
-        raise ValueError("kingdom must be 1-6 digits")
+    kingdom = parse_kingdom(event)
     
     # Extract and validate metric (required)
     metric = query_params.get("metric")
@@ -59,6 +54,68 @@ def parse_params(event: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
+def parse_kingdom(event: Dict[str, Any]) -> str:
+    """Parse and validate the required kingdom parameter.
+    
+    Args:
+        event: API Gateway HTTP API event
+        
+    Returns:
+        Kingdom ID
+        
+    Raises:
+        ValueError: If kingdom is missing or not 1-6 digits
+    """
+    query_params = event.get("queryStringParameters", {}) or {}
+    
+    kingdom = query_params.get("kingdom")
+    if not kingdom:
+        raise ValueError("kingdom parameter is required")
+    
+    if not re.match(r"^\d{1,6}$", kingdom):
+        raise ValueError("kingdom must be 1-6 digits")
+    
+    return kingdom
+
+
+def parse_player_params(event: Dict[str, Any]) -> Dict[str, Any]:
+    """Parse and validate parameters of a player history request.
+    
+    Args:
+        event: API Gateway HTTP API event
+        
+    Returns:
+        Normalized parameters dict with keys: kingdom, id, metrics
+        
+    Raises:
+        ValueError: If any parameter is invalid
+    """
+    query_params = event.get("queryStringParameters", {}) or {}
+    
+    kingdom = parse_kingdom(event)
+    
+    # Extract and validate id (required)
+    player_id = query_params.get("id")
+    if not player_id:
+        raise ValueError("id parameter is required")
+    
+    if not re.match(r"^\d{1,12}$", player_id):
+        raise ValueError("id must be 1-12 digits")
+    
+    # Extract and validate metrics (optional, comma-separated, defaults to all)
+    metrics_param = query_params.get("metrics", "")
+    metrics = [m for m in metrics_param.split(",") if m]
+    for metric in metrics:
+        if not is_valid_metric(metric):
+            raise ValueError(f"unknown metric: {metric}")
+    
+    return {
+        "kingdom": kingdom,
+        "id": player_id,
+        "metrics": metrics
+    }
+
+
 def get_cors_headers() -> Dict[str, str]:
     """Get comprehensive CORS headers for API responses.
     
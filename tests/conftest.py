@@ -0,0 +1,160 @@
+"""Shared pytest fixtures."""
+
+import hashlib
+import io
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+from botocore.exceptions import ClientError
+from botocore.response import StreamingBody
+
+# The leaderboard API ships as a flat Lambda bundle and imports its modules
+# by bare name ("from config import Config")
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src" / "leaderboard_api"))
+
+
+class FakeS3Client:
+    """In-memory stand-in for the subset of the boto3 S3 client we use."""
+    
+    def __init__(self):
+        self.objects = {}
+        self.calls = []
+        self._uploads = {}
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _etag(data):
+        return f'"{hashlib.md5(data).hexdigest()}"'
+    
+    def _get(self, bucket, key):
+        if (bucket, key) not in self.objects:
+            raise ClientError({"Error": {"Code": "NoSuchKey", "Message": key}}, "GetObject")
+        return self.objects[(bucket, key)]
+    
+    def put_object(self, Bucket, Key, Body=b"", IfMatch=None, IfNoneMatch=None, **kwargs):
+        self.calls.append("put_object")
+        data = Body if isinstance(Body, bytes) else Body.read()
+        with self._lock:
+            current = self.objects.get((Bucket, Key))
+            if (IfNoneMatch == "*" and current is not None) or (
+                IfMatch is not None and (current is None or self._etag(current) != IfMatch)
+            ):
+                raise ClientError({"Error": {"Code": "PreconditionFailed", "Message": Key}}, "PutObject")
+            self.objects[(Bucket, Key)] = data
+        return {"ETag": self._etag(data)}
+    
+    def get_object(self, Bucket, Key, **kwargs):
+        self.calls.append("get_object")
+        data = self._get(Bucket, Key)
+        return {
+            "Body": StreamingBody(io.BytesIO(data), len(data)),
+            "ContentLength": len(data),
+            "ETag": self._etag(data),
+        }
+    
+    def head_object(self, Bucket, Key, **kwargs):
+        self.calls.append("head_object")
+        if (Bucket, Key) not in self.objects:
+            raise ClientError({"Error": {"Code": "404", "Message": "Not Found"}}, "HeadObject")
+        data = self.objects[(Bucket, Key)]
+        return {"ETag": self._etag(data), "ContentLength": len(data)}
+    
+    def list_objects_v2(self, Bucket, Prefix="", ContinuationToken=None, MaxKeys=2, **kwargs):
+        # Tiny pages so callers have to follow continuation tokens
+        self.calls.append("list_objects_v2")
+        keys = sorted(k for b, k in self.objects if b == Bucket and k.startswith(Prefix))
+        start = int(ContinuationToken or 0)
+        page = keys[start:start + MaxKeys]
+        response = {
+            "Contents": [{"Key": k, "Size": len(self.objects[(Bucket, k)])} for k in page],
+            "IsTruncated": start + MaxKeys < len(keys),
+        }
+        if response["IsTruncated"]:
+            response["NextContinuationToken"] = str(start + MaxKeys)
+        return response
+    
+    def copy_object(self, Bucket, Key, CopySource, **kwargs):
+        self.calls.append("copy_object")
+        self.objects[(Bucket, Key)] = self._get(CopySource["Bucket"], CopySource["Key"])
+        return {}
+    
+    def delete_object(self, Bucket, Key, **kwargs):
+        self.calls.append("delete_object")
+        self.objects.pop((Bucket, Key), None)
+        return {}
+    
+    def download_file(self, bucket, key, filename):
+        self.calls.append("download_file")
+        with open(filename, "wb") as f:
+            f.write(self._get(bucket, key))
+    
+    def upload_file(self, filename, bucket, key):
+        self.calls.append("upload_file")
+        with open(filename, "rb") as f:
+            self.objects[(bucket, key)] = f.read()
+    
+    def create_multipart_upload(self, Bucket, Key, **kwargs):
+        self.calls.append("create_multipart_upload")
+        upload_id = f"upload-{len(self._uploads) + 1}"
+        self._uploads[upload_id] = {}
+        return {"UploadId": upload_id}
+    
+    def upload_part(self, Bucket, Key, UploadId, PartNumber, Body, **kwargs):
+        self.calls.append("upload_part")
+        self._uploads[UploadId][PartNumber] = Body
+        return {"ETag": f'"part-{PartNumber}"'}
+    
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload, **kwargs):
+        self.calls.append("complete_multipart_upload")
+        parts = self._uploads.pop(UploadId)
+        numbers = [part["PartNumber"] for part in MultipartUpload["Parts"]]
+        self.objects[(Bucket, Key)] = b"".join(parts[n] for n in numbers)
+        return {}
+    
+    def abort_multipart_upload(self, Bucket, Key, UploadId, **kwargs):
+        self.calls.append("abort_multipart_upload")
+        self._uploads.pop(UploadId, None)
+        return {}
+
+
+@pytest.fixture
+def fake_s3(monkeypatch):
+    """Route ingest_players S3 calls to an in-memory FakeS3Client."""
+    from ingest_players import aws_s3
+    
+    client = FakeS3Client()
+    monkeypatch.setattr(aws_s3, "s3_client", client)
+    return client
+
+
+@pytest.fixture
+def api_s3(fake_s3, monkeypatch):
+    """Route leaderboard API S3 calls to the same in-memory FakeS3Client."""
+    import clients
+    
+    monkeypatch.setitem(clients._clients, ("s3", None), fake_s3)
+    return fake_s3
+
+
+@pytest.fixture(autouse=True)
+def fresh_api_config():
+    """Reload the leaderboard API config and reset its caches per test, as a new container would."""
+    from catalog import clear_cache as clear_catalog_cache
+    from config import get_config
+    from result_cache import clear_cache
+    from serving_store import close_stores
+    from shared_cache import reset_stats
+    
+    get_config.cache_clear()
+    clear_cache()
+    clear_catalog_cache()
+    reset_stats()
+    close_stores()
+    yield
+    get_config.cache_clear()
+    clear_cache()
+    clear_catalog_cache()
+    reset_stats()
+    close_stores()
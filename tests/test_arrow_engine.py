@@ -0,0 +1,108 @@
+"""Tests for the Arrow-native ingestion engine."""
+
+import json
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from ingest_players.handler import process_ingestion
+
+
+def normalized_schema(path: str) -> dict:
+    """Map column name to Arrow type, treating large_string as string."""
+    schema = pq.read_schema(path)
+    return {
+        field.name: pa.string() if pa.types.is_large_string(field.type) else field.type
+        for field in schema
+    }
+
+
+@pytest.fixture
+def players_csv(tmp_path):
+    """CSV with ints, float-formatted ints, blanks, an undeclared column and unicode names."""
+    path = tmp_path / "players.csv"
+    pd.DataFrame({
+        "ID": ["1001", " 1002", "1003"],
+        "Name": ["Alice", None, "王"],
+        "Power": [1000, 2000, 1500],
+        "T4 Kills": [1.0, None, 3.0],
+        "Joined": ["2025-01-01", "2025-02-01", "2025-03-01"],
+    }).to_csv(path, index=False)
+    return path
+
+
+def test_arrow_engine_schema_matches_pandas(tmp_path, players_csv):
+    """Test that both engines write schema-equivalent curated Parquet."""
+    pandas_result = process_ingestion(
+        str(players_csv), "51", "2026-01-26", str(tmp_path / "pandas"), engine="pandas"
+    )
+    arrow_result = process_ingestion(
+        str(players_csv), "51", "2026-01-26", str(tmp_path / "arrow"), engine="arrow"
+    )
+    
+    assert arrow_result["engine"] == "arrow"
+    assert arrow_result["rows"] == pandas_result["rows"] == 3
+    assert normalized_schema(arrow_result["curated_path"]) == normalized_schema(pandas_result["curated_path"])
+    
+    pandas_df = pd.read_parquet(pandas_result["curated_path"])
+    arrow_df = pd.read_parquet(arrow_result["curated_path"])
+    assert list(arrow_df["id"]) == ["1001", "1002", "1003"]
+    assert list(arrow_df["record_hash"]) == list(pandas_df["record_hash"])
+
+
+def test_arrow_engine_reads_json_array_and_ndjson(tmp_path):
+    """Test that the Arrow engine accepts both JSON layouts."""
+    records = [{"id": "p1", "power": 10}, {"id": "p2", "power": 20}]
+    array_path = tmp_path / "array.json"
+    array_path.write_text(json.dumps(records))
+    lines_path = tmp_path / "lines.json"
+    lines_path.write_text("\n".join(json.dumps(r) for r in records))
+    
+    for path in (array_path, lines_path):
+        result = process_ingestion(str(path), "51", "2026-01-26", str(tmp_path / path.stem), engine="arrow")
+        assert result["rows"] == 2
+
+
+def test_arrow_engine_unifies_json_batch_schemas(tmp_path, monkeypatch):
+    """Test that batches inferring different columns and types read as one table."""
+    from ingest_players import arrow_engine
+    
+    iter_batches = arrow_engine.iter_json_batches
+    monkeypatch.setattr(arrow_engine, "iter_json_batches", lambda source: iter_batches(source, batch_rows=1))
+    path = tmp_path / "players.json"
+    path.write_text(json.dumps([
+        {"id": "p1", "power": None},
+        {"id": "p2", "power": 20, "deads": 3},
+    ]))
+    
+    table = arrow_engine.read_table(str(path), "json")
+    
+    assert table.column("power").to_pylist() == [None, 20]
+    assert table.column("deads").to_pylist() == [None, 3]
+
+
+@pytest.mark.parametrize("ids, message", [
+    (["p1", "p2", "p1"], "duplicate values"),
+    (["p1", None, "p3"], "null values"),
+    (["p1", "  ", "p3"], "empty values"),
+])
+def test_arrow_engine_validation(tmp_path, ids, message):
+    """Test that compute-kernel validation rejects bad ids like the pandas engine."""
+    path = tmp_path / "bad.json"
+    path.write_text(json.dumps([{"id": i, "power": 1} for i in ids]))
+    
+    with pytest.raises(ValueError, match=message):
+        process_ingestion(str(path), "51", "2026-01-26", str(tmp_path / "out"), engine="arrow")
+    
+    assert not list((tmp_path / "out").rglob("*.parquet"))
+
+
+def test_arrow_engine_missing_id(tmp_path):
+    """Test that a missing id column is rejected."""
+    path = tmp_path / "bad.csv"
+    pd.DataFrame({"name": ["a"], "power": [1]}).to_csv(path, index=False)
+    
+    with pytest.raises(ValueError, match="Missing required columns"):
+        process_ingestion(str(path), "51", "2026-01-26", str(tmp_path / "out"), engine="arrow")
@@ -0,0 +1,103 @@
+"""Tests for adaptive Athena completion polling."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "benchmarks"))
+
+import athena
+from athena import FIXED_POLL_POLICY, PollPolicy, QueryTrace, wait_for_query
+from bench_athena_polling import SimulatedAthena, simulate
+
+
+@pytest.fixture
+def simulated(monkeypatch):
+    """Simulated Athena registered as the container's client."""
+    import clients
+    
+    sim = SimulatedAthena(round_trip_ms=20)
+    monkeypatch.setitem(clients._clients, ("athena", "us-east-1"), sim)
+    return sim
+
+
+def test_delays_back_off_to_cap_with_bounded_jitter():
+    """Test that delays grow from first_delay to max_delay within the jitter band."""
+    policy = PollPolicy(first_delay=0.1, max_delay=0.3, multiplier=1.2, jitter=0.2)
+    
+    assert [round(policy.delay(i, rng=lambda: 0.5), 3) for i in range(8)] == [
+        0.1, 0.12, 0.144, 0.173, 0.207, 0.249, 0.299, 0.3,
+    ]
+    assert policy.delay(20, rng=lambda: 0.0) == pytest.approx(0.24)
+    assert policy.delay(20, rng=lambda: 1.0) == pytest.approx(0.36)
+
+
+def test_trace_records_athena_statistics(simulated):
+    """Test that queue, engine and polling overhead are recorded."""
+    simulated.submit(queue_ms=100, engine_ms=600)
+    trace = QueryTrace()
+    
+    wait_for_query("q", "us-east-1", trace=trace, sleep=simulated.sleep, clock=simulated.clock)
+    
+    assert (trace.queue_ms, trace.engine_ms, trace.total_ms) == (100, 600, 740)
+    assert trace.polls > 1
+    assert 0 < trace.polling_overhead_ms < 400
+    assert trace.to_dict()["polling_overhead_ms"] == round(trace.polling_overhead_ms, 1)
+
+
+def test_wait_stops_at_timeout_without_oversleeping(simulated):
+    """Test that the last sleep is cut to the deadline and the wait times out."""
+    simulated.submit(queue_ms=0, engine_ms=60_000)
+    
+    with pytest.raises(TimeoutError):
+        wait_for_query("q", "us-east-1", timeout_seconds=2, sleep=simulated.sleep, clock=simulated.clock)
+    
+    assert 2.0 <= simulated.now < 2.1
+
+
+def test_failed_query_raises(monkeypatch):
+    """Test that a failed execution surfaces its reason."""
+    import clients
+    
+    class Failed:
+        def get_query_execution(self, QueryExecutionId):
+            return {"QueryExecution": {"Status": {"State": "FAILED", "StateChangeReason": "bad column"}}}
+    
+    monkeypatch.setitem(clients._clients, ("athena", "us-east-1"), Failed())
+    
+    with pytest.raises(Exception, match="bad column"):
+        wait_for_query("q", "us-east-1", sleep=lambda s: None)
+
+
+def test_handler_bounds_wait_by_remaining_lambda_time(monkeypatch):
+    """Test that the Athena wait never outlives the invocation."""
+    import handler
+    from config import get_config
+    
+    class Context:
+        def get_remaining_time_in_millis(self):
+            return 4000
+    
+    config = get_config()
+    assert handler.query_timeout(config, Context()) == pytest.approx(4.0 - handler.RESPONSE_RESERVE_SECONDS)
+    assert handler.query_timeout(config, None) == config.athena_timeout_seconds
+    
+    waits = []
+    monkeypatch.setattr(handler, "start_query", lambda *args: "qid")
+    monkeypatch.setattr(handler, "wait_for_query", lambda qid, region, **kwargs: waits.append(kwargs))
+    monkeypatch.setattr(handler, "get_results", lambda qid, region: [])
+    handler.run_athena_query(config, "SELECT 1", "test", Context())
+    
+    assert waits[0]["timeout_seconds"] == pytest.approx(3.5)
+    assert isinstance(waits[0]["trace"], athena.QueryTrace)
+
+
+def test_adaptive_polling_beats_fixed_sleep_in_simulation():
+    """Test that the adaptive waiter cuts p50 and p99 latency in the harness."""
+    fixed = simulate(FIXED_POLL_POLICY, queries=500)
+    adaptive = simulate(PollPolicy(), queries=500)
+    
+    assert adaptive["p50_ms"] < fixed["p50_ms"]
+    assert adaptive["p99_ms"] < fixed["p99_ms"]
+    assert adaptive["overhead_p99_ms"] <= PollPolicy().max_delay * 1000 * 1.3
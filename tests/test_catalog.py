@@ -0,0 +1,126 @@
+"""Tests for the snapshot catalog manifest and its API lookups."""
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+
+from ingest_players.catalog import merge_snapshot, snapshot_entry, update_s3_catalog
+from ingest_players.handler import process_ingestion, process_s3_ingestion
+
+BUCKET = "test-bucket"
+CATALOG_KEY = "catalog/source=rok_players/kingdom=51/snapshots.json"
+
+
+def entry(dt, rows=1):
+    return snapshot_entry(dt, rows, f"run-{dt}", "20260126T000000Z", f"curated/{dt}")
+
+
+def test_merge_snapshot_sorts_and_replaces():
+    """Test that entries stay sorted by date and a re-ingested date is replaced."""
+    document = merge_snapshot(None, "rok_players", "51", entry("2026-01-27"))
+    document = merge_snapshot(document, "rok_players", "51", entry("2026-01-25"))
+    document = merge_snapshot(document, "rok_players", "51", entry("2026-01-27", rows=9))
+    
+    assert [s["dt"] for s in document["snapshots"]] == ["2026-01-25", "2026-01-27"]
+    assert document["snapshots"][-1]["rows"] == 9
+    assert document["latest"] == "2026-01-27"
+
+
+def test_concurrent_s3_updates_keep_every_entry(fake_s3):
+    """Test that racing writers retry instead of dropping each other's entries."""
+    dates = [f"2026-01-{day:02d}" for day in range(1, 17)]
+    
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda dt: update_s3_catalog(BUCKET, "rok_players", "51", entry(dt), 50), dates))
+    
+    document = json.loads(fake_s3.objects[(BUCKET, CATALOG_KEY)])
+    assert [s["dt"] for s in document["snapshots"]] == dates
+
+
+def test_s3_ingestion_records_snapshot(fake_s3):
+    """Test that an S3 ingestion lists its snapshot with rows and run_id."""
+    key = "inbox/source=rok_players/kingdom=51/dt=2026-01-26/players.csv"
+    fake_s3.objects[(BUCKET, key)] = pd.DataFrame({"id": ["1", "2"]}).to_csv(index=False).encode()
+    
+    summary = process_s3_ingestion(BUCKET, key, streaming=True)
+    
+    snapshot = json.loads(fake_s3.objects[(BUCKET, CATALOG_KEY)])["snapshots"][0]
+    assert snapshot["dt"] == "2026-01-26"
+    assert snapshot["rows"] == 2
+    assert snapshot["run_id"] == summary["run_id"]
+
+
+def test_local_ingestion_records_snapshots(tmp_path):
+    """Test that local runs build up the kingdom's catalog."""
+    input_path = tmp_path / "players.csv"
+    pd.DataFrame({"id": ["1"]}).to_csv(input_path, index=False)
+    
+    for dt in ("2026-01-26", "2026-01-25"):
+        process_ingestion(str(input_path), "51", dt, out_dir=str(tmp_path / "out"))
+    
+    document = json.loads((tmp_path / "out" / CATALOG_KEY).read_bytes())
+    assert document["latest"] == "2026-01-26"
+    assert len(document["snapshots"]) == 2
+
+
+@pytest.fixture
+def api(api_s3, monkeypatch):
+    """Leaderboard API modules wired to the fake S3 and barred from Athena."""
+    import handler
+    
+    monkeypatch.setattr(handler, "start_query", pytest.fail)
+    monkeypatch.setenv("DATA_BUCKET", BUCKET)
+    return handler
+
+
+def test_latest_resolved_from_cached_manifest(api, fake_s3, monkeypatch):
+    """Test that "latest" comes from the manifest and is cached until the TTL expires."""
+    import catalog
+    
+    clock = [1000.0]
+    monkeypatch.setattr(catalog.time, "monotonic", lambda: clock[0])
+    config = api.Config.from_env()
+    
+    document = merge_snapshot(None, "rok_players", "51", entry("2026-01-26"))
+    fake_s3.objects[(BUCKET, CATALOG_KEY)] = json.dumps(document).encode()
+    assert api.resolve_latest_dt(config, "51") == "2026-01-26"
+    
+    document = merge_snapshot(document, "rok_players", "51", entry("2026-01-27"))
+    fake_s3.objects[(BUCKET, CATALOG_KEY)] = json.dumps(document).encode()
+    assert api.resolve_latest_dt(config, "51") == "2026-01-26"
+    assert fake_s3.calls.count("get_object") == 1
+    
+    clock[0] += config.catalog_ttl_seconds + 1
+    assert api.resolve_latest_dt(config, "51") == "2026-01-27"
+
+
+def test_latest_falls_back_to_athena_without_manifest(api, monkeypatch):
+    """Test that kingdoms without a manifest still resolve through Athena."""
+    monkeypatch.setattr(api, "start_query", lambda *args: "qid")
+    monkeypatch.setattr(api, "wait_for_query", lambda *args, **kwargs: None)
+    monkeypatch.setattr(api, "get_results", lambda *args: [{"dt": "2026-01-20"}])
+    
+    assert api.resolve_latest_dt(api.Config.from_env(), "51") == "2026-01-20"
+
+
+def test_snapshots_endpoint(api, fake_s3):
+    """Test that /snapshots lists dates and 404s for an unknown kingdom."""
+    document = merge_snapshot(None, "rok_players", "51", entry("2026-01-25", rows=3))
+    document = merge_snapshot(document, "rok_players", "51", entry("2026-01-26", rows=4))
+    fake_s3.objects[(BUCKET, CATALOG_KEY)] = json.dumps(document).encode()
+    
+    event = {"requestContext": {"http": {"method": "GET", "path": "/snapshots"}}}
+    response = api.lambda_handler({**event, "queryStringParameters": {"kingdom": "51"}}, None)
+    payload = json.loads(response["body"])
+    
+    assert response["statusCode"] == 200
+    assert payload["latest"] == "2026-01-26"
+    assert [(s["dt"], s["rows"]) for s in payload["snapshots"]] == [("2026-01-25", 3), ("2026-01-26", 4)]
+    
+    response = api.lambda_handler({**event, "queryStringParameters": {"kingdom": "52"}}, None)
+    assert response["statusCode"] == 404
+    
+    response = api.lambda_handler({**event, "queryStringParameters": {"kingdom": "abc"}}, None)
+    assert response["statusCode"] == 400
@@ -0,0 +1,85 @@
+"""Tests for bounded-memory chunked ingestion."""
+
+import io
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ingest_players.handler import process_ingestion, process_s3_ingestion
+
+
+def write_players_csv(path: Path, rows: int) -> pd.DataFrame:
+    """Write a players CSV with a blank power value late in the file."""
+    df = pd.DataFrame({
+        "ID": [str(1000 + i) for i in range(rows)],
+        "Name": [f"player{i}" for i in range(rows)],
+        "Power": np.arange(rows, dtype="float64") * 10,
+    })
+    df.loc[rows - 1, "Power"] = np.nan
+    df.to_csv(path, index=False)
+    return df
+
+
+def test_chunked_matches_whole_file(tmp_path):
+    """Test that chunked mode writes the same rows as whole-file mode."""
+    input_csv = tmp_path / "players.csv"
+    write_players_csv(input_csv, 25)
+    
+    whole = process_ingestion(str(input_csv), "51", "2026-01-26", str(tmp_path / "whole"))
+    chunked = process_ingestion(
+        str(input_csv), "51", "2026-01-26", str(tmp_path / "chunked"), chunk_rows=10
+    )
+    
+    assert chunked["rows"] == whole["rows"] == 25
+    assert chunked["peak_rss_mb"] > 0
+    
+    whole_df = pd.read_parquet(whole["curated_path"])
+    chunked_df = pd.read_parquet(chunked["curated_path"])
+    
+    cols = ["id", "name", "power", "kingdom", "snapshot_date"]
+    pd.testing.assert_frame_equal(whole_df[cols], chunked_df[cols], check_dtype=False)
+    assert chunked_df["run_id"].nunique() == 1
+    assert chunked_df["ingested_at"].nunique() == 1
+    assert chunked_df["record_hash"].nunique() == 25
+
+
+def test_chunked_writes_one_row_group_per_chunk(tmp_path):
+    """Test that each chunk is appended as its own row group."""
+    import pyarrow.parquet as pq
+    
+    input_csv = tmp_path / "players.csv"
+    write_players_csv(input_csv, 25)
+    
+    result = process_ingestion(str(input_csv), "51", "2026-01-26", str(tmp_path), chunk_rows=10)
+    
+    assert pq.ParquetFile(result["curated_path"]).num_row_groups == 3
+
+
+def test_chunked_detects_duplicates_across_chunks(tmp_path):
+    """Test that an id repeated in a later chunk fails the whole ingestion."""
+    input_csv = tmp_path / "players.csv"
+    df = write_players_csv(input_csv, 25)
+    df.loc[22, "ID"] = df.loc[3, "ID"]
+    df.to_csv(input_csv, index=False)
+    
+    with pytest.raises(ValueError, match="duplicate values"):
+        process_ingestion(str(input_csv), "51", "2026-01-26", str(tmp_path / "out"), chunk_rows=10)
+    
+    # No partial curated snapshot is left behind
+    assert not list((tmp_path / "out").rglob("*.parquet"))
+
+
+def test_chunked_streaming_s3(fake_s3, tmp_path):
+    """Test chunked mode through the streaming S3 path."""
+    input_csv = tmp_path / "players.csv"
+    write_players_csv(input_csv, 25)
+    key = "inbox/source=rok_players/kingdom=51/dt=2026-01-26/players.csv"
+    fake_s3.objects[("bucket", key)] = input_csv.read_bytes()
+    
+    result = process_s3_ingestion("bucket", key, streaming=True, chunk_rows=10)
+    
+    assert result["rows"] == 25
+    curated = pd.read_parquet(io.BytesIO(fake_s3.objects[("bucket", result["curated_key"])]))
+    assert len(curated) == 25
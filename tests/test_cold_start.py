@@ -0,0 +1,29 @@
+"""Tests that both Lambda handlers keep heavy imports out of module load."""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+HEAVY_MODULES = ("pandas", "pyarrow", "numpy", "boto3")
+
+
+def loaded_after_import(module: str, path: Path) -> list:
+    code = (
+        f"import json, sys; sys.path.insert(0, {str(path)!r}); import {module}; "
+        f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+    )
+    output = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout
+    return json.loads(output)
+
+
+def test_ingest_handler_import_is_light():
+    """Test that pandas, pyarrow and boto3 load on first use, not at init."""
+    assert loaded_after_import("ingest_players.handler", SRC) == []
+
+
+def test_leaderboard_handler_import_is_light():
+    """Test that the API defers boto3 and pyarrow until a request needs them."""
+    assert loaded_after_import("handler", SRC / "leaderboard_api") == []
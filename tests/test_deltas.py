@@ -0,0 +1,115 @@
+"""Tests for snapshot-to-snapshot deltas."""
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from ingest_players.deltas import SnapshotCollector, compute_delta, previous_snapshot
+from ingest_players.handler import process_ingestion, process_s3_ingestion
+
+BUCKET = "test-bucket"
+
+
+@pytest.fixture
+def snapshots():
+    """Two snapshots: one unchanged, one grown, one new and one departed player."""
+    previous = pa.table({
+        "id": ["1", "2", "4"],
+        "name": ["A", "B", "D"],
+        "power": [100, 50, 80],
+        "deads": [1, 2, 3],
+        "record_hash": ["h1", "h2", "h4"],
+    })
+    current = pa.table({
+        "id": ["1", "2", "3"],
+        "name": ["A", "B2", "C"],
+        "power": [100, 150, 10],
+        "deads": [1, 5, 0],
+        "record_hash": ["h1", "h2b", "h3"],
+    })
+    return current, previous
+
+
+def test_delta_statuses_and_gains(snapshots):
+    """Test per-metric deltas for changed rows and nulls for new/departed players."""
+    delta = compute_delta(*snapshots, rank_columns=()).to_pydict()
+    
+    assert delta["id"] == ["2", "3", "4"]
+    assert delta["status"] == ["changed", "new", "departed"]
+    assert delta["name"] == ["B2", "C", "D"]
+    assert delta["power_delta"] == [100, None, None]
+    assert delta["deads_delta"] == [3, None, None]
+
+
+def test_delta_rank_movement_keeps_shifted_unchanged_rows(snapshots):
+    """Test that an unchanged player pushed down by another is still reported."""
+    delta = compute_delta(*snapshots, rank_columns=("power",)).to_pandas().set_index("id")
+    
+    # Player 2 overtook player 1, whose record did not change
+    assert delta.loc["1", "status"] == "unchanged"
+    assert delta.loc["1", "power_delta"] == 0
+    assert delta.loc["1", "power_rank_change"] == -1
+    assert delta.loc["2", "power_rank"] == 1
+    assert delta.loc["2", "power_rank_change"] == 2
+
+
+def test_delta_builder_collects_chunks(snapshots):
+    """Test that chunked collection gives the same delta as the whole table."""
+    current, previous = snapshots
+    builder = SnapshotCollector()
+    builder.add(current.slice(0, 1))
+    builder.add(current.slice(1))
+    
+    assert compute_delta(builder.table(), previous).equals(compute_delta(current, previous))
+
+
+def test_delta_builder_unifies_chunk_schemas():
+    """Test that chunks with different columns or widths collect into one schema."""
+    builder = SnapshotCollector()
+    builder.add(pa.table({"id": ["1"], "power": pa.array([None], pa.null())}))
+    builder.add(pa.table({"id": ["2"], "power": pa.array([7], pa.int32()), "deads": pa.array([1], pa.int64())}))
+    
+    table = builder.table()
+    
+    assert table.schema.field("power").type == pa.int32()
+    assert table.to_pydict() == {"id": ["1", "2"], "power": [None, 7], "deads": [None, 1]}
+
+
+def test_previous_snapshot_picks_latest_earlier_date():
+    """Test previous-snapshot selection from catalog entries."""
+    entries = [{"dt": "2026-01-20"}, {"dt": "2026-01-25"}, {"dt": "2026-01-30"}]
+    
+    assert previous_snapshot(entries, "2026-01-27")["dt"] == "2026-01-25"
+    assert previous_snapshot(entries, "2026-01-20") is None
+    assert previous_snapshot(None, "2026-01-20") is None
+
+
+def test_local_ingestion_writes_delta(tmp_path):
+    """Test that the second local snapshot gets a delta against the first."""
+    out_dir = str(tmp_path / "out")
+    first = tmp_path / "first.csv"
+    second = tmp_path / "second.csv"
+    pd.DataFrame({"id": ["1", "2"], "power": [10, 20]}).to_csv(first, index=False)
+    pd.DataFrame({"id": ["1", "2"], "power": [10, 35]}).to_csv(second, index=False)
+    
+    assert process_ingestion(str(first), "51", "2026-01-25", out_dir=out_dir)["delta_path"] is None
+    summary = process_ingestion(str(second), "51", "2026-01-26", out_dir=out_dir)
+    
+    assert summary["prev_dt"] == "2026-01-25"
+    delta = pq.read_table(summary["delta_path"]).to_pydict()
+    assert delta["id"] == ["2"]
+    assert delta["power_delta"] == [15]
+
+
+def test_s3_ingestion_writes_delta(fake_s3):
+    """Test that S3 ingestion reads the previous curated snapshot and writes a delta."""
+    for dt, power in (("2026-01-25", [10, 20]), ("2026-01-26", [12, 20])):
+        key = f"inbox/source=rok_players/kingdom=51/dt={dt}/players.csv"
+        fake_s3.objects[(BUCKET, key)] = pd.DataFrame({"id": ["1", "2"], "power": power}).to_csv(index=False).encode()
+        summary = process_s3_ingestion(BUCKET, key, streaming=True)
+    
+    assert summary["delta_key"] == "deltas/source=rok_players/kingdom=51/dt=2026-01-26/players_delta.parquet"
+    delta = pq.read_table(pa.BufferReader(fake_s3.objects[(BUCKET, summary["delta_key"])])).to_pydict()
+    assert delta["id"] == ["1"]
+    assert delta["power_delta"] == [2]
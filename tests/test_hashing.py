@@ -0,0 +1,108 @@
+"""Tests for record hashing."""
+
+import hashlib
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ingest_players.hashing import add_record_hash, compute_record_hashes
+
+
+def legacy_record_hash(df: pd.DataFrame) -> pd.Series:
+    """Reference copy of the original per-row apply implementation."""
+    exclude_cols = {"record_hash", "ingested_at", "run_id", "kingdom", "snapshot_date"}
+    hash_cols = sorted([col for col in df.columns if col not in exclude_cols])
+    
+    def hash_row(row):
+        values = [str(row[col]) for col in hash_cols]
+        return hashlib.sha256("|".join(values).encode("utf-8")).hexdigest()
+    
+    return df.apply(hash_row, axis=1)
+
+
+@pytest.fixture
+def mixed_df():
+    """DataFrame with the dtypes a real export produces, including blanks."""
+    return pd.DataFrame({
+        "id": ["1001", "1002", "1003", "1004"],
+        "name": ["Alice", "Bøb 王", None, "D|ave"],
+        "power": [1000, 2000, 3000, 4000],
+        "t4 kills": [1.5, np.nan, 1e16, 0.0],
+        "active": [True, False, True, True],
+        "kingdom": ["51"] * 4,
+        "snapshot_date": ["2026-01-26"] * 4,
+    })
+
+
+def test_sha256_mode_matches_legacy_digests(mixed_df):
+    """Test that sha256 mode is bit-identical to the per-row implementation."""
+    expected = legacy_record_hash(mixed_df).tolist()
+    
+    assert list(compute_record_hashes(mixed_df, mode="sha256")) == expected
+    assert add_record_hash(mixed_df, mode="sha256")["record_hash"].tolist() == expected
+
+
+def test_sha256_mode_matches_legacy_on_all_numeric_frame():
+    """Test that rows upcast by the row-wise apply hash the same."""
+    df = pd.DataFrame({
+        "id": [1001, 1002],
+        "power": [1000, 2000],
+        "t4 kills": [1.5, np.nan],
+    })
+    
+    assert list(compute_record_hashes(df, mode="sha256")) == legacy_record_hash(df).tolist()
+
+
+@pytest.mark.parametrize("filename, body, chunk_rows", [
+    ("players.csv", "id,name,power,deads\n1,A,100,1\n2,B,,2\n3,C,300,3\n4,D,400,4\n", 2),
+    ("players.json", '[{"id":"1","name":null,"power":5},{"id":"2","name":"B","power":null}]', 1),
+])
+def test_digests_do_not_depend_on_chunks_or_engine(tmp_path, filename, body, chunk_rows):
+    """Test that a row hashes the same whole, chunked and through the Arrow engine."""
+    from ingest_players.handler import process_ingestion
+    
+    input_path = tmp_path / filename
+    input_path.write_text(body)
+    runs = {
+        "whole": {"chunk_rows": 0, "engine": "pandas"},
+        "chunked": {"chunk_rows": chunk_rows, "engine": "pandas"},
+        "arrow": {"chunk_rows": 0, "engine": "arrow"},
+    }
+    
+    digests = {}
+    for name, options in runs.items():
+        result = process_ingestion(str(input_path), "51", "2026-01-26", str(tmp_path / name), **options)
+        curated = pd.read_parquet(result["curated_path"]).set_index("id")["record_hash"]
+        digests[name] = curated.sort_index().to_dict()
+    
+    assert digests["chunked"] == digests["whole"]
+    assert digests["arrow"] == digests["whole"]
+
+
+def test_hash_ignores_metadata_columns(mixed_df):
+    """Test that metadata columns do not change the fingerprint."""
+    other = mixed_df.assign(kingdom="99", run_id="x", ingested_at="y")
+    
+    for mode in ("sha256", "fast"):
+        assert list(compute_record_hashes(mixed_df, mode)) == list(compute_record_hashes(other, mode))
+
+
+def test_fast_mode_is_deterministic_and_row_sensitive(mixed_df):
+    """Test that fast mode is stable across calls and differs per row."""
+    first = compute_record_hashes(mixed_df, mode="fast")
+    second = compute_record_hashes(mixed_df.copy(), mode="fast")
+    
+    assert list(first) == list(second)
+    assert all(len(h) == 16 for h in first)
+    assert len(set(first)) == len(mixed_df)
+    
+    changed = mixed_df.copy()
+    changed.loc[0, "power"] = 1001
+    assert compute_record_hashes(changed, mode="fast")[0] != first[0]
+
+
+def test_unknown_hash_mode(mixed_df):
+    """Test that an unsupported mode raises ValueError."""
+    with pytest.raises(ValueError, match="Unsupported hash mode"):
+        compute_record_hashes(mixed_df, mode="md5")
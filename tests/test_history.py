@@ -0,0 +1,153 @@
+"""Tests for the player history dataset and the /player endpoint."""
+
+import json
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from ingest_players.handler import process_ingestion, process_s3_ingestion
+from ingest_players.history import (
+    compact_local_history,
+    compact_s3_history,
+    history_to_parquet_bytes,
+    merge_history,
+    update_s3_history,
+)
+
+BUCKET = "test-bucket"
+HISTORY_KEY = "history/source=rok_players/kingdom=51/players_history.parquet"
+
+
+def snapshot(ids, power):
+    return pa.table({
+        "id": [str(i) for i in ids],
+        "name": [f"p{i}" for i in ids],
+        "alliance": ["A"] * len(ids),
+        "power": pa.array(power, pa.int64()),
+    })
+
+
+def test_merge_history_sorts_and_replaces_date():
+    """Test that rows are sorted by id then date and a re-ingested date is replaced."""
+    history = merge_history(None, snapshot([2, 1], [20, 10]), "2026-01-26")
+    history = merge_history(history, snapshot([1, 2], [11, 21]), "2026-01-19")
+    history = merge_history(history, snapshot([1], [12]), "2026-01-26")
+    
+    assert history.select(["id", "snapshot_date", "power"]).to_pylist() == [
+        {"id": "1", "snapshot_date": "2026-01-19", "power": 11},
+        {"id": "1", "snapshot_date": "2026-01-26", "power": 12},
+        {"id": "2", "snapshot_date": "2026-01-19", "power": 21},
+    ]
+
+
+def test_s3_ingestion_updates_history_incrementally(fake_s3):
+    """Test that each S3 ingestion folds its snapshot into the kingdom's history."""
+    for dt, power in (("2026-01-19", "100"), ("2026-01-26", "150")):
+        key = f"inbox/source=rok_players/kingdom=51/dt={dt}/players.csv"
+        frame = pd.DataFrame({"id": ["7", "8"], "name": ["a", "b"], "power": [power, "5"]})
+        fake_s3.objects[(BUCKET, key)] = frame.to_csv(index=False).encode()
+        summary = process_s3_ingestion(BUCKET, key, streaming=True)
+    
+    assert summary["history_key"] == HISTORY_KEY
+    history = pq.read_table(pa.BufferReader(fake_s3.objects[(BUCKET, HISTORY_KEY)]))
+    assert history.column("id").to_pylist() == ["7", "7", "8", "8"]
+    assert history.column("power").to_pylist() == [100, 150, 5, 5]
+
+
+def test_compaction_matches_incremental_history(tmp_path):
+    """Test that a full rebuild from the catalog equals the incremental file."""
+    out_dir = tmp_path / "out"
+    for dt, power in (("2026-01-26", "2"), ("2026-01-19", "1")):
+        input_path = tmp_path / f"{dt}.csv"
+        pd.DataFrame({"id": ["1", "2"], "power": [power, power]}).to_csv(input_path, index=False)
+        summary = process_ingestion(str(input_path), "51", dt, out_dir=str(out_dir))
+    
+    incremental = pq.read_table(summary["history_path"])
+    report = compact_local_history(str(out_dir), "51")
+    
+    assert (report["snapshots"], report["rows"]) == (2, 4)
+    assert pq.read_table(report["key"]).equals(incremental)
+
+
+def test_s3_compaction_keeps_concurrently_merged_snapshot(fake_s3, monkeypatch):
+    """Test that a merge landing mid-compaction survives it."""
+    from ingest_players import history
+    
+    key = "inbox/source=rok_players/kingdom=51/dt=2026-01-19/players.csv"
+    fake_s3.objects[(BUCKET, key)] = pd.DataFrame({"id": ["7"], "power": ["100"]}).to_csv(index=False).encode()
+    process_s3_ingestion(BUCKET, key)
+    
+    read_catalog = history.read_s3_catalog
+    merged = []
+    
+    def read_catalog_during_ingestion(*args):
+        # An ingestion merges its history, but has not committed its catalog entry yet
+        if not merged:
+            merged.append(update_s3_history(BUCKET, "rok_players", "51", "2026-01-26", snapshot([7], [150])))
+        return read_catalog(*args)
+    
+    monkeypatch.setattr(history, "read_s3_catalog", read_catalog_during_ingestion)
+    report = compact_s3_history(BUCKET, "rok_players", "51")
+    
+    table = pq.read_table(pa.BufferReader(fake_s3.objects[(BUCKET, HISTORY_KEY)]))
+    assert (report["snapshots"], report["rows"]) == (1, 2)
+    assert table.select(["snapshot_date", "power"]).to_pylist() == [
+        {"snapshot_date": "2026-01-19", "power": 100},
+        {"snapshot_date": "2026-01-26", "power": 150},
+    ]
+
+
+@pytest.fixture
+def player_api(tmp_path, monkeypatch):
+    """Leaderboard API handler reading a local many-row-group history file."""
+    import handler
+    
+    ids = list(range(1, 1001))
+    history = merge_history(None, snapshot(ids, ids), "2026-01-19")
+    history = merge_history(history, snapshot(ids, [i * 2 for i in ids]), "2026-01-26")
+    path = tmp_path / "players_history.parquet"
+    path.write_bytes(history_to_parquet_bytes(history, row_group_size=100))
+    
+    opened = []
+    
+    def open_local(bucket, key, region):
+        opened.append(key)
+        return pq.ParquetFile(str(path))
+    
+    monkeypatch.setattr(handler, "open_history", open_local)
+    monkeypatch.setenv("DATA_BUCKET", BUCKET)
+    handler.opened = opened
+    return handler
+
+
+def player_event(**params):
+    return {
+        "requestContext": {"http": {"method": "GET", "path": "/player"}},
+        "queryStringParameters": params,
+    }
+
+
+def test_player_endpoint_reads_covering_row_groups(player_api):
+    """Test that a lookup returns the timeline from one of twenty row groups."""
+    response = player_api.lambda_handler(player_event(kingdom="51", id="420", metrics="power"), None)
+    
+    assert response["statusCode"] == 200
+    body = json.loads(response["body"])
+    assert (body["row_groups_read"], body["row_groups_total"]) == (1, 20)
+    assert body["id"] == "420"
+    assert body["rows"] == [
+        {"snapshot_date": "2026-01-19", "name": "p420", "alliance": "A", "power": 420},
+        {"snapshot_date": "2026-01-26", "name": "p420", "alliance": "A", "power": 840},
+    ]
+    assert player_api.opened == [HISTORY_KEY]
+
+
+def test_player_endpoint_validates_and_404s(player_api):
+    """Test bad ids and unknown players."""
+    bad = player_api.lambda_handler(player_event(kingdom="51", id="x"), None)
+    missing = player_api.lambda_handler(player_event(kingdom="51", id="5000"), None)
+    
+    assert bad["statusCode"] == 400
+    assert missing["statusCode"] == 404
@@ -0,0 +1,90 @@
+"""Tests for the content-addressed idempotency registry."""
+
+import json
+
+import pandas as pd
+
+from ingest_players.handler import lambda_handler, process_s3_ingestion
+from ingest_players.idempotency import fingerprint_s3_object
+
+BUCKET = "test-bucket"
+INBOX_KEY = "inbox/source=rok_players/kingdom=51/dt=2026-01-26/players.csv"
+
+
+def csv_bytes(power):
+    return pd.DataFrame({"id": ["1", "2"], "power": power}).to_csv(index=False).encode()
+
+
+def test_duplicate_upload_returns_original_summary(fake_s3):
+    """Test that re-uploading the same export skips parsing and writes nothing."""
+    fake_s3.objects[(BUCKET, INBOX_KEY)] = csv_bytes([1, 2])
+    first = process_s3_ingestion(BUCKET, INBOX_KEY)
+    objects_before = dict(fake_s3.objects)
+    fake_s3.calls.clear()
+    
+    again = process_s3_ingestion(BUCKET, INBOX_KEY)
+    
+    assert again["duplicate"] is True
+    assert again["run_id"] == first["run_id"]
+    assert again["raw_key"] == first["raw_key"]
+    assert fake_s3.objects == objects_before
+    assert set(fake_s3.calls) <= {"head_object", "get_object"}
+
+
+def test_changed_content_is_ingested(fake_s3):
+    """Test that a different export for the same date is not a duplicate."""
+    fake_s3.objects[(BUCKET, INBOX_KEY)] = csv_bytes([1, 2])
+    first = process_s3_ingestion(BUCKET, INBOX_KEY)
+    
+    fake_s3.objects[(BUCKET, INBOX_KEY)] = csv_bytes([3, 4])
+    second = process_s3_ingestion(BUCKET, INBOX_KEY)
+    
+    assert second["duplicate"] is False
+    assert second["fingerprint"] != first["fingerprint"]
+
+
+def test_reupload_after_other_export_is_reingested(fake_s3):
+    """Test that A, B, A restores snapshot A instead of returning A's stale summary."""
+    fake_s3.objects[(BUCKET, INBOX_KEY)] = csv_bytes([1, 2])
+    process_s3_ingestion(BUCKET, INBOX_KEY)
+    fake_s3.objects[(BUCKET, INBOX_KEY)] = csv_bytes([3, 4])
+    process_s3_ingestion(BUCKET, INBOX_KEY)
+    
+    fake_s3.objects[(BUCKET, INBOX_KEY)] = csv_bytes([1, 2])
+    result = process_s3_ingestion(BUCKET, INBOX_KEY)
+    
+    assert result["duplicate"] is False
+
+
+def test_retry_after_reingestion_is_a_duplicate(fake_s3):
+    """Test that A, B, A re-registers A's new run, so a retry of A is skipped."""
+    fake_s3.objects[(BUCKET, INBOX_KEY)] = csv_bytes([1, 2])
+    process_s3_ingestion(BUCKET, INBOX_KEY)
+    fake_s3.objects[(BUCKET, INBOX_KEY)] = csv_bytes([3, 4])
+    process_s3_ingestion(BUCKET, INBOX_KEY)
+    fake_s3.objects[(BUCKET, INBOX_KEY)] = csv_bytes([1, 2])
+    restored = process_s3_ingestion(BUCKET, INBOX_KEY)
+    
+    retry = process_s3_ingestion(BUCKET, INBOX_KEY)
+    
+    assert retry["duplicate"] is True
+    assert retry["run_id"] == restored["run_id"]
+
+
+def test_event_etag_avoids_head_request(fake_s3):
+    """Test that the ETag from the S3 event is used as the fingerprint."""
+    assert fingerprint_s3_object(BUCKET, INBOX_KEY, etag='"abc"') == "etag:abc"
+    assert "head_object" not in fake_s3.calls
+
+
+def test_redelivered_event_is_reported_as_duplicate(fake_s3):
+    """Test that an at-least-once redelivery succeeds without new writes."""
+    fake_s3.objects[(BUCKET, INBOX_KEY)] = csv_bytes([1, 2])
+    event = {"Records": [{"s3": {"bucket": {"name": BUCKET}, "object": {"key": INBOX_KEY}}}]}
+    
+    lambda_handler(event, None)
+    response = lambda_handler(event, None)
+    
+    result = json.loads(response["body"])["results"][0]
+    assert response["statusCode"] == 200
+    assert result["summary"]["duplicate"] is True
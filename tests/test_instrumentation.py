@@ -0,0 +1,72 @@
+"""Tests for per-stage EMF metrics from the ingestion handler."""
+
+import json
+
+import pandas as pd
+
+from ingest_players.handler import process_s3_ingestion
+from ingest_players.instrumentation import StageMetrics
+
+BUCKET = "test-bucket"
+
+
+def emf_lines(output: str) -> list:
+    return [json.loads(line) for line in output.splitlines() if line.startswith('{"_aws"')]
+
+
+def test_stage_times_accumulate_and_render_as_emf():
+    """Test that repeated stages add up and every value is declared as a metric."""
+    metrics = StageMetrics(enabled=True, namespace="Test")
+    for _ in range(3):
+        with metrics.stage("parse"):
+            pass
+    metrics.count("rows", 10)
+    metrics.count("input_bytes", 2048)
+    metrics.count("output_bytes", None)
+    
+    document = metrics.to_emf({"Source": "rok_players"}, {"kingdom": "51"})
+    directive = document["_aws"]["CloudWatchMetrics"][0]
+    units = {m["Name"]: m["Unit"] for m in directive["Metrics"]}
+    
+    assert directive["Namespace"] == "Test"
+    assert directive["Dimensions"] == [["Source"]]
+    assert units == {
+        "parse_ms": "Milliseconds",
+        "total_ms": "Milliseconds",
+        "rows": "Count",
+        "input_bytes": "Bytes",
+        "peak_rss_mb": "Megabytes",
+    }
+    assert all(name in document for name in units)
+    assert (document["Source"], document["kingdom"], document["rows"]) == ("rok_players", "51", 10)
+
+
+def test_disabled_metrics_record_and_print_nothing(capsys):
+    """Test that a disabled collector hands out a no-op stage and stays silent."""
+    metrics = StageMetrics(enabled=False)
+    assert metrics.stage("parse") is metrics.stage("hash")
+    with metrics.stage("parse"):
+        pass
+    metrics.count("rows", 5)
+    metrics.emit({"Source": "rok_players"})
+    
+    assert (metrics.stages, metrics.counts) == ({}, {})
+    assert capsys.readouterr().out == ""
+
+
+def test_s3_ingestion_emits_one_emf_line(fake_s3, capsys):
+    """Test that a chunked S3 run logs its stage breakdown once."""
+    key = "inbox/source=rok_players/kingdom=51/dt=2026-01-26/players.csv"
+    body = pd.DataFrame({"id": [str(i) for i in range(10)], "power": range(10)}).to_csv(index=False).encode()
+    fake_s3.objects[(BUCKET, key)] = body
+    
+    summary = process_s3_ingestion(
+        BUCKET, key, chunk_rows=4, size=len(body), metrics=StageMetrics(enabled=True)
+    )
+    
+    (line,) = emf_lines(capsys.readouterr().out)
+    assert line["run_id"] == summary["run_id"]
+    assert (line["rows"], line["input_bytes"]) == (10, len(body))
+    assert line["output_bytes"] > 0
+    for stage in ("dedupe", "parse", "validate", "hash", "write", "raw_copy", "artifacts", "catalog"):
+        assert line[f"{stage}_ms"] >= 0
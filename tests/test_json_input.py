@@ -0,0 +1,113 @@
+"""Tests for the streaming JSON reader."""
+
+import io
+import json
+
+import pandas as pd
+import pytest
+
+from ingest_players import json_input
+from ingest_players.chunked import iter_input_chunks
+from ingest_players.handler import process_ingestion, process_s3_ingestion
+from ingest_players.io_local import read_input_file
+
+BUCKET = "test-bucket"
+RECORDS = [
+    {"ID": 1001, "Name": "Alice", "Power": 1000},
+    {"ID": 1002, "Name": "Bob", "Power": 2000},
+    {"ID": 1003, "Name": "Charlie", "Power": None},
+]
+
+
+def ndjson(records) -> bytes:
+    return "\n".join(json.dumps(r) for r in records).encode("utf-8")
+
+
+@pytest.mark.parametrize("payload", [
+    json.dumps(RECORDS, indent=2).encode("utf-8"),
+    ndjson(RECORDS) + b"\n\n",
+    b"\xef\xbb\xbf  \n" + json.dumps(RECORDS).encode("utf-8"),
+])
+def test_array_and_ndjson_read_the_same(payload):
+    """Test that the layout is sniffed and both parse to the same frame."""
+    df = json_input.read_json_df(io.BytesIO(payload))
+    
+    assert list(df["id"]) == ["1001", "1002", "1003"]
+    assert list(df["power"].astype(object).where(df["power"].notna(), None)) == [1000, 2000, None]
+
+
+def test_records_split_across_reads(monkeypatch):
+    """Test that records straddling read boundaries are reassembled."""
+    monkeypatch.setattr(json_input, "READ_SIZE", 7)
+    records = [{"id": str(i), "name": "名前 ✓", "power": i} for i in range(50)]
+    
+    for payload in (json.dumps(records).encode("utf-8"), ndjson(records)):
+        assert list(json_input.iter_json_records(io.BytesIO(payload))) == records
+
+
+def test_nested_fields_flatten_into_declared_columns():
+    """Test that scanner-style nested objects map onto declared columns."""
+    record = {
+        "id": "1",
+        "name": "Alice",
+        "alliance": {"tag": "ACE", "id": 99, "name": "Aces High"},
+        "stats": {"power": 5000, "deads": 7},
+        "kills": {"t4": 10, "T5": 3, "total": 13},
+        "rss": {"gathered": 100, "assistance": 50},
+        "t4_kills": 11,
+        "civilization": "Rome",
+    }
+    
+    assert json_input.flatten_record(record) == {
+        "id": "1",
+        "name": "Alice",
+        "alliance": "ACE",
+        "power": 5000,
+        "deads": 7,
+        "t4 kills": 11,
+        "t5 kills": 3,
+        "total kills": 13,
+        "rss gathered": 100,
+        "rss assistance": 50,
+    }
+
+
+def test_chunks_are_parsed_incrementally(tmp_path):
+    """Test that chunked JSON reading yields bounded frames."""
+    path = tmp_path / "players.json"
+    path.write_text(json.dumps([{"id": str(i), "power": i} for i in range(25)]))
+    
+    chunks = list(iter_input_chunks(str(path), "json", 10))
+    
+    assert [len(c) for c in chunks] == [10, 10, 5]
+    assert list(pd.concat(chunks)["id"]) == [str(i) for i in range(25)]
+
+
+@pytest.mark.parametrize("payload, match", [
+    (b'{"id": 1}\n{"id": 2', "line 2"),
+    (b'[{"id": 1}, {"id": ', "Invalid JSON array"),
+    (b'"players"', "array of records"),
+    (b"[1, 2]", "must be objects"),
+])
+def test_malformed_input_raises(payload, match):
+    """Test that malformed JSON fails with a ValueError."""
+    with pytest.raises(ValueError, match=match):
+        json_input.read_json_df(io.BytesIO(payload))
+
+
+def test_ndjson_s3_upload_matches_local(fake_s3, tmp_path):
+    """Test that NDJSON uploads ingest in Lambda as they do locally."""
+    payload = ndjson(RECORDS)
+    key = "inbox/source=rok_players/kingdom=51/dt=2026-01-26/players.json"
+    fake_s3.objects[(BUCKET, key)] = payload
+    local_path = tmp_path / "players.json"
+    local_path.write_bytes(payload)
+    
+    streamed = process_s3_ingestion(BUCKET, key, streaming=True)
+    local = process_ingestion(str(local_path), "51", "2026-01-26", str(tmp_path / "out"))
+    
+    s3_df = pd.read_parquet(io.BytesIO(fake_s3.objects[(BUCKET, streamed["curated_key"])]))
+    local_df = pd.read_parquet(local["curated_path"])
+    cols = ["id", "name", "power", "record_hash"]
+    pd.testing.assert_frame_equal(s3_df[cols], local_df[cols])
+    assert len(read_input_file(str(local_path))) == 3
@@ -0,0 +1,82 @@
+"""Tests for the curated Parquet layout options."""
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from ingest_players.layout import CuratedLayout, write_curated_table
+
+
+@pytest.fixture
+def curated_table():
+    """Curated-shaped table with a low-cardinality alliance column."""
+    rows = 1000
+    return pa.table({
+        "id": [str(i) for i in range(rows)],
+        "alliance": [f"A{i % 5}" for i in range(rows)],
+        "power": [(i * 7919) % rows for i in range(rows)],
+        "kingdom": ["51"] * rows,
+    })
+
+
+def column_meta(metadata, row_group: int, name: str):
+    """Column chunk metadata by column name."""
+    names = metadata.schema.names
+    return metadata.row_group(row_group).column(names.index(name))
+
+
+def test_sorted_row_groups_with_statistics(tmp_path, curated_table):
+    """Test that sort key and row-group size give descending, non-overlapping groups."""
+    path = tmp_path / "players.parquet"
+    layout = CuratedLayout(sort_key="power", row_group_size=250, compression="zstd")
+    
+    write_curated_table(curated_table, path, layout)
+    metadata = pq.ParquetFile(path).metadata
+    
+    assert metadata.num_row_groups == 4
+    maxes = [column_meta(metadata, i, "power").statistics.max for i in range(4)]
+    mins = [column_meta(metadata, i, "power").statistics.min for i in range(4)]
+    assert maxes == sorted(maxes, reverse=True)
+    assert all(mins[i] >= maxes[i + 1] for i in range(3))
+    
+    first = column_meta(metadata, 0, "power")
+    assert first.compression == "ZSTD"
+    assert first.has_column_index and first.has_offset_index
+    assert pq.read_table(path).column("power").to_pylist()[0] == 999
+
+
+def test_dictionary_only_on_configured_columns(tmp_path, curated_table):
+    """Test that dictionary encoding is limited to low-cardinality columns."""
+    path = tmp_path / "players.parquet"
+    
+    write_curated_table(curated_table, path, CuratedLayout())
+    metadata = pq.ParquetFile(path).metadata
+    
+    assert "RLE_DICTIONARY" in column_meta(metadata, 0, "alliance").encodings
+    assert "RLE_DICTIONARY" not in column_meta(metadata, 0, "id").encodings
+
+
+def test_layout_from_env(monkeypatch):
+    """Test that layout options are read from CURATED_* variables."""
+    monkeypatch.setenv("CURATED_SORT_KEY", "killpoints")
+    monkeypatch.setenv("CURATED_ROW_GROUP_SIZE", "50000")
+    monkeypatch.setenv("CURATED_COMPRESSION", "zstd")
+    monkeypatch.setenv("CURATED_DICTIONARY_COLUMNS", "alliance")
+    monkeypatch.setenv("CURATED_PAGE_INDEX", "0")
+    
+    assert CuratedLayout.from_env() == CuratedLayout(
+        sort_key="killpoints",
+        row_group_size=50000,
+        compression="zstd",
+        dictionary_columns=("alliance",),
+        page_index=False,
+    )
+
+
+def test_layout_rejects_unknown_codec_and_sort_key(curated_table):
+    """Test that invalid layout options fail loudly."""
+    with pytest.raises(ValueError, match="Unsupported compression"):
+        CuratedLayout(compression="lz5")
+    
+    with pytest.raises(ValueError, match="not a curated column"):
+        CuratedLayout(sort_key="dkp").sort(curated_table)
@@ -0,0 +1,166 @@
+"""Tests for precomputed leaderboard artifacts and artifact serving."""
+
+import json
+
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from ingest_players.handler import process_ingestion, process_s3_ingestion
+from ingest_players.leaderboards import LEADERBOARD_COLUMNS, LeaderboardBuilder, artifact_name
+
+BUCKET = "test-bucket"
+INBOX_KEY = "inbox/source=rok_players/kingdom=51/dt=2026-01-26/players.csv"
+
+
+@pytest.fixture
+def players():
+    """Curated-shaped table with ties and a null metric value."""
+    return pa.table({
+        "id": ["1", "2", "3", "4", "5"],
+        "name": ["A", "B", "C", "D", "E"],
+        "alliance": ["X", "X", "Y", None, "Y"],
+        "power": pa.array([50, 90, None, 90, 10], pa.int64()),
+        "run_id": ["r1"] * 5,
+    })
+
+
+def test_builder_orders_by_value_then_id(players):
+    """Test that rows are ordered by value desc, ties by id, nulls last."""
+    builder = LeaderboardBuilder(top_n=10)
+    builder.add(players)
+    
+    document = json.loads(builder.artifacts("51", "2026-01-26")["power.json"])
+    
+    assert [r["id"] for r in document["rows"]] == ["2", "4", "1", "5", "3"]
+    assert document["rows"][0] == {"id": "2", "name": "B", "alliance": "X", "value": 90}
+    assert document["run_id"] == "r1"
+    assert document["top_n"] == 10
+
+
+def test_builder_merges_chunks_like_whole_input(players):
+    """Test that a running top-N over chunks equals the top-N of the whole table."""
+    whole = LeaderboardBuilder(top_n=3)
+    whole.add(players)
+    
+    chunked = LeaderboardBuilder(top_n=3)
+    for start in range(0, len(players), 2):
+        chunked.add(players.slice(start, 2))
+    
+    assert chunked.artifacts("51", "2026-01-26") == whole.artifacts("51", "2026-01-26")
+
+
+def test_artifact_names_match_api_metrics():
+    """Test that every API metric has an artifact with the same key."""
+    from metrics import METRICS
+    
+    assert {artifact_name(c) for c in LEADERBOARD_COLUMNS} == set(METRICS)
+    for key, metric in METRICS.items():
+        assert artifact_name(metric["column"]) == key
+
+
+def test_local_ingestion_writes_artifacts(tmp_path):
+    """Test that local ingestion writes one artifact per metric column present."""
+    input_path = tmp_path / "players.csv"
+    pd.DataFrame({
+        "id": ["1", "2"], "name": ["A", "B"], "power": [1, 2], "deads": [5, 3],
+    }).to_csv(input_path, index=False)
+    
+    summary = process_ingestion(str(input_path), "51", "2026-01-26", out_dir=str(tmp_path / "out"))
+    
+    out = tmp_path / "out" / "leaderboards" / "source=rok_players" / "kingdom=51" / "dt=2026-01-26"
+    assert summary["leaderboards"] == len(list(out.iterdir()))
+    document = json.loads((out / "deads.json").read_bytes())
+    assert [r["id"] for r in document["rows"]] == ["1", "2"]
+
+
+def test_s3_ingestion_publishes_artifacts(fake_s3):
+    """Test that artifacts land under leaderboards/ and not in the Athena partition."""
+    body = pd.DataFrame({"id": ["1", "2"], "power": [1, 2]}).to_csv(index=False).encode()
+    fake_s3.objects[(BUCKET, INBOX_KEY)] = body
+    
+    process_s3_ingestion(BUCKET, INBOX_KEY, streaming=True)
+    
+    key = "leaderboards/source=rok_players/kingdom=51/dt=2026-01-26/power.json"
+    assert json.loads(fake_s3.objects[(BUCKET, key)])["rows"][0]["id"] == "2"
+    partition = "curated/source=rok_players/kingdom=51/dt=2026-01-26/"
+    assert [k for b, k in fake_s3.objects if k.startswith(partition)] == [partition + "players.parquet"]
+
+
+def test_api_serves_from_artifact_without_athena(api_s3, fake_s3, monkeypatch):
+    """Test that a concrete-date request is answered from the artifact alone."""
+    import handler
+    
+    monkeypatch.setattr(handler, "start_query", pytest.fail)
+    monkeypatch.setenv("DATA_BUCKET", BUCKET)
+    monkeypatch.setenv("LEADERBOARD_SERVING", "artifacts")
+    
+    key = "leaderboards/source=rok_players/kingdom=51/dt=2026-01-26/t4_kills.json"
+    rows = [{"id": str(i), "name": None, "alliance": None, "value": 10 - i} for i in range(5)]
+    fake_s3.objects[(BUCKET, key)] = json.dumps({"rows": rows, "top_n": 500}).encode()
+    
+    event = {"queryStringParameters": {
+        "kingdom": "51", "metric": "t4_kills", "dt": "2026-01-26", "limit": "3",
+    }}
+    response = handler.handle_leaderboard(event, None)
+    
+    payload = json.loads(response["body"])
+    assert response["statusCode"] == 200
+    assert payload["served_from"] == "artifact"
+    # alliance is kept in the artifact but not served
+    assert payload["rows"] == [{"id": r["id"], "name": None, "value": r["value"]} for r in rows[:3]]
+
+
+def test_api_falls_back_when_artifact_is_truncated(api_s3, fake_s3):
+    """Test that a limit above the artifact's top-N goes to Athena."""
+    import artifacts
+    
+    key = artifacts.artifact_key("rok_players", "51", "2026-01-26", "power")
+    rows = [{"id": str(i), "name": None, "value": i} for i in range(2)]
+    fake_s3.objects[(BUCKET, key)] = json.dumps({"rows": rows, "top_n": 2}).encode()
+    
+    assert artifacts.get_artifact_rows(BUCKET, "rok_players", "51", "2026-01-26", "power", 2) == rows
+    assert artifacts.get_artifact_rows(BUCKET, "rok_players", "51", "2026-01-26", "power", 3) is None
+    assert artifacts.get_artifact_rows(BUCKET, "rok_players", "51", "2026-01-27", "power", 1) is None
+
+
+@pytest.mark.parametrize("serving, engine, served_from", [
+    ("artifacts", "athena", "artifact"),
+    ("store", "athena", "store"),
+    ("athena", "parquet", "parquet"),
+    ("athena", "athena", "athena"),
+])
+def test_every_source_returns_athena_row_shape(api_s3, fake_s3, monkeypatch, serving, engine, served_from):
+    """Test that rows have the same keys whichever source answers."""
+    import io
+    
+    import pyarrow.parquet as pq
+    
+    import handler
+    
+    body = pd.DataFrame({
+        "id": ["1", "2"], "name": ["A", ""], "alliance": ["X", "Y"], "power": [1, 2],
+    }).to_csv(index=False).encode()
+    fake_s3.objects[(BUCKET, INBOX_KEY)] = body
+    process_s3_ingestion(BUCKET, INBOX_KEY)
+    
+    def open_partition(bucket, key, region):
+        return pq.ParquetFile(io.BytesIO(fake_s3.objects[(bucket, key)]))
+    
+    monkeypatch.setattr(handler, "open_partition", open_partition)
+    monkeypatch.setattr(handler, "start_query", lambda sql, *args: "qid")
+    monkeypatch.setattr(handler, "wait_for_query", lambda qid, region, **kwargs: {})
+    # What Athena returns for the leaderboard SQL's id, name and value columns
+    monkeypatch.setattr(handler, "get_results", lambda qid, region: [
+        {"id": "2", "name": None, "value": 2}, {"id": "1", "name": "A", "value": 1},
+    ])
+    monkeypatch.setenv("DATA_BUCKET", BUCKET)
+    monkeypatch.setenv("LEADERBOARD_SERVING", serving)
+    monkeypatch.setenv("QUERY_ENGINE", engine)
+    monkeypatch.setenv("SHARED_QUERY_CACHE", "0")
+    
+    event = {"queryStringParameters": {"kingdom": "51", "metric": "power", "dt": "2026-01-26", "limit": "2"}}
+    payload = json.loads(handler.handle_leaderboard(event, None)["body"])
+    
+    assert payload["served_from"] == served_from
+    assert payload["rows"] == [{"id": "2", "name": None, "value": 2}, {"id": "1", "name": "A", "value": 1}]
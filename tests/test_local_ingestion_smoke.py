@@ -18,8 +18,8 @@ def test_local_ingestion_csv_smoke():
         test_data = pd.DataFrame({
             "id": ["player1", "player2", "player3"],
             "name": ["Alice", "Bob", "Charlie"],
-            "dkp": [1000, 2000, 1500],
-            "kills": [50, 75, 60],
+            "power": [1000, 2000, 1500],
+            "killpoints": [50, 75, 60],
         })
         
         input_csv = tmpdir / "test_players.csv"
@@ -58,7 +58,7 @@ def test_local_ingestion_csv_smoke():
         
         # Check expected columns
         expected_cols = {
-            "id", "name", "dkp", "kills",  # Original
+            "id", "name", "power", "killpoints",  # Original
             "kingdom", "snapshot_date",  # Normalized
             "ingested_at", "run_id", "record_hash",  # Metadata
         }
@@ -110,6 +110,19 @@ def test_local_ingestion_json_smoke():
         assert "run_id" in df.columns
 
 
+@pytest.mark.parametrize("chunk_rows", [0, 1])
+def test_local_ingestion_gzip_smoke(tmp_path, chunk_rows):
+    """Test that a gzipped export ingests and is kept compressed in raw."""
+    input_gz = tmp_path / "test_players.csv.gz"
+    pd.DataFrame({"id": ["p1", "p2"], "power": [10, 20]}).to_csv(input_gz, index=False)
+    
+    result = process_ingestion(str(input_gz), "51", "2026-01-26", str(tmp_path / "output"), chunk_rows=chunk_rows)
+    
+    assert result["rows"] == 2
+    assert Path(result["raw_path"]).read_bytes() == input_gz.read_bytes()
+    assert list(pd.read_parquet(result["curated_path"])["power"]) == [10, 20]
+
+
 def test_validation_missing_id():
     """Test that validation fails when id column is missing."""
     with tempfile.TemporaryDirectory() as tmpdir:
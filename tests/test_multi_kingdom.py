@@ -0,0 +1,100 @@
+"""Tests for uploads that hold many kingdoms."""
+
+import io
+import json
+
+import pandas as pd
+import pytest
+
+from ingest_players.backfill import discover_local, latest_per_snapshot, run_backfill
+from ingest_players.handler import process_ingestion, process_s3_ingestion
+from ingest_players.multi_kingdom import read_partitions
+
+BUCKET = "test-bucket"
+MULTI_KEY = "inbox/source=rok_players/kingdom=multi/dt=2026-01-26/cluster.csv"
+
+
+def cluster_csv(ids=("1", "2", "3", "4", "5")) -> bytes:
+    return pd.DataFrame({
+        "ID": list(ids),
+        "Kingdom": ["52", "51", "52", " 51 ", "1001"][:len(ids)],
+        "Power": [100, 200, 300, 400, 500][:len(ids)],
+    }).to_csv(index=False).encode("utf-8")
+
+
+def test_read_partitions_splits_on_kingdom_column():
+    """Test that one parse yields each kingdom's rows without the kingdom column."""
+    parts = read_partitions(io.BytesIO(cluster_csv()), "csv")
+    
+    assert list(parts) == ["1001", "51", "52"]
+    assert list(parts["51"]["id"]) == ["2", "4"]
+    assert list(parts["52"]["power"]) == [100, 300]
+    assert "kingdom" not in parts["51"].columns
+
+
+@pytest.mark.parametrize("payload, match", [
+    (b"id,power\n1,5\n", "missing the 'kingdom' column"),
+    (b"id,kingdom\n1,51\n2,\n", "1 rows without a kingdom"),
+    (b"id,kingdom\n1,51\n2,../52\n", "Invalid kingdom values"),
+])
+def test_read_partitions_rejects_bad_kingdoms(payload, match):
+    """Test that the kingdom column must name a kingdom on every row."""
+    with pytest.raises(ValueError, match=match):
+        read_partitions(io.BytesIO(payload), "csv")
+
+
+def test_s3_multi_kingdom_upload_writes_each_kingdom(fake_s3):
+    """Test that a multi-kingdom upload becomes one snapshot per kingdom."""
+    payload = cluster_csv()
+    fake_s3.objects[(BUCKET, MULTI_KEY)] = payload
+    
+    result = process_s3_ingestion(BUCKET, MULTI_KEY)
+    
+    assert result["rows"] == 5
+    assert [(k["kingdom"], k["rows"]) for k in result["kingdoms"]] == [("1001", 1), ("51", 2), ("52", 2)]
+    assert result["raw_key"].startswith("raw/source=rok_players/kingdom=multi/dt=2026-01-26/")
+    assert fake_s3.objects[(BUCKET, result["raw_key"])] == payload
+    
+    for summary in result["kingdoms"]:
+        curated = pd.read_parquet(io.BytesIO(fake_s3.objects[(BUCKET, summary["curated_key"])]))
+        assert (curated["kingdom"] == summary["kingdom"]).all()
+        assert curated["run_id"].unique().tolist() == [result["run_id"]]
+        assert summary["leaderboards"] > 0
+        catalog_key = f"catalog/source=rok_players/kingdom={summary['kingdom']}/snapshots.json"
+        snapshots = json.loads(fake_s3.objects[(BUCKET, catalog_key)])["snapshots"]
+        assert [(s["dt"], s["rows"]) for s in snapshots] == [("2026-01-26", summary["rows"])]
+    
+    # Re-delivery of the same upload is a duplicate of the whole run
+    again = process_s3_ingestion(BUCKET, MULTI_KEY)
+    assert again["duplicate"] is True and again["run_id"] == result["run_id"]
+
+
+def test_s3_multi_kingdom_validation_failure_writes_nothing(fake_s3):
+    """Test that one bad kingdom stops every kingdom from being written."""
+    fake_s3.objects[(BUCKET, MULTI_KEY)] = cluster_csv(ids=("1", "2", "1", "4", "5"))
+    
+    with pytest.raises(ValueError, match="kingdom 52"):
+        process_s3_ingestion(BUCKET, MULTI_KEY)
+    
+    written = [k for _, k in fake_s3.objects if not k.startswith("inbox/")]
+    assert written == []
+
+
+def test_local_multi_kingdom_json_and_backfill(tmp_path):
+    """Test local multi-kingdom ingestion and its replay with deltas."""
+    out_dir = str(tmp_path / "out")
+    path = tmp_path / "cluster.json"
+    for dt, power in (("2026-01-25", 10), ("2026-01-26", 15)):
+        records = [{"id": str(i), "kingdom": 51 + i % 2, "power": power * i} for i in range(1, 5)]
+        path.write_text(json.dumps(records))
+        result = process_ingestion(str(path), "_all", dt, out_dir)
+    
+    assert [(k["kingdom"], k["rows"]) for k in result["kingdoms"]] == [("51", 2), ("52", 2)]
+    assert result["kingdoms"][0]["prev_dt"] == "2026-01-25"
+    assert "kingdom=_all" in result["raw_path"]
+    
+    items = latest_per_snapshot(discover_local(out_dir))
+    report = run_backfill(items, out_dir=out_dir, max_workers=1)
+    
+    assert (report["files"], report["failed"], report["rows"]) == (2, 0, 8)
+    assert (report["deltas"], report["histories"]) == (4, 2)
@@ -0,0 +1,153 @@
+"""Tests for leaderboards read directly from the curated Parquet partition."""
+
+import json
+import random
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from ingest_players.handler import process_ingestion
+from ingest_players.layout import CuratedLayout, write_curated_table
+
+BUCKET = "test-bucket"
+
+
+def players(rows, seed=3):
+    """Curated-shaped table with tied and null power values."""
+    rng = random.Random(seed)
+    return pa.table({
+        "id": [str(i) for i in range(rows)],
+        "name": [f"p{i}" for i in range(rows)],
+        "power": pa.array([None if i % 7 == 0 else rng.randrange(50) for i in range(rows)], pa.int64()),
+        "killpoints": pa.array(range(rows), pa.int64()),
+    })
+
+
+def reference(table, column, limit):
+    """Top rows by a full sort: value desc, nulls last, ties by id."""
+    rows = [{"id": r["id"], "name": r["name"], "value": r[column]} for r in table.to_pylist()]
+    rows.sort(key=lambda r: r["id"])
+    rows.sort(key=lambda r: (r["value"] is None, -(r["value"] or 0)))
+    return rows[:limit]
+
+
+@pytest.mark.parametrize("layout", [
+    CuratedLayout(row_group_size=64),
+    CuratedLayout(sort_key="power", row_group_size=64),
+])
+@pytest.mark.parametrize("limit", [1, 10, 100, 1000])
+def test_read_top_rows_matches_full_sort(tmp_path, layout, limit):
+    """Test that selection with row group pruning returns what a full sort would."""
+    from parquet_engine import read_top_rows
+    
+    table = players(500)
+    path = tmp_path / "players.parquet"
+    write_curated_table(table, str(path), layout)
+    
+    result = read_top_rows(pq.ParquetFile(str(path)), "power", limit)
+    
+    assert result["rows"] == reference(table, "power", limit)
+    assert result["row_groups_total"] == 8
+
+
+def test_sorted_layout_reads_only_the_top_row_group(tmp_path):
+    """Test that statistics rule out every row group below the N-th value."""
+    from parquet_engine import read_top_rows
+    
+    path = tmp_path / "players.parquet"
+    write_curated_table(players(1000), str(path), CuratedLayout(sort_key="killpoints", row_group_size=100))
+    
+    result = read_top_rows(pq.ParquetFile(str(path)), "killpoints", 50)
+    
+    assert (result["row_groups_read"], result["row_groups_total"]) == (1, 10)
+    assert [r["value"] for r in result["rows"]] == list(range(999, 949, -1))
+
+
+def test_missing_columns_read_as_null(tmp_path):
+    """Test that columns absent from the upload come back null, as in Athena."""
+    from parquet_engine import read_top_rows
+    
+    path = tmp_path / "players.parquet"
+    pq.write_table(pa.table({"id": ["1", "2"], "name": ["", "b"]}), str(path))
+    
+    result = read_top_rows(pq.ParquetFile(str(path)), "t4 kills", 5)
+    
+    assert result["rows"] == [{"id": "1", "name": None, "value": None}, {"id": "2", "name": "b", "value": None}]
+
+
+@pytest.fixture
+def parquet_api(tmp_path, monkeypatch):
+    """Leaderboard API on the parquet engine, reading partitions from a local out_dir."""
+    import handler
+    
+    out_dir = tmp_path / "out"
+    input_path = tmp_path / "players.csv"
+    pd.DataFrame({
+        "id": ["1", "2", "3", "4"],
+        "name": ["a", "", "c", "d"],
+        "power": ["10", "40", "", "40"],
+    }).to_csv(input_path, index=False)
+    process_ingestion(str(input_path), "51", "2026-01-26", out_dir=str(out_dir))
+    
+    def open_local(bucket, key, region):
+        path = Path(out_dir) / key
+        return pq.ParquetFile(str(path)) if path.exists() else None
+    
+    athena_queries = []
+    monkeypatch.setattr(handler, "open_partition", open_local)
+    monkeypatch.setattr(handler, "start_query", lambda sql, *args: athena_queries.append(sql) or "qid")
+    monkeypatch.setattr(handler, "wait_for_query", lambda qid, region, **kwargs: {})
+    monkeypatch.setattr(handler, "get_results", lambda qid, region: [{"id": "9", "name": None, "value": 1}])
+    monkeypatch.setenv("DATA_BUCKET", BUCKET)
+    monkeypatch.setenv("QUERY_ENGINE", "parquet")
+    monkeypatch.setenv("SHARED_QUERY_CACHE", "0")
+    handler.athena_queries = athena_queries
+    return handler
+
+
+def leaderboard(dt="2026-01-26", limit=3):
+    return {
+        "requestContext": {"http": {"method": "GET", "path": "/leaderboard"}},
+        "queryStringParameters": {"kingdom": "51", "metric": "power", "dt": dt, "limit": str(limit)},
+    }
+
+
+def test_parquet_engine_serves_leaderboard_without_athena(parquet_api):
+    """Test that the curated partition answers with Athena's row shape."""
+    response = parquet_api.lambda_handler(leaderboard(), None)
+    
+    assert response["statusCode"] == 200
+    body = json.loads(response["body"])
+    assert body["served_from"] == "parquet"
+    assert body["rows"] == [
+        {"id": "2", "name": None, "value": 40},
+        {"id": "4", "name": "d", "value": 40},
+        {"id": "1", "name": "a", "value": 10},
+    ]
+    assert parquet_api.athena_queries == []
+
+
+def test_parquet_engine_falls_back_to_athena(parquet_api):
+    """Test that a date without a curated partition is queried on Athena."""
+    response = parquet_api.lambda_handler(leaderboard(dt="2026-01-19"), None)
+    
+    body = json.loads(response["body"])
+    assert body["served_from"] == "athena"
+    assert body["rows"] == [{"id": "9", "name": None, "value": 1}]
+    assert len(parquet_api.athena_queries) == 1
+
+
+def test_query_engine_config(monkeypatch):
+    """Test that QUERY_ENGINE is validated and every name has an engine."""
+    import handler
+    from config import QUERY_ENGINES, Config
+    
+    assert set(handler.LEADERBOARD_ENGINES) == QUERY_ENGINES
+    assert Config.from_env().query_engine == "athena"
+    
+    monkeypatch.setenv("QUERY_ENGINE", "duckdb")
+    with pytest.raises(ValueError, match="QUERY_ENGINE"):
+        Config.from_env()
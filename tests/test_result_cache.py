@@ -0,0 +1,111 @@
+"""Tests for the in-container leaderboard result cache."""
+
+import json
+
+import pytest
+
+BUCKET = "test-bucket"
+CATALOG_KEY = "catalog/source=rok_players/kingdom=51/snapshots.json"
+
+
+def request(kingdom="51", metric="power", dt="2026-01-26", limit=10):
+    return {
+        "requestContext": {"http": {"method": "GET", "path": "/leaderboard"}},
+        "queryStringParameters": {"kingdom": kingdom, "metric": metric, "dt": dt, "limit": str(limit)},
+    }
+
+
+@pytest.fixture
+def api(api_s3, monkeypatch):
+    """Leaderboard API whose Athena queries are counted and return ten rows."""
+    import handler
+    
+    queries = []
+    
+    def query_leaderboard(config, kingdom, dt, metric_column, limit, context=None):
+        queries.append((kingdom, dt, limit))
+        return [{"id": str(i), "name": None, "value": 100 - i} for i in range(min(limit, 10))], "athena"
+    
+    monkeypatch.setattr(handler, "query_leaderboard", query_leaderboard)
+    monkeypatch.setenv("DATA_BUCKET", BUCKET)
+    monkeypatch.setattr(handler, "queries", queries, raising=False)
+    return handler
+
+
+def body(response):
+    assert response["statusCode"] == 200
+    return json.loads(response["body"])
+
+
+def test_repeat_and_smaller_limits_served_from_cache(api):
+    """Test that a cached top N answers repeats and smaller limits by slicing."""
+    first = body(api.lambda_handler(request(limit=5), None))
+    again = body(api.lambda_handler(request(limit=5), None))
+    smaller = body(api.lambda_handler(request(limit=3), None))
+    
+    assert first["served_from"] == "athena"
+    assert again["served_from"] == "cache" and again["rows"] == first["rows"]
+    assert smaller["served_from"] == "cache" and smaller["rows"] == first["rows"][:3]
+    assert api.queries == [("51", "2026-01-26", 5)]
+
+
+def test_larger_limit_refetches_unless_leaderboard_is_complete(api):
+    """Test that a larger limit misses, except when the cached rows are all there are."""
+    api.lambda_handler(request(limit=5), None)
+    api.lambda_handler(request(limit=50), None)
+    # Only ten rows exist, so the cached top 50 answers any limit
+    cached = body(api.lambda_handler(request(limit=100), None))
+    
+    assert [limit for _, _, limit in api.queries] == [5, 50]
+    assert cached["served_from"] == "cache" and len(cached["rows"]) == 10
+
+
+def test_latest_expires_but_concrete_dates_do_not(api, fake_s3, monkeypatch):
+    """Test that "latest" follows a new snapshot after its TTL while dates stay cached."""
+    import catalog
+    import result_cache
+    
+    clock = [1000.0]
+    monkeypatch.setattr(result_cache.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(catalog.time, "monotonic", lambda: clock[0])
+    monkeypatch.setenv("RESULT_CACHE_LATEST_TTL_SECONDS", "30")
+    
+    def publish(*dts):
+        snapshots = [{"dt": dt, "rows": 10, "run_id": "r"} for dt in dts]
+        fake_s3.objects[(BUCKET, CATALOG_KEY)] = json.dumps({"snapshots": snapshots}).encode()
+    
+    publish("2026-01-26")
+    assert body(api.lambda_handler(request(dt="latest"), None))["dt"] == "2026-01-26"
+    
+    publish("2026-01-26", "2026-01-27")
+    clock[0] += 10
+    assert body(api.lambda_handler(request(dt="latest"), None))["served_from"] == "cache"
+    
+    clock[0] += 3600
+    latest = body(api.lambda_handler(request(dt="latest"), None))
+    concrete = body(api.lambda_handler(request(dt="2026-01-26"), None))
+    
+    assert latest["dt"] == "2026-01-27" and latest["served_from"] == "athena"
+    assert concrete["served_from"] == "cache"
+    assert [dt for _, dt, _ in api.queries] == ["2026-01-26", "2026-01-27"]
+
+
+def test_lru_eviction_and_health_counters(api, monkeypatch):
+    """Test that the least recently used entry is evicted and /health reports counters."""
+    monkeypatch.setenv("RESULT_CACHE_ENTRIES", "2")
+    
+    for kingdom in ("51", "52", "51", "53", "51", "52"):
+        api.lambda_handler(request(kingdom=kingdom), None)
+    
+    assert [kingdom for kingdom, _, _ in api.queries] == ["51", "52", "53", "52"]
+    health = body(api.lambda_handler({"requestContext": {"http": {"method": "GET", "path": "/health"}}}, None))
+    assert health["cache"] == {"hits": 2, "misses": 4, "evictions": 2, "entries": 2}
+
+
+def test_cache_disabled(api, monkeypatch):
+    """Test that RESULT_CACHE_ENTRIES=0 sends every request to the backend."""
+    monkeypatch.setenv("RESULT_CACHE_ENTRIES", "0")
+    
+    for _ in range(2):
+        assert body(api.lambda_handler(request(), None))["served_from"] == "athena"
+    assert len(api.queries) == 2
@@ -0,0 +1,297 @@
+"""Tests for S3 ingestion against an in-memory S3 stand-in."""
+
+import gzip
+import io
+import json
+import time
+import zipfile
+
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from ingest_players.aws_s3 import S3MultipartWriter
+from ingest_players.handler import lambda_handler, process_s3_ingestion
+
+BUCKET = "test-bucket"
+INBOX_KEY = "inbox/source=rok_players/kingdom=51/dt=2026-01-26/players.csv"
+
+
+@pytest.fixture
+def players_csv():
+    """Small CSV export as raw bytes."""
+    return pd.DataFrame({
+        "ID": ["1001", "1002", "1003"],
+        "Name": ["Alice", "Bob", "Charlie"],
+        "Power": [1000, 2000, 1500],
+    }).to_csv(index=False).encode("utf-8")
+
+
+def test_streaming_ingestion_skips_tmp(fake_s3, players_csv):
+    """Test that streaming mode parses from S3 and never touches /tmp."""
+    fake_s3.objects[(BUCKET, INBOX_KEY)] = players_csv
+    
+    result = process_s3_ingestion(BUCKET, INBOX_KEY, streaming=True)
+    
+    assert result["streaming"] is True
+    assert result["rows"] == 3
+    assert "download_file" not in fake_s3.calls
+    assert "upload_file" not in fake_s3.calls
+    assert "copy_object" in fake_s3.calls
+    
+    assert fake_s3.objects[(BUCKET, result["raw_key"])] == players_csv
+    curated = pd.read_parquet(io.BytesIO(fake_s3.objects[(BUCKET, result["curated_key"])]))
+    assert list(curated["id"]) == ["1001", "1002", "1003"]
+    assert (curated["kingdom"] == "51").all()
+
+
+def test_streaming_and_tempfile_paths_match(fake_s3, players_csv):
+    """Test that both paths write the same curated business data."""
+    fake_s3.objects[(BUCKET, INBOX_KEY)] = players_csv
+    
+    streamed = process_s3_ingestion(BUCKET, INBOX_KEY, streaming=True)
+    streamed_df = pd.read_parquet(io.BytesIO(fake_s3.objects[(BUCKET, streamed["curated_key"])]))
+    
+    # Same input twice on purpose, so bypass the duplicate check
+    staged = process_s3_ingestion(BUCKET, INBOX_KEY, streaming=False, idempotent=False)
+    staged_df = pd.read_parquet(io.BytesIO(fake_s3.objects[(BUCKET, staged["curated_key"])]))
+    
+    assert staged["streaming"] is False
+    assert "download_file" in fake_s3.calls
+    cols = ["id", "name", "power", "record_hash"]
+    pd.testing.assert_frame_equal(streamed_df[cols], staged_df[cols])
+
+
+@pytest.mark.parametrize("streaming", [True, False])
+def test_raw_copy_overlaps_parsing(fake_s3, players_csv, monkeypatch, streaming):
+    """Test that the raw tier is a server-side copy running alongside parsing."""
+    from ingest_players import handler
+    
+    copy_object = fake_s3.copy_object
+    write_curated = handler.write_curated
+    
+    def slow_copy_object(**kwargs):
+        time.sleep(0.3)
+        return copy_object(**kwargs)
+    
+    def slow_write_curated(*args, **kwargs):
+        time.sleep(0.3)
+        return write_curated(*args, **kwargs)
+    
+    monkeypatch.setattr(fake_s3, "copy_object", slow_copy_object)
+    monkeypatch.setattr(handler, "write_curated", slow_write_curated)
+    fake_s3.objects[(BUCKET, INBOX_KEY)] = players_csv
+    
+    result = process_s3_ingestion(BUCKET, INBOX_KEY, streaming=streaming)
+    
+    assert fake_s3.objects[(BUCKET, result["raw_key"])] == players_csv
+    assert fake_s3.calls.count("upload_file") == (0 if streaming else 1)
+    assert result["overlap_saved_seconds"] > 0.2
+
+
+def test_failed_ingestion_removes_raw_copy(fake_s3):
+    """Test that an input rejected during parsing does not stay in the raw tier."""
+    fake_s3.objects[(BUCKET, INBOX_KEY)] = b"name,power\nAlice,1\n"
+    
+    with pytest.raises(ValueError, match="id"):
+        process_s3_ingestion(BUCKET, INBOX_KEY)
+    
+    assert "delete_object" in fake_s3.calls
+    assert not any(key.startswith("raw/") for _, key in fake_s3.objects)
+
+
+def compress(data: bytes, compression: str) -> bytes:
+    """Compress bytes as a scanner upload would be."""
+    if compression == "gzip":
+        return gzip.compress(data)
+    if compression == "zstd":
+        return pa.compress(data, "zstd", asbytes=True)
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("export/players.csv", data)
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize("compression, filename, streamed", [
+    ("gzip", "players.csv.gz", True),
+    ("zstd", "players.csv.zst", True),
+    ("zip", "players.zip", False),
+])
+def test_compressed_uploads(fake_s3, players_csv, compression, filename, streamed):
+    """Test that compressed uploads ingest like plain ones and stay compressed in raw."""
+    key = INBOX_KEY.replace("players.csv", filename)
+    payload = compress(players_csv, compression)
+    fake_s3.objects[(BUCKET, key)] = payload
+    
+    result = process_s3_ingestion(BUCKET, key, streaming=True)
+    
+    assert (result["compression"], result["streaming"]) == (compression, streamed)
+    assert ("download_file" in fake_s3.calls) is not streamed
+    assert result["raw_key"].endswith(filename)
+    assert fake_s3.objects[(BUCKET, result["raw_key"])] == payload
+    curated = pd.read_parquet(io.BytesIO(fake_s3.objects[(BUCKET, result["curated_key"])]))
+    assert list(curated["id"]) == ["1001", "1002", "1003"]
+
+
+def test_zip_with_several_files_fails(fake_s3, players_csv):
+    """Test that an archive must hold exactly one input file."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("a.csv", players_csv)
+        archive.writestr("b.csv", players_csv)
+    key = INBOX_KEY.replace("players.csv", "players.zip")
+    fake_s3.objects[(BUCKET, key)] = buffer.getvalue()
+    
+    with pytest.raises(ValueError, match="exactly one input file"):
+        process_s3_ingestion(BUCKET, key)
+
+
+def test_multipart_writer_splits_parts(fake_s3):
+    """Test that large outputs are sent as ordered multipart parts."""
+    part_size = 5 * 1024 * 1024
+    payload = bytes(range(256)) * (part_size * 2 // 256 + 10)
+    
+    with S3MultipartWriter(BUCKET, "curated/big.parquet", part_size=part_size) as sink:
+        for i in range(0, len(payload), 1_000_000):
+            sink.write(payload[i:i + 1_000_000])
+    
+    assert fake_s3.calls.count("upload_part") == 3
+    assert fake_s3.objects[(BUCKET, "curated/big.parquet")] == payload
+
+
+def test_multipart_writer_uploads_parts_concurrently(fake_s3, monkeypatch):
+    """Test that parts upload in parallel and complete in part order."""
+    part_size = 5 * 1024 * 1024
+    upload_part = fake_s3.upload_part
+    
+    def slow_upload_part(**kwargs):
+        time.sleep(0.2)
+        return upload_part(**kwargs)
+    
+    monkeypatch.setattr(fake_s3, "upload_part", slow_upload_part)
+    payloads = [bytes([i]) * part_size for i in range(4)]
+    
+    start = time.perf_counter()
+    with S3MultipartWriter(BUCKET, "curated/big.parquet", part_size=part_size, max_concurrency=4) as sink:
+        for payload in payloads:
+            sink.write(payload)
+    elapsed = time.perf_counter() - start
+    
+    assert fake_s3.objects[(BUCKET, "curated/big.parquet")] == b"".join(payloads)
+    assert elapsed < 0.6
+    assert sink.upload_seconds > 0.8
+    assert sink.wait_seconds < sink.upload_seconds
+
+
+def test_multipart_writer_aborts_on_failed_part(fake_s3, monkeypatch):
+    """Test that a failed background part surfaces and aborts the upload."""
+    part_size = 5 * 1024 * 1024
+    
+    def failing_upload_part(**kwargs):
+        raise RuntimeError("part failed")
+    
+    monkeypatch.setattr(fake_s3, "upload_part", failing_upload_part)
+    
+    with pytest.raises(RuntimeError, match="part failed"):
+        with S3MultipartWriter(BUCKET, "curated/bad.parquet", part_size=part_size, max_concurrency=2) as sink:
+            sink.write(b"x" * part_size * 3)
+    
+    assert "abort_multipart_upload" in fake_s3.calls
+    assert (BUCKET, "curated/bad.parquet") not in fake_s3.objects
+
+
+@pytest.mark.parametrize("method", ["upload_part", "complete_multipart_upload"])
+def test_multipart_writer_aborts_when_close_fails(fake_s3, monkeypatch, method):
+    """Test that a part or completion failing in close aborts the upload."""
+    part_size = 5 * 1024 * 1024
+    
+    def fail(**kwargs):
+        raise RuntimeError(f"{method} failed")
+    
+    monkeypatch.setattr(fake_s3, method, fail)
+    sink = S3MultipartWriter(BUCKET, "curated/bad.parquet", part_size=part_size, max_concurrency=2)
+    sink.write(b"x" * (part_size + 1))
+    
+    with pytest.raises(RuntimeError, match=f"{method} failed"):
+        sink.close()
+    
+    assert sink.closed
+    assert fake_s3.calls.count("abort_multipart_upload") == 1
+    assert (BUCKET, "curated/bad.parquet") not in fake_s3.objects
+
+
+def test_multipart_writer_small_output_uses_put(fake_s3):
+    """Test that outputs below one part skip the multipart API."""
+    with S3MultipartWriter(BUCKET, "curated/small.parquet") as sink:
+        sink.write(b"abc")
+    
+    assert fake_s3.calls == ["put_object"]
+    assert fake_s3.objects[(BUCKET, "curated/small.parquet")] == b"abc"
+
+
+def test_multipart_writer_aborts_on_error(fake_s3):
+    """Test that a failure mid-write aborts the upload and leaves no object."""
+    part_size = 5 * 1024 * 1024
+    
+    with pytest.raises(RuntimeError):
+        with S3MultipartWriter(BUCKET, "curated/bad.parquet", part_size=part_size) as sink:
+            sink.write(b"x" * (part_size + 1))
+            raise RuntimeError("boom")
+    
+    assert "abort_multipart_upload" in fake_s3.calls
+    assert (BUCKET, "curated/bad.parquet") not in fake_s3.objects
+
+
+def s3_event(*keys):
+    """Build an S3 ObjectCreated event with one record per key."""
+    return {"Records": [
+        {"s3": {"bucket": {"name": BUCKET}, "object": {"key": key}}} for key in keys
+    ]}
+
+
+def test_lambda_handler_processes_every_record(fake_s3, players_csv):
+    """Test that all records are ingested and failures are reported per record."""
+    key_51 = INBOX_KEY
+    key_52 = "inbox/source=rok_players/kingdom=52/dt=2026-01-26/players.csv"
+    bad_key = "inbox/source=rok_players/kingdom=53/dt=2026-01-26/players.txt"
+    fake_s3.objects[(BUCKET, key_51)] = players_csv
+    fake_s3.objects[(BUCKET, key_52)] = players_csv
+    
+    response = lambda_handler(s3_event(key_51, key_52, bad_key), None)
+    body = json.loads(response["body"])
+    
+    assert response["statusCode"] == 500
+    assert (body["records"], body["succeeded"], body["failed"]) == (3, 2, 1)
+    assert [r["status"] for r in body["results"]] == ["ok", "ok", "error"]
+    assert body["results"][1]["summary"]["kingdom"] == "52"
+    assert "Unsupported file extension" in body["results"][2]["error"]
+
+
+def test_lambda_handler_decodes_keys(fake_s3, players_csv):
+    """Test that URL-encoded keys from the event are decoded."""
+    key = "inbox/source=rok_players/kingdom=51/dt=2026-01-26/my players.csv"
+    fake_s3.objects[(BUCKET, key)] = players_csv
+    
+    response = lambda_handler(s3_event(key.replace(" ", "+")), None)
+    
+    assert response["statusCode"] == 200
+    assert json.loads(response["body"])["results"][0]["key"] == key
+
+
+def test_process_s3_records_runs_concurrently(monkeypatch):
+    """Test that a batch takes about as long as its slowest record."""
+    from ingest_players import handler
+    
+    def slow_ingestion(bucket, key, **kwargs):
+        time.sleep(0.3)
+        return {"key": key}
+    
+    monkeypatch.setattr(handler, "process_s3_ingestion", slow_ingestion)
+    records = s3_event(*[f"inbox/k{i}.csv" for i in range(4)])["Records"]
+    
+    start = time.perf_counter()
+    results = handler.process_s3_records(records, max_workers=4)
+    elapsed = time.perf_counter() - start
+    
+    assert [r["summary"]["key"] for r in results] == [f"inbox/k{i}.csv" for i in range(4)]
+    assert elapsed < 0.9
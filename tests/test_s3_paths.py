@@ -2,7 +2,9 @@
 
 import pytest
 
+from ingest_players import s3_paths
 from ingest_players.s3_paths import (
+    parse_filename,
     parse_inbox_key,
     build_raw_key,
     build_curated_key,
@@ -87,6 +89,31 @@ class TestParseInboxKey:
         key = "inbox/source=rok_players/dt=2026-01-26/players.csv"
         with pytest.raises(ValueError, match="missing 'kingdom=' segment"):
             parse_inbox_key(key)
+    
+    @pytest.mark.parametrize("filename, ext, compression", [
+        ("players.csv", "csv", None),
+        ("players.csv.gz", "csv", "gzip"),
+        ("players.json.zst", "json", "zstd"),
+        ("players.csv.zip", "csv", "zip"),
+        ("players.zip", None, "zip"),
+    ])
+    def test_compressed_filenames(self, filename, ext, compression):
+        """Test that compression suffixes are split from the input format"""
+        assert parse_filename(filename) == (ext, compression)
+        result = parse_inbox_key(f"inbox/source=rok_players/kingdom=51/dt=2026-01-26/{filename}")
+        assert (result["ext"], result["compression"]) == (ext, compression)
+    
+    @pytest.mark.parametrize("filename", ["players.gz", "players.txt.gz", "players.csv.bz2"])
+    def test_unsupported_compressed_filenames(self, filename):
+        """Test that a codec needs a supported format, and unknown codecs fail"""
+        with pytest.raises(ValueError, match="Unsupported file extension"):
+            parse_filename(filename)
+    
+    def test_disallowed_compression(self, monkeypatch):
+        """Test that ALLOWED_COMPRESSIONS restricts the accepted codecs"""
+        monkeypatch.setattr(s3_paths, "ALLOWED_COMPRESSIONS", {"gz"})
+        with pytest.raises(ValueError, match="Unsupported compression"):
+            parse_filename("players.csv.zst")
 
 
 class TestBuildRawKey:
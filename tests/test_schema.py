@@ -0,0 +1,68 @@
+"""Tests for the declared curated schema."""
+
+import io
+from pathlib import Path
+
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+from ingest_players.handler import process_ingestion
+from ingest_players.schema import (
+    BUSINESS_COLUMNS,
+    METADATA_COLUMNS,
+    PARTITION_COLUMNS,
+    parse_ddl_columns,
+    read_csv_header,
+)
+
+DDL_PATH = Path(__file__).parent.parent / "infra" / "athena" / "create_table_rok_players.sql"
+
+
+def test_declared_schema_matches_athena_ddl():
+    """Test that the declared schema and the Athena table agree column for column."""
+    declared = {**BUSINESS_COLUMNS, **METADATA_COLUMNS, **PARTITION_COLUMNS}
+    
+    assert parse_ddl_columns(DDL_PATH.read_text()) == declared
+
+
+@pytest.mark.parametrize("engine", ["pandas", "arrow"])
+def test_typed_projected_read(tmp_path, engine):
+    """Test that undeclared columns are dropped and blank metrics stay int64."""
+    input_csv = tmp_path / "players.csv"
+    input_csv.write_text(
+        "ID,Name,Power,T4 Kills,Scanner Notes\n"
+        "1001,Alice,1000,5,x\n"
+        "1002,Bob,,7.0,y\n"
+    )
+    
+    result = process_ingestion(str(input_csv), "51", "2026-01-26", str(tmp_path / engine), engine=engine)
+    schema = pq.read_schema(result["curated_path"])
+    
+    assert "scanner notes" not in schema.names
+    assert str(schema.field("power").type) == "int64"
+    assert str(schema.field("t4 kills").type) == "int64"
+    
+    df = pd.read_parquet(result["curated_path"])
+    assert df["power"].isna().tolist() == [False, True]
+    assert df["t4 kills"].tolist() == [5, 7]
+
+
+@pytest.mark.parametrize("engine", ["pandas", "arrow"])
+def test_fractional_bigint_rejected(tmp_path, engine):
+    """Test that a fractional value in a bigint column fails validation."""
+    input_csv = tmp_path / "players.csv"
+    input_csv.write_text("id,power\n1001,1000.5\n")
+    
+    with pytest.raises(ValueError):
+        process_ingestion(str(input_csv), "51", "2026-01-26", str(tmp_path / "out"), engine=engine)
+
+
+def test_read_csv_header_replays_stream():
+    """Test that peeking the header of a forward-only stream loses no bytes."""
+    data = b"\xef\xbb\xbfID,\"Total Kills\"\n1,2\n"
+    
+    header, stream = read_csv_header(io.BytesIO(data))
+    
+    assert header == ["ID", "Total Kills"]
+    assert stream.read() == data
@@ -0,0 +1,189 @@
+"""Tests for the per-kingdom SQLite serving store."""
+
+import json
+import sqlite3
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+import pytest
+
+from ingest_players.backfill import RawInput, rebuild_history
+from ingest_players.handler import process_ingestion, process_s3_ingestion
+
+BUCKET = "test-bucket"
+CATALOG_KEY = "catalog/source=rok_players/kingdom=51/snapshots.json"
+
+
+def inbox_key(dt):
+    return f"inbox/source=rok_players/kingdom=51/dt={dt}/players.csv"
+
+
+def players_csv(power):
+    return pd.DataFrame({
+        "ID": [str(1001 + i) for i in range(len(power))],
+        "Name": ["Alice", "", "Charlie", "Dana"][:len(power)],
+        "Power": power,
+    }).to_csv(index=False).encode("utf-8")
+
+
+def ingest(fake_s3, dt, power):
+    fake_s3.objects[(BUCKET, inbox_key(dt))] = players_csv(power)
+    return process_s3_ingestion(BUCKET, inbox_key(dt), idempotent=False)
+
+
+def serving_keys(fake_s3):
+    return sorted(k for b, k in fake_s3.objects if k.startswith("serving/"))
+
+
+def test_ingestion_publishes_store_and_pointer(fake_s3, tmp_path):
+    """Test that the store holds the snapshot and the catalog points at it."""
+    result = ingest(fake_s3, "2026-01-26", [1000, 2000, 1500])
+    
+    document = json.loads(fake_s3.objects[(BUCKET, CATALOG_KEY)])
+    assert document["serving"]["key"] == result["serving_key"]
+    assert document["serving"]["snapshots"] == 1
+    assert "upload_file" not in fake_s3.calls
+    
+    path = tmp_path / "store.sqlite"
+    path.write_bytes(fake_s3.objects[(BUCKET, result["serving_key"])])
+    conn = sqlite3.connect(str(path))
+    assert conn.execute("SELECT dt, rows FROM snapshots").fetchall() == [("2026-01-26", 3)]
+    assert conn.execute(
+        "SELECT rank, id, name, value FROM leaderboard WHERE dt = ? AND metric = 'power' ORDER BY rank",
+        ("2026-01-26",),
+    ).fetchall() == [(1, "1002", None, 2000), (2, "1003", "Charlie", 1500), (3, "1001", "Alice", 1000)]
+    conn.close()
+
+
+@pytest.fixture
+def ticking_clock(monkeypatch):
+    """Give every ingestion run its own second, so run_ts orders the versions."""
+    from ingest_players import handler
+    
+    ticks = iter(range(1000))
+    
+    class Clock(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return datetime(2026, 1, 26, tzinfo=timezone.utc) + timedelta(seconds=next(ticks))
+    
+    monkeypatch.setattr(handler, "datetime", Clock)
+
+
+def test_new_versions_prune_all_but_previous(fake_s3, ticking_clock):
+    """Test that each ingestion adds a version and keeps only the one it replaced."""
+    keys = [ingest(fake_s3, dt, [1, 2])["serving_key"] for dt in ("2026-01-24", "2026-01-25", "2026-01-26")]
+    
+    assert len(set(keys)) == 3
+    assert serving_keys(fake_s3) == sorted(keys[1:])
+    document = json.loads(fake_s3.objects[(BUCKET, CATALOG_KEY)])
+    assert (document["serving"]["key"], document["serving"]["previous_key"]) == (keys[2], keys[1])
+    assert document["serving"]["snapshots"] == 3
+
+
+def test_prune_keeps_uncommitted_newer_version(fake_s3):
+    """Test that a version a concurrent ingestion has not committed yet survives."""
+    prefix = "serving/source=rok_players/kingdom=51/"
+    orphan = prefix + "store_20000101T000000Z_old.sqlite"
+    pending = prefix + "store_29991231T000000Z_concurrent.sqlite"
+    fake_s3.objects[(BUCKET, orphan)] = b"old"
+    fake_s3.objects[(BUCKET, pending)] = b"pending"
+    
+    key = ingest(fake_s3, "2026-01-26", [1, 2])["serving_key"]
+    
+    assert serving_keys(fake_s3) == sorted([key, pending])
+
+
+@pytest.fixture
+def store_api(api_s3, monkeypatch):
+    """Leaderboard API serving from the store, with a counting stand-in for Athena."""
+    import handler
+    
+    queries = []
+    monkeypatch.setattr(handler, "start_query", lambda sql, *args: queries.append(sql) or "qid")
+    monkeypatch.setattr(handler, "wait_for_query", lambda qid, region, **kwargs: {})
+    monkeypatch.setattr(handler, "get_results", lambda qid, region: [{"id": "9", "name": None, "value": 1}])
+    monkeypatch.setattr(handler, "queries", queries, raising=False)
+    monkeypatch.setenv("DATA_BUCKET", BUCKET)
+    monkeypatch.setenv("LEADERBOARD_SERVING", "store")
+    monkeypatch.setenv("SHARED_QUERY_CACHE", "0")
+    return handler
+
+
+def get(handler, path, **params):
+    event = {"requestContext": {"http": {"method": "GET", "path": path}}, "queryStringParameters": params}
+    response = handler.lambda_handler(event, None)
+    return response["statusCode"], json.loads(response["body"])
+
+
+def test_store_serves_leaderboard_and_player(store_api, fake_s3):
+    """Test that one download answers leaderboards and player timelines."""
+    import serving_store
+    
+    ingest(fake_s3, "2026-01-25", [900, 1900, 1600])
+    ingest(fake_s3, "2026-01-26", [1000, 2000, 1500])
+    
+    status, body = get(store_api, "/leaderboard", kingdom="51", metric="power", dt="latest", limit="2")
+    assert status == 200
+    assert body["served_from"] == "store"
+    assert body["dt"] == "2026-01-26"
+    assert body["rows"] == [{"id": "1002", "name": None, "value": 2000}, {"id": "1003", "name": "Charlie", "value": 1500}]
+    
+    status, body = get(store_api, "/player", kingdom="51", id="1003", metrics="power")
+    assert status == 200
+    assert body["served_from"] == "store"
+    assert [(r["snapshot_date"], r["power"]) for r in body["rows"]] == [("2026-01-25", 1600), ("2026-01-26", 1500)]
+    assert "row_groups_read" not in body
+    
+    status, _ = get(store_api, "/player", kingdom="51", id="9999")
+    assert status == 404
+    assert serving_store.store_stats()["downloads"] == 1
+    assert store_api.queries == []
+
+
+def test_store_falls_back_beyond_top_n(store_api, fake_s3, monkeypatch):
+    """Test that a limit past the stored top N is answered by the next source."""
+    from ingest_players import serving_store
+    
+    build = serving_store.build_serving_store
+    monkeypatch.setattr(
+        serving_store, "build_serving_store",
+        lambda path, history, snapshots: build(path, history, snapshots, top_n=2),
+    )
+    ingest(fake_s3, "2026-01-26", [1000, 2000, 1500])
+    
+    _, body = get(store_api, "/leaderboard", kingdom="51", metric="power", dt="2026-01-26", limit="2")
+    assert body["served_from"] == "store"
+    
+    _, body = get(store_api, "/leaderboard", kingdom="51", metric="power", dt="2026-01-26", limit="3")
+    assert body["served_from"] == "athena"
+    assert len(store_api.queries) == 1
+
+
+def test_missing_store_version_falls_back(store_api, fake_s3):
+    """Test that a pruned version is skipped until the catalog catches up."""
+    result = ingest(fake_s3, "2026-01-26", [1000, 2000])
+    del fake_s3.objects[(BUCKET, result["serving_key"])]
+    
+    status, body = get(store_api, "/leaderboard", kingdom="51", metric="power", dt="2026-01-26", limit="2")
+    
+    assert status == 200
+    assert body["served_from"] == "athena"
+
+
+def test_local_rebuild_points_catalog_at_new_store(tmp_path):
+    """Test that the backfill's history rebuild also rebuilds the store."""
+    out_dir = str(tmp_path / "out")
+    input_path = tmp_path / "players.csv"
+    for dt in ("2026-01-25", "2026-01-26"):
+        input_path.write_bytes(players_csv([1, 2]))
+        process_ingestion(str(input_path), "51", dt, out_dir, history=False)
+    
+    item = RawInput("rok_players", "51", "2026-01-26", "", str(input_path))
+    assert rebuild_history(item, out_dir=out_dir)["status"] == "ok"
+    
+    document = json.loads((tmp_path / "out" / CATALOG_KEY).read_text())
+    conn = sqlite3.connect(document["serving"]["key"])
+    assert conn.execute("SELECT COUNT(*) FROM players").fetchone() == (4,)
+    assert [r[0] for r in conn.execute("SELECT dt FROM snapshots ORDER BY dt")] == ["2026-01-25", "2026-01-26"]
+    conn.close()
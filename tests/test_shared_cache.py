@@ -0,0 +1,117 @@
+"""Tests for the S3-backed query result cache shared across containers."""
+
+import json
+import threading
+import time
+
+import pytest
+
+BUCKET = "test-bucket"
+KEY = "query-cache/source=rok_players/abc.json"
+
+
+@pytest.fixture
+def api(api_s3, monkeypatch):
+    """Leaderboard API with a counting stand-in for Athena."""
+    import handler
+    
+    queries = []
+    monkeypatch.setattr(handler, "start_query", lambda sql, *args: queries.append(sql) or "qid")
+    monkeypatch.setattr(handler, "wait_for_query", lambda qid, region, **kwargs: {})
+    monkeypatch.setattr(handler, "get_results", lambda qid, region: [{"id": "1", "name": "A", "value": 9}])
+    monkeypatch.setenv("DATA_BUCKET", BUCKET)
+    monkeypatch.setattr(handler, "queries", queries, raising=False)
+    return handler
+
+
+def request():
+    return {
+        "requestContext": {"http": {"method": "GET", "path": "/leaderboard"}},
+        "queryStringParameters": {"kingdom": "51", "metric": "power", "dt": "2026-01-26", "limit": "10"},
+    }
+
+
+def test_second_container_reads_shared_result(api, fake_s3):
+    """Test that a result queried in one container is a single GET in the next."""
+    import result_cache
+    
+    first = json.loads(api.lambda_handler(request(), None)["body"])
+    # A new container starts with an empty in-process cache
+    result_cache.clear_cache()
+    second = json.loads(api.lambda_handler(request(), None)["body"])
+    
+    assert (first["served_from"], second["served_from"]) == ("athena", "shared_cache")
+    assert second["rows"] == first["rows"]
+    assert len(api.queries) == 1
+    assert not [k for _, k in fake_s3.objects if k.endswith(".lock")]
+
+
+def test_reingested_snapshot_gets_new_entry(api, fake_s3):
+    """Test that the snapshot's run_id is part of the fingerprint."""
+    import catalog
+    import result_cache
+    
+    catalog_key = "catalog/source=rok_players/kingdom=51/snapshots.json"
+    for run_id in ("run-1", "run-2"):
+        snapshots = [{"dt": "2026-01-26", "rows": 1, "run_id": run_id}]
+        fake_s3.objects[(BUCKET, catalog_key)] = json.dumps({"snapshots": snapshots}).encode()
+        catalog.clear_cache()
+        result_cache.clear_cache()
+        api.lambda_handler(request(), None)
+    
+    assert len(api.queries) == 2
+
+
+def test_concurrent_misses_run_one_query(api_s3):
+    """Test that racing containers wait for the lease holder instead of querying."""
+    import shared_cache
+    
+    runs = []
+    
+    def run_query():
+        runs.append(1)
+        time.sleep(0.2)
+        return [{"id": "1"}]
+    
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(
+            shared_cache.get_or_query(BUCKET, KEY, run_query, poll_seconds=0.01)
+        ))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert len(runs) == 1
+    assert sorted(served for _, served in results) == ["athena"] + ["shared_cache"] * 7
+    assert all(rows == [{"id": "1"}] for rows, _ in results)
+
+
+def test_expired_lease_is_taken_over(api_s3):
+    """Test that a lease left by a dead container does not block the query."""
+    import shared_cache
+    
+    api_s3.objects[(BUCKET, KEY + ".lock")] = json.dumps({"expires_at": time.time() - 1}).encode()
+    
+    rows, served_from = shared_cache.get_or_query(BUCKET, KEY, lambda: [{"id": "2"}], poll_seconds=0)
+    
+    assert (rows, served_from) == ([{"id": "2"}], "athena")
+    assert shared_cache.shared_cache_stats()["takeovers"] == 1
+    assert (BUCKET, KEY) in api_s3.objects
+
+
+def test_waiter_queries_directly_after_wait_seconds(api_s3):
+    """Test that a live lease with no result only delays the waiter."""
+    import shared_cache
+    
+    api_s3.objects[(BUCKET, KEY + ".lock")] = json.dumps({"expires_at": time.time() + 60}).encode()
+    
+    rows, served_from = shared_cache.get_or_query(
+        BUCKET, KEY, lambda: [{"id": "3"}], wait_seconds=0.05, poll_seconds=0.01
+    )
+    
+    assert (rows, served_from) == ([{"id": "3"}], "athena")
+    assert shared_cache.shared_cache_stats()["waits"] > 0